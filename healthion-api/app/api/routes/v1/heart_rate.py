@@ -4,7 +4,12 @@ from fastapi import APIRouter, Depends
 
 from app.utils.auth_dependencies import get_current_user_id
 from app.database import DbSession
-from app.schemas import AEHeartRateListResponse, AEHeartRateQueryParams
+from app.schemas import (
+    AEHeartRateListResponse,
+    AEHeartRateQueryParams,
+    AEHeartRateSeriesQueryParams,
+    AEHeartRateSeriesResponse,
+)
 from app.services import ae_heart_rate_service
 
 router = APIRouter()
@@ -18,3 +23,13 @@ async def get_heart_rate_endpoint(
 ):
     """Get heart rate data with filtering, sorting, and pagination."""
     return await ae_heart_rate_service.build_heart_rate_full_data_response(db, query_params, user_id)
+
+
+@router.get("/heart-rate/series")
+async def get_heart_rate_series_endpoint(
+    db: DbSession,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    query_params: Annotated[AEHeartRateSeriesQueryParams, Depends()],
+) -> AEHeartRateSeriesResponse:
+    """Get heart rate average, minimum, maximum and sample count per time bucket."""
+    return await ae_heart_rate_service.build_heart_rate_series_response(db, query_params, user_id)
@@ -1,53 +1,204 @@
-from fastapi import APIRouter, Depends, Request
+from collections.abc import AsyncIterator
+from contextlib import ExitStack
+from tempfile import SpooledTemporaryFile
+from typing import Annotated, BinaryIO
+from uuid import UUID
 
-from app.services import ae_import_service, hk_import_service
-from app.schemas import UploadDataResponse
-from app.utils.auth_dependencies import get_current_user_id
-from app.database import DbSession
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, UploadFile, status
+from starlette.formparsers import MultiPartException, MultiPartParser
 
+from app.config import settings
+from app.schemas import ImportJob, ImportJobResponse, ImportSource, Upload, UploadCreate, UploadResponse
+from app.services import (
+    ae_import_service,
+    hk_export_import_service,
+    hk_import_service,
+    import_job_service,
+    upload_service,
+)
+from app.utils.auth_dependencies import get_current_user_id
+from app.utils.compression import Compression, detect_compression
 
 router = APIRouter()
 
+IMPORTERS = {
+    ImportSource.AUTO_HEALTH_EXPORT: ae_import_service,
+    ImportSource.HEALTHION: hk_import_service,
+    ImportSource.HEALTH_EXPORT: hk_export_import_service,
+}
+
+
+async def spool_upload(chunks: AsyncIterator[bytes]) -> BinaryIO:
+    """
+    Copy an upload into a spool file that stays in memory while small and rolls
+    over to disk once it grows past `upload_spool_max_memory`, so a request
+    never holds the whole body in memory.
+    """
+    # Closed if the upload breaks off, handed over to the caller once it's all in
+    with ExitStack() as stack:
+        spool = UploadFile(stack.enter_context(SpooledTemporaryFile(max_size=settings.upload_spool_max_memory)))
+        async for chunk in chunks:
+            # UploadFile moves the write to a thread once the spool has rolled over to disk
+            await spool.write(chunk)
+        await spool.seek(0)
+        stack.pop_all()
+    return spool.file
+
+
+async def parse_form_file(request: Request) -> tuple[BinaryIO, str | None]:
+    """
+    Parse a multipart upload straight from the request stream, writing the file into
+    a spool file that rolls over to disk past `upload_spool_max_memory` like
+    `spool_upload` does. The form is parsed outside `request.form()`, so it isn't
+    closed together with the request and the file can be handed over to the import.
+    """
+    parser = MultiPartParser(request.headers, request.stream(), max_files=1)
+    parser.spool_max_size = settings.upload_spool_max_memory
+    try:
+        form = await parser.parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    file = form.get("file")
+    if not file or isinstance(file, str):
+        await form.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No file found")
+    return file.file, file.filename
 
-async def get_content_type(request: Request) -> tuple[str, str]:
+
+async def get_content_type(request: Request) -> tuple[BinaryIO, str, Compression]:
     content_type = request.headers.get("content-type", "")
+    content_encoding = request.headers.get("content-encoding")
+    filename = None
     if "multipart/form-data" in content_type:
-        form = await request.form()
-        file = form.get("file")
-        if not file:
-            return UploadDataResponse(response="No file found")
-        
-        content_str = await file.read()
-        content_str = content_str.decode("utf-8")
+        # The header would describe the whole form, not the file in it: only the file's name or bytes tell that
+        if content_encoding and content_encoding.strip().lower() != "identity":
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Content-Encoding isn't supported on multipart uploads, compress the file itself instead",
+            )
+        content_encoding = None
+        content, filename = await parse_form_file(request)
     else:
-        body = await request.body()
-        content_str = body.decode("utf-8")
-    
-    return content_str, content_type
+        content = await spool_upload(request.stream())
+
+    try:
+        compression = detect_compression(content, content_encoding, filename)
+    except ValueError as e:
+        content.close()
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
 
+    return content, content_type, compression
 
-@router.post("/import/apple/auto-health-export")
+
+@router.post(
+    "/import/apple/auto-health-export",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImportJobResponse,
+)
 async def import_data_auto_health_export(
-    request: Request,
-    db: DbSession,
-    user_id: str = Depends(get_current_user_id),
-    content: tuple[str, str] = Depends(get_content_type)
-) -> UploadDataResponse:
-    """Import health data from file upload or JSON."""
-    
-    content_str, content_type = content[0], content[1]
-    return await ae_import_service.import_data_from_request(db, content_str, content_type, user_id)
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    content: Annotated[tuple[BinaryIO, str, Compression], Depends(get_content_type)],
+) -> ImportJob:
+    """Queue health data from file upload or JSON for import."""
 
+    content_stream, content_type, compression = content[0], content[1], content[2]
+    return import_job_service.submit(
+        ae_import_service, "apple/auto-health-export", content_stream, content_type, user_id, compression,
+    )
 
-@router.post("/import/apple/healthion")
+
+@router.post(
+    "/import/apple/healthion",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImportJobResponse,
+)
 async def import_data_healthion(
-        request: Request,
-        db: DbSession,
-        user_id: str = Depends(get_current_user_id),
-        content: tuple[str, str] = Depends(get_content_type)
-) -> UploadDataResponse:
-    """Import health data from file upload or JSON."""
-    
-    content_str, content_type = content[0], content[1]
-    return await hk_import_service.import_data_from_request(db, content_str, content_type, user_id)
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    content: Annotated[tuple[BinaryIO, str, Compression], Depends(get_content_type)],
+) -> ImportJob:
+    """Queue health data from file upload or JSON for import."""
+
+    content_stream, content_type, compression = content[0], content[1], content[2]
+    return import_job_service.submit(
+        hk_import_service, "apple/healthion", content_stream, content_type, user_id, compression,
+    )
+
+
+@router.post(
+    "/import/apple/health-export",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImportJobResponse,
+)
+async def import_data_apple_health_export(
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    content: Annotated[tuple[BinaryIO, str, Compression], Depends(get_content_type)],
+) -> ImportJob:
+    """Queue an Apple Health export (export.xml, or the export.zip as it comes from the phone) for import."""
+
+    content_stream, content_type, compression = content[0], content[1], content[2]
+    return import_job_service.submit(
+        hk_export_import_service, "apple/health-export", content_stream, content_type, user_id, compression,
+    )
+
+
+@router.post("/import/uploads", status_code=status.HTTP_201_CREATED, response_model=UploadResponse)
+async def create_upload(
+    upload_in: UploadCreate,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> Upload:
+    """Start a chunked upload, for files too large to send in one request."""
+    return upload_service.create(user_id, upload_in)
+
+
+@router.get("/import/uploads/{upload_id}", response_model=UploadResponse)
+async def get_upload(
+    upload_id: UUID,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> Upload:
+    """Get how many bytes of a chunked upload have arrived, to resume after a dropped connection."""
+    return await upload_service.get_upload(upload_id, user_id)
+
+
+@router.patch("/import/uploads/{upload_id}", response_model=UploadResponse)
+async def append_upload_chunk(
+    upload_id: UUID,
+    request: Request,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    upload_offset: Annotated[int, Header(ge=0)],
+) -> Upload:
+    """Append the request body to a chunked upload. `Upload-Offset` must match the bytes received so far."""
+    return await upload_service.append(upload_id, user_id, upload_offset, request.stream())
+
+
+@router.post(
+    "/import/uploads/{upload_id}/finalize",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImportJobResponse,
+)
+async def finalize_upload(
+    upload_id: UUID,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> ImportJob:
+    """Complete a chunked upload and queue the assembled file for import."""
+    upload, content = await upload_service.finalize(upload_id, user_id)
+
+    try:
+        compression = detect_compression(content, upload.content_encoding, upload.filename)
+    except ValueError as e:
+        content.close()
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+
+    # Chunks carry the file itself, never a multipart envelope
+    return import_job_service.submit(
+        IMPORTERS[upload.source], upload.source.value, content, "application/octet-stream", user_id, compression,
+    )
+
 
+@router.get("/import/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: UUID,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> ImportJob:
+    """Get the progress of an import job."""
+    return await import_job_service.get_job(job_id, user_id)
@@ -1,5 +1,7 @@
+import os
 from functools import lru_cache
 from pathlib import Path
+from tempfile import gettempdir
 from enum import Enum
 
 from pydantic import AnyHttpUrl, SecretStr
@@ -13,6 +15,11 @@ class EnvironmentType(str, Enum):
     PRODUCTION = "production"
 
 
+class ImportBackend(str, Enum):
+    ORM = "orm"
+    COPY = "copy"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).parent.parent / "envs" / ".env"),
@@ -27,6 +34,28 @@ class Settings(BaseSettings):
 
     paging_limit: int = 100
 
+    # IMPORT SETTINGS
+    import_chunk_size: int = 1000
+    import_backend: ImportBackend = ImportBackend.ORM
+    import_workers: int = 2
+    # processes parsing Auto Export workouts alongside the database writes, 0 parses inline.
+    # One core is left to the thread writing the rows.
+    import_parse_workers: int = max((os.cpu_count() or 1) - 1, 0)
+    import_job_ttl_seconds: int = 24 * 60 * 60
+    # heartratedata partitions are created this many months ahead, whenever an import starts
+    heart_rate_partition_months_ahead: int = 3
+    # range aggregates (heart rate summary and series, active energy summary) read whole hours and days
+    # from the hourly and daily rollups instead of every sample
+    aggregate_from_rollups: bool = True
+    # uploads larger than this are spooled to disk instead of memory
+    upload_spool_max_memory: int = 1024 * 1024
+    # chunked uploads are assembled here, and dropped when left untouched for the TTL
+    upload_dir: Path = Path(gettempdir()) / "healthion-uploads"
+    upload_ttl_seconds: int = 24 * 60 * 60
+    # authenticated users are resolved from memory for this long, instead of the database on every request
+    user_cache_size: int = 10_000
+    user_cache_ttl_seconds: int = 5 * 60
+
     debug: bool = False
 
     environment: EnvironmentType = EnvironmentType.TEST
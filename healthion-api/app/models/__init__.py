@@ -1,11 +1,16 @@
 from .user import User
 from .apple.workout import Workout
+from .apple.workout_summary import WorkoutSummary
 from .apple.healthkit.record import Record
 from .apple.healthkit.workout_statistic import WorkoutStatistic
 from .apple.healthkit.metadata_entry import MetadataEntry
 from .apple.auto_export.heart_rate_data import HeartRateData
+from .apple.auto_export.heart_rate_data_daily import HeartRateDataDaily
+from .apple.auto_export.heart_rate_data_hourly import HeartRateDataHourly
 from .apple.auto_export.heart_rate_recovery import HeartRateRecovery
 from .apple.auto_export.active_energy import ActiveEnergy
+from .apple.auto_export.active_energy_daily import ActiveEnergyDaily
+from .apple.auto_export.active_energy_hourly import ActiveEnergyHourly
 
 
 __all__ = [
@@ -13,8 +18,13 @@ __all__ = [
     "Record",
     "MetadataEntry",
     "Workout",
+    "WorkoutSummary",
     "WorkoutStatistic",
     "HeartRateData",
+    "HeartRateDataDaily",
+    "HeartRateDataHourly",
     "HeartRateRecovery",
     "ActiveEnergy",
+    "ActiveEnergyDaily",
+    "ActiveEnergyHourly",
 ]
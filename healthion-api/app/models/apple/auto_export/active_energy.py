@@ -1,3 +1,4 @@
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.orm import Mapped
 
 from app.database import BaseDbModel
@@ -12,6 +13,15 @@ from app.mappings import (
 )
 
 class ActiveEnergy(BaseDbModel):
+    # source is nullable, so NULLs have to compare equal for re-sent samples to collide
+    __table_args__ = (
+        UniqueConstraint(
+            "workout_id", "date", "source", name="uq_activeenergy_natural_key", postgresql_nulls_not_distinct=True,
+        ),
+        # Every read filters by user and a date range. Lookups by workout use the unique key above.
+        Index("ix_activeenergy_user_id_date", "user_id", "date"),
+    )
+
     id: Mapped[PrimaryKey[int]]
     user_id: Mapped[FKUser]
     workout_id: Mapped[FKWorkout]
@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import (
+    FKUser,
+    PrimaryKey,
+    datetime_tz,
+)
+
+
+class ActiveEnergyDaily(BaseDbModel):
+    # Active energy samples rolled up per user, source and UTC day (bucket holds its midnight).
+    # Sums and counts rather than averages, so buckets add up to the exact aggregates of any
+    # range of whole days. source is nullable, so NULLs have to compare equal.
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "bucket", "source", name="uq_activeenergydaily_natural_key", postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[PrimaryKey[int]]
+    user_id: Mapped[FKUser]
+    bucket: Mapped[datetime_tz]
+    source: Mapped[str | None]
+    records: Mapped[int]
+    qty_records: Mapped[int]
+    qty_sum: Mapped[Decimal | None]
@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import (
+    FKUser,
+    PrimaryKey,
+    datetime_tz,
+)
+
+
+class ActiveEnergyHourly(BaseDbModel):
+    # Active energy samples rolled up per user, source and UTC hour (bucket holds its start),
+    # like ActiveEnergyDaily. source is nullable, so NULLs have to compare equal.
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "bucket", "source", name="uq_activeenergyhourly_natural_key", postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[PrimaryKey[int]]
+    user_id: Mapped[FKUser]
+    bucket: Mapped[datetime_tz]
+    source: Mapped[str | None]
+    records: Mapped[int]
+    qty_records: Mapped[int]
+    qty_sum: Mapped[Decimal | None]
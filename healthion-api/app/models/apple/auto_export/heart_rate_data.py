@@ -1,20 +1,33 @@
-from sqlalchemy.orm import Mapped
+from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
 from app.database import BaseDbModel
 from app.mappings import (
     FKUser,
     FKWorkout,
     ManyToOne,
-    PrimaryKey,
+    PKAutoIncrement,
     datetime_tz,
     numeric_10_3,
     str_50,
 )
 
 class HeartRateData(BaseDbModel):
-    id: Mapped[PrimaryKey[int]]
+    # Partitioned by month on date (see HeartRateDataService.ensure_partitions), which is why
+    # date is part of the primary key. source is nullable, so NULLs have to compare equal for
+    # re-sent samples to collide.
+    __table_args__ = (
+        UniqueConstraint(
+            "workout_id", "date", "source", name="uq_heartratedata_natural_key", postgresql_nulls_not_distinct=True,
+        ),
+        # Every read filters by user and a date range. Lookups by workout use the unique key above.
+        Index("ix_heartratedata_user_id_date", "user_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    id: Mapped[PKAutoIncrement[int]]
     user_id: Mapped[FKUser]
     workout_id: Mapped[FKWorkout]
-    date: Mapped[datetime_tz]
+    date: Mapped[datetime_tz] = mapped_column(primary_key=True)
     source: Mapped[str | None]
     units: Mapped[str_50 | None]
     avg: Mapped[numeric_10_3 | None]
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import (
+    FKUser,
+    PrimaryKey,
+    datetime_tz,
+    numeric_10_3,
+)
+
+
+class HeartRateDataHourly(BaseDbModel):
+    # Heart rate samples rolled up per user, source and UTC hour (bucket holds its start),
+    # like HeartRateDataDaily. source is nullable, so NULLs have to compare equal.
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "bucket", "source",
+            name="uq_heartratedatahourly_natural_key", postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[PrimaryKey[int]]
+    user_id: Mapped[FKUser]
+    bucket: Mapped[datetime_tz]
+    source: Mapped[str | None]
+    records: Mapped[int]
+    avg_records: Mapped[int]
+    avg_sum: Mapped[Decimal | None]
+    min: Mapped[numeric_10_3 | None]
+    max: Mapped[numeric_10_3 | None]
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 
 from app.database import BaseDbModel
@@ -14,6 +15,9 @@ from app.mappings import (
 
 
 class MetadataEntry(BaseDbModel):
+    # Entries are looked up, and deleted with their record, by record_id
+    __table_args__ = (Index("ix_metadataentry_record_id", "record_id"),)
+
     id: Mapped[PrimaryKey[UUID]]
     user_id: Mapped[FKUser]
     record_id: Mapped[FKRecord]
@@ -1,3 +1,4 @@
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import Mapped
 
 from app.database import BaseDbModel
@@ -14,6 +15,8 @@ from app.mappings import (
 
 
 class WorkoutStatistic(BaseDbModel):
+    __table_args__ = (UniqueConstraint("workout_id", "type", name="uq_workoutstatistic_natural_key"),)
+
     id: Mapped[PrimaryKey[int]]
     user_id: Mapped[FKUser]
     workout_id: Mapped[FKWorkout]
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import Mapped
 
 from app.database import BaseDbModel
@@ -17,6 +18,11 @@ from app.mappings import (
 
 
 class Workout(BaseDbModel):
+    # The same workout re-sent by a device is recognized by its natural key, so re-imports don't duplicate it
+    __table_args__ = (
+        UniqueConstraint("user_id", "startDate", "endDate", "type", "sourceName", name="uq_workout_natural_key"),
+    )
+
     id: Mapped[PrimaryKey[UUID]]
     user_id: Mapped[FKUser]
 
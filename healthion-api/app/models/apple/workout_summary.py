@@ -0,0 +1,23 @@
+from decimal import Decimal
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import BaseDbModel
+from app.mappings import FKWorkout
+
+
+class WorkoutSummary(BaseDbModel):
+    # Aggregates of a workout's samples, kept up to date as they're written so reads don't recompute them.
+    # Unconstrained numerics hold them exactly as the aggregate functions return them.
+    workout_id: Mapped[FKWorkout] = mapped_column(primary_key=True)
+
+    total_statistics: Mapped[int]
+    avg_statistic_value: Mapped[Decimal | None]
+    max_statistic_value: Mapped[Decimal | None]
+    min_statistic_value: Mapped[Decimal | None]
+
+    avg_heart_rate: Mapped[Decimal | None]
+    max_heart_rate: Mapped[Decimal | None]
+    min_heart_rate: Mapped[Decimal | None]
+
+    total_calories: Mapped[Decimal | None]
@@ -2,20 +2,32 @@ from .repositories import CrudRepository
 from .user_repository import UserRepository
 from .apple.auto_export.workout_repository import WorkoutRepository as AEWorkoutRepository
 from .apple.healthkit.workout_repository import WorkoutRepository as HKWorkoutRepository
+from .apple.workout_summary_repository import WorkoutSummaryRepository
 from .apple.healthkit.workout_statistic_repository import WorkoutStatisticRepository
+from .apple.healthkit.record_repository import RecordRepository
+from .apple.healthkit.metadata_entry_repository import MetadataEntryRepository
 from .apple.auto_export.heart_rate_data_repository import HeartRateDataRepository
+from .rollup_repository import RollupRepository
+from .apple.auto_export.heart_rate_data_rollup_repository import HeartRateDataRollupRepository
 from .apple.auto_export.heart_rate_recovery_repository import HeartRateRecoveryRepository
 from .apple.auto_export.base_heart_rate_repository import BaseHeartRateRepository
 from .apple.auto_export.active_energy_repository import ActiveEnergyRepository
+from .apple.auto_export.active_energy_rollup_repository import ActiveEnergyRollupRepository
 
 __all__ = [
     "CrudRepository",
     "UserRepository", 
     "AEWorkoutRepository",
     "HKWorkoutRepository",
+    "WorkoutSummaryRepository",
     "WorkoutStatisticRepository",
+    "RecordRepository",
+    "MetadataEntryRepository",
     "HeartRateDataRepository",
+    "RollupRepository",
+    "HeartRateDataRollupRepository",
     "HeartRateRecoveryRepository",
     "BaseHeartRateRepository",
     "ActiveEnergyRepository",
+    "ActiveEnergyRollupRepository",
 ]
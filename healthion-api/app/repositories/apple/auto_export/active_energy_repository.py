@@ -1,7 +1,11 @@
+from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import func, select
+
 from app.database import DbSession
 from app.models import ActiveEnergy
+from app.repositories.apple.auto_export.active_energy_rollup_repository import ActiveEnergyRollupRepository
 from app.repositories.repositories import CrudRepository
 from app.schemas import AEActiveEnergyCreate, AEActiveEnergyUpdate
 
@@ -9,9 +13,45 @@ from app.schemas import AEActiveEnergyCreate, AEActiveEnergyUpdate
 class ActiveEnergyRepository(CrudRepository[ActiveEnergy, AEActiveEnergyCreate, AEActiveEnergyUpdate]):
     def __init__(self, model: type[ActiveEnergy]):
         super().__init__(model)
+        self.rollups = ActiveEnergyRollupRepository(model)
 
     def get_active_energy_by_workout_id(self, db_session: DbSession, workout_id: UUID) -> list[ActiveEnergy]:
         return db_session.query(self.model).filter(self.model.workout_id == workout_id).all()
 
     def get_active_energy_by_user_id(self, db_session: DbSession, user_id: str) -> list[ActiveEnergy]:
         return db_session.query(self.model).filter(self.model.user_id == user_id).all()
+
+    def get_active_energy_summary(
+        self,
+        db_session: DbSession,
+        user_id: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        source: str | None = None,
+        from_rollups: bool = False,
+    ) -> dict:
+        """
+        Number of active energy samples of a user from `start_date` to `end_date` (inclusive), and
+        of a source like `source`, with their total quantity. With `from_rollups`, whole hours and
+        days of the range are read from the rollups where dates have a timezone.
+        """
+        aggregates = None
+        if from_rollups and all(moment is None or moment.tzinfo for moment in (start_date, end_date)):
+            aggregates = self.rollups.get_range_aggregates(user_id, start_date, end_date, source)
+        if aggregates is None:
+            filters = [self.model.user_id == user_id]
+            if start_date:
+                filters.append(self.model.date >= start_date)
+            if end_date:
+                filters.append(self.model.date <= end_date)
+            if source:
+                filters.append(self.model.source.ilike(f"%{source}%"))
+            aggregates = select(
+                func.count(self.model.id).label("records"), func.sum(self.model.qty).label("qty_sum"),
+            ).where(*filters)
+
+        stats = db_session.execute(aggregates).one()
+        return {
+            "total_records": int(stats.records or 0),
+            "total_qty": float(stats.qty_sum or 0),
+        }
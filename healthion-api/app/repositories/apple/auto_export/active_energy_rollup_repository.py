@@ -0,0 +1,16 @@
+from sqlalchemy import func
+
+from app.models import ActiveEnergy, ActiveEnergyDaily, ActiveEnergyHourly
+from app.repositories.rollup_repository import RollupColumns, RollupRepository
+
+
+class ActiveEnergyRollupRepository(RollupRepository[ActiveEnergy]):
+    """Repository for the hourly and daily active energy rollups."""
+
+    hourly = ActiveEnergyHourly
+    daily = ActiveEnergyDaily
+    columns: RollupColumns = {
+        "records": (func.count(ActiveEnergy.id), func.sum),
+        "qty_records": (func.count(ActiveEnergy.qty), func.sum),
+        "qty_sum": (func.sum(ActiveEnergy.qty), func.sum),
+    }
@@ -1,11 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import and_, desc
+from sqlalchemy import and_
 from sqlalchemy.orm import Query
 
 from app.database import BaseDbModel, DbSession
-from app.schemas import AEHeartRateQueryParams
+from app.repositories.pagination import apply_sorting_and_pagination, get_page
+from app.schemas import AEHeartRateFilterParams, AEHeartRateQueryParams, CountMode
 
 
 class BaseHeartRateRepository[HeartRateModel: BaseDbModel]:
@@ -15,7 +16,7 @@ class BaseHeartRateRepository[HeartRateModel: BaseDbModel]:
     def _apply_common_filters(
         self, 
         query: Query, 
-        query_params: AEHeartRateQueryParams, 
+        query_params: AEHeartRateFilterParams,
         user_id: str
     ) -> Query:
         filters = []
@@ -73,7 +74,7 @@ class BaseHeartRateRepository[HeartRateModel: BaseDbModel]:
         query_params: AEHeartRateQueryParams
     ) -> Query:
         """
-        Apply sorting and pagination to query.
+        Apply sorting and pagination to query, by offset or by the `after` cursor.
         
         Args:
             query: SQLAlchemy query object
@@ -82,33 +83,37 @@ class BaseHeartRateRepository[HeartRateModel: BaseDbModel]:
         Returns:
             Query with sorting and pagination applied
         """
-        # Apply sorting
-        sort_column = getattr(self.model, query_params.sort_by, self.model.date)
-        if query_params.sort_order == "asc":
-            query = query.order_by(sort_column)
-        else:
-            query = query.order_by(desc(sort_column))
-
-        # Apply pagination
-        query = query.offset(query_params.offset).limit(query_params.limit)
-
-        return query
+        return apply_sorting_and_pagination(
+            query,
+            self.model,
+            query_params.sort_by or "date",
+            query_params.sort_order,
+            query_params.offset,
+            query_params.limit,
+            query_params.after,
+        )
 
     def get_heart_rate_with_filters(
         self, 
         db_session: DbSession, 
         query_params: AEHeartRateQueryParams,
-        user_id: str
-    ) -> tuple[list[HeartRateModel], int]:
+        user_id: str,
+        count_mode: CountMode | None = None,
+    ) -> tuple[list[HeartRateModel], int | None]:
         query: Query = db_session.query(self.model)
 
         # Apply common filters
         query = self._apply_common_filters(query, query_params, user_id)
 
-        # Get total count before pagination
-        total_count = query.count()
-
-        # Apply sorting and pagination
-        query = self._apply_sorting_and_pagination(query, query_params)
-
-        return query.all(), total_count
+        # Get the page along with its total count
+        return get_page(
+            db_session,
+            query,
+            self.model,
+            count_mode,
+            query_params.sort_by or "date",
+            query_params.sort_order,
+            query_params.offset,
+            query_params.limit,
+            query_params.after,
+        )
@@ -1,23 +1,105 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Row, func, literal, text
+
 from app.database import DbSession
 from app.models import HeartRateData
 from app.repositories.repositories import CrudRepository
 from app.repositories.apple.auto_export.base_heart_rate_repository import BaseHeartRateRepository
-from app.schemas import AEHeartRateQueryParams
+from app.repositories.apple.auto_export.heart_rate_data_rollup_repository import HeartRateDataRollupRepository
+from app.schemas import AEHeartRateFilterParams, AEHeartRateQueryParams
 from app.schemas import (
     AEHeartRateDataCreate, 
     AEHeartRateDataUpdate
 )
+from app.utils.dates import add_months
+
+PARTITION_MONTH_FORMAT = "%Y_%m"
+# Upper bound of a range partition as pg_get_expr renders it,
+# e.g. "FOR VALUES FROM ('2024-01-01 00:00:00+00') TO ('2024-02-01 00:00:00+00')"
+PARTITION_UPPER_BOUND = re.compile(r"\bTO \('([^']+)'\)")
+# Series buckets are aligned to this Monday midnight (UTC), so weekly ones start on Mondays
+SERIES_ORIGIN = datetime(2000, 1, 3, tzinfo=timezone.utc)
 
 
 class HeartRateDataRepository(CrudRepository[HeartRateData, AEHeartRateDataCreate, AEHeartRateDataUpdate], BaseHeartRateRepository[HeartRateData]):
     def __init__(self, model: type[HeartRateData]):
         CrudRepository.__init__(self, model)
         BaseHeartRateRepository.__init__(self, model)
+        self.rollups = HeartRateDataRollupRepository(model)
 
     def get_heart_rate_data_with_filters(
         self, 
         db_session: DbSession, 
         query_params: AEHeartRateQueryParams,
         user_id: str
-    ) -> tuple[list[HeartRateData], int]:
+    ) -> tuple[list[HeartRateData], int | None]:
         return self.get_heart_rate_with_filters(db_session, query_params, user_id)
+
+    def get_first_date(
+        self, db_session: DbSession, query_params: AEHeartRateFilterParams, user_id: str,
+    ) -> datetime | None:
+        """Date of the earliest sample matching the filters."""
+        query = self._apply_common_filters(db_session.query(func.min(self.model.date)), query_params, user_id)
+        return query.scalar()
+
+    def get_series(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateFilterParams,
+        user_id: str,
+        width: timedelta,
+        from_rollups: bool = False,
+    ) -> list[Row]:
+        """
+        Count, average, min and max of the samples matching the filters per time bucket of `width`, oldest first.
+        With `from_rollups`, whole hours and days are read from the rollups where the filters allow.
+        """
+        if from_rollups:
+            series = self.rollups.get_series(db_session, query_params, user_id, width, SERIES_ORIGIN)
+            if series is not None:
+                return series
+
+        # Inlined, so the bucket expression in GROUP BY is the very same as the selected one
+        bucket = func.date_bin(
+            literal(width, literal_execute=True), self.model.date, literal(SERIES_ORIGIN, literal_execute=True),
+        ).label("bucket")
+        query = db_session.query(
+            bucket,
+            func.count(self.model.id).label("count"),
+            func.avg(self.model.avg).label("avg"),
+            func.min(self.model.min).label("min"),
+            func.max(self.model.max).label("max"),
+        )
+        query = self._apply_common_filters(query, query_params, user_id)
+        return query.group_by(bucket).order_by(bucket).all()
+
+    def get_partitions_end(self, db_session: DbSession) -> datetime | None:
+        """
+        Where the range partitions end (the highest upper bound among them), or None without any.
+        Read from the bounds rather than the names, so a DEFAULT or a manually attached partition counts right.
+        """
+        bounds = db_session.scalars(
+            text(
+                "SELECT pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)",
+            ),
+            {"table": self.model.__tablename__},
+        )
+        ends = [datetime.fromisoformat(match[1]) for bound in bounds if (match := PARTITION_UPPER_BOUND.search(bound))]
+        return max(ends, default=None)
+
+    def create_month_partition(self, db_session: DbSession, month: date) -> str:
+        """Create the partition holding the samples of `month` (UTC) and return its name."""
+        table = self.model.__tablename__
+        name = f"{table}_{month.strftime(PARTITION_MONTH_FORMAT)}"
+        # DDL takes no bind parameters, the bounds are dates formatted here
+        db_session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00+00')",
+            ),
+        )
+        return name
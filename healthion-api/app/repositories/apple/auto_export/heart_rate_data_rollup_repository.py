@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import BigInteger, Row, Subquery, cast, func, select
+
+from app.database import DbSession
+from app.models import HeartRateData, HeartRateDataDaily, HeartRateDataHourly
+from app.repositories.rollup_repository import RollupColumns, RollupRepository
+from app.schemas import AEHeartRateFilterParams
+
+
+class HeartRateDataRollupRepository(RollupRepository[HeartRateData]):
+    """Repository for the hourly and daily heart rate rollups."""
+
+    hourly = HeartRateDataHourly
+    daily = HeartRateDataDaily
+    columns: RollupColumns = {
+        "records": (func.count(HeartRateData.id), func.sum),
+        "avg_records": (func.count(HeartRateData.avg), func.sum),
+        "avg_sum": (func.sum(HeartRateData.avg), func.sum),
+        "min": (func.min(HeartRateData.min), func.min),
+        "max": (func.max(HeartRateData.max), func.max),
+    }
+
+    def _date_range(self, query_params: AEHeartRateFilterParams) -> tuple[datetime | None, datetime | None] | None:
+        """
+        Start and end dates of the filters, or None when the rollups can't answer them: filtering
+        by workout, by heart rate values or by dates without a timezone.
+        """
+        value_filters = (
+            query_params.min_avg, query_params.max_avg,
+            query_params.min_max, query_params.max_max,
+            query_params.min_min, query_params.max_min,
+        )
+        if query_params.workout_id or any(value is not None for value in value_filters):
+            return None
+
+        dates = [
+            datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+            for value in (query_params.start_date, query_params.end_date)
+        ]
+        if any(moment is not None and moment.tzinfo is None for moment in dates):
+            return None
+        return dates[0], dates[1]
+
+    def get_range_stats(self, query_params: AEHeartRateFilterParams, user_id: str) -> Subquery | None:
+        """
+        Single-row heart rate aggregates matching the filters (like the ones of `BaseHeartRateRepository`),
+        read from the rollups where whole hours or days fit in the range. None when the filters
+        can't be answered from the rollups, or no whole hour fits.
+        """
+        date_range = self._date_range(query_params)
+        if date_range is None:
+            return None
+        aggregates = self.get_range_aggregates(user_id, *date_range, query_params.source)
+        if aggregates is None:
+            return None
+
+        stats = aggregates.subquery("hr_parts_stats")
+        # avg() is the sum over the count in the same numeric type, so the result is exactly the samples' average
+        return select(
+            cast(func.coalesce(stats.c.records, 0), BigInteger).label("total_records"),
+            (stats.c.avg_sum / func.nullif(stats.c.avg_records, 0)).label("avg_hr"),
+            stats.c.max.label("max_hr"),
+            stats.c.min.label("min_hr"),
+        ).subquery("hr_stats")
+
+    def get_series(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateFilterParams,
+        user_id: str,
+        width: timedelta,
+        origin: datetime,
+    ) -> list[Row] | None:
+        """
+        Like `HeartRateDataRepository.get_series`, read from the rollups where whole hours or days fit
+        in the range. None when the filters can't be answered from the rollups, or no whole hour fits.
+        """
+        date_range = self._date_range(query_params)
+        if date_range is None:
+            return None
+        aggregates = self.get_range_aggregates(user_id, *date_range, query_params.source, width, origin)
+        if aggregates is None:
+            return None
+
+        series = aggregates.subquery("series")
+        return db_session.execute(
+            select(
+                series.c.bucket,
+                cast(series.c.records, BigInteger).label("count"),
+                (series.c.avg_sum / func.nullif(series.c.avg_records, 0)).label("avg"),
+                series.c.min,
+                series.c.max,
+            ).order_by(series.c.bucket),
+        ).all()
@@ -1,4 +1,22 @@
-from sqlalchemy import func
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    LargeBinary,
+    Row,
+    Subquery,
+    asc,
+    cast,
+    desc,
+    func,
+    literal,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
 from app.database import DbSession
 from app.models import HeartRateData, HeartRateRecovery
@@ -11,6 +29,11 @@ from app.schemas import (
     AEHeartRateRecoveryUpdate
 )
 
+# Columns a heart rate data or recovery page returns, the two tables have them all in common
+PAGE_COLUMNS = ("id", "workout_id", "date", "source", "units", "avg", "min", "max")
+# Values of the records loaded as arrays, to downsample a series by
+TRACE_VALUES = ("avg", "min", "max")
+
 
 class HeartRateRecoveryRepository(CrudRepository[HeartRateRecovery, AEHeartRateRecoveryCreate, AEHeartRateRecoveryUpdate], BaseHeartRateRepository[HeartRateRecovery]):
     """Repository for heart rate recovery database operations."""
@@ -18,13 +41,15 @@ class HeartRateRecoveryRepository(CrudRepository[HeartRateRecovery, AEHeartRateR
     def __init__(self, model: type[HeartRateRecovery]):
         CrudRepository.__init__(self, model)
         BaseHeartRateRepository.__init__(self, model)
+        # The summary and the page cover heart rate data as well
+        self.heart_rate_data = HeartRateDataRepository(HeartRateData)
 
     def get_heart_rate_recovery_with_filters(
         self, 
         db_session: DbSession, 
         query_params: AEHeartRateQueryParams,
         user_id: str
-    ) -> tuple[list[HeartRateRecovery], int]:
+    ) -> tuple[list[HeartRateRecovery], int | None]:
         """
         Get heart rate recovery data with filtering, sorting, and pagination.
 
@@ -33,47 +58,182 @@ class HeartRateRecoveryRepository(CrudRepository[HeartRateRecovery, AEHeartRateR
         """
         return self.get_heart_rate_with_filters(db_session, query_params, user_id)
 
-    def get_heart_rate_summary(
-        self, 
-        db_session: DbSession, 
+    def _summary_subqueries(
+        self,
+        db_session: DbSession,
         query_params: AEHeartRateQueryParams,
-        user_id: str
-    ) -> dict:
+        user_id: str,
+        from_rollups: bool = False,
+    ) -> tuple[Subquery, Subquery]:
         """
-        Get summary statistics for heart rate data.
+        Single-row aggregates of the heart rate data and recovery matching the filters.
+        With `from_rollups`, the heart rate data of whole hours and days is read from the rollups
+        where the filters allow.
         """
-        # Create temporary repositories for filtering
-        hr_data_repo = HeartRateDataRepository(HeartRateData)
-        
-        # Apply common filters to both queries
-        hr_query = db_session.query(HeartRateData)
-        hr_recovery_query = db_session.query(HeartRateRecovery)
-        
-        # Use base class filtering logic
-        hr_query = hr_data_repo._apply_common_filters(hr_query, query_params, user_id)
-        hr_recovery_query = self._apply_common_filters(hr_recovery_query, query_params, user_id)
-
-        # Get heart rate statistics
-        hr_stats = hr_query.with_entities(
-            func.count(HeartRateData.id).label("total_records"),
-            func.avg(HeartRateData.avg).label("avg_hr"),
-            func.max(HeartRateData.max).label("max_hr"),
-            func.min(HeartRateData.min).label("min_hr"),
-        ).first()
+        hr_stats = self.heart_rate_data.rollups.get_range_stats(query_params, user_id) if from_rollups else None
+        if hr_stats is None:
+            # Get heart rate statistics
+            hr_query = db_session.query(HeartRateData)
+            hr_query = self.heart_rate_data._apply_common_filters(hr_query, query_params, user_id)
+            hr_stats = hr_query.with_entities(
+                func.count(HeartRateData.id).label("total_records"),
+                func.avg(HeartRateData.avg).label("avg_hr"),
+                func.max(HeartRateData.max).label("max_hr"),
+                func.min(HeartRateData.min).label("min_hr"),
+            ).subquery("hr_stats")
+
+        hr_recovery_query = self._apply_common_filters(db_session.query(HeartRateRecovery), query_params, user_id)
 
         # Get heart rate recovery statistics
         hr_recovery_stats = hr_recovery_query.with_entities(
+            func.count(HeartRateRecovery.id).label("total_recovery_records"),
             func.avg(HeartRateRecovery.avg).label("avg_recovery"),
             func.max(HeartRateRecovery.max).label("max_recovery"),
             func.min(HeartRateRecovery.min).label("min_recovery"),
-        ).first()
+        ).subquery("hr_recovery_stats")
+
+        return hr_stats, hr_recovery_stats
 
+    def _summary(self, stats: Row) -> dict:
         return {
-            "total_records": hr_stats.total_records or 0,
-            "avg_heart_rate": float(hr_stats.avg_hr or 0),
-            "max_heart_rate": float(hr_stats.max_hr or 0),
-            "min_heart_rate": float(hr_stats.min_hr or 0),
-            "avg_recovery_rate": float(hr_recovery_stats.avg_recovery or 0),
-            "max_recovery_rate": float(hr_recovery_stats.max_recovery or 0),
-            "min_recovery_rate": float(hr_recovery_stats.min_recovery or 0),
+            "total_records": stats.total_records or 0,
+            "avg_heart_rate": float(stats.avg_hr or 0),
+            "max_heart_rate": float(stats.max_hr or 0),
+            "min_heart_rate": float(stats.min_hr or 0),
+            "avg_recovery_rate": float(stats.avg_recovery or 0),
+            "max_recovery_rate": float(stats.max_recovery or 0),
+            "min_recovery_rate": float(stats.min_recovery or 0),
         }
+
+    def get_heart_rate_summary(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateQueryParams,
+        user_id: str,
+        from_rollups: bool = False,
+    ) -> dict:
+        """
+        Get summary statistics for heart rate data.
+        """
+        hr_stats, hr_recovery_stats = self._summary_subqueries(db_session, query_params, user_id, from_rollups)
+
+        # Both single-row aggregates in one statement
+        stats = db_session.execute(
+            select(hr_stats, hr_recovery_stats).select_from(hr_stats.join(hr_recovery_stats, true())),
+        ).one()
+        return self._summary(stats)
+
+    def get_heart_rate_page(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateQueryParams,
+        user_id: str,
+        from_rollups: bool = False,
+    ) -> tuple[list[Row], list[Row], dict, int, int]:
+        """
+        Get a page of heart rate data and of recovery data together with the summary, in one statement.
+
+        The summary aggregates every matching row anyway, so it also yields the exact total of
+        both listings without another COUNT(*).
+
+        Returns:
+            Tuple of (heart_rate_data, heart_rate_recovery, summary, hr_total_count, recovery_total_count)
+        """
+        hr_stats, hr_recovery_stats = self._summary_subqueries(db_session, query_params, user_id, from_rollups)
+
+        # Both tables have the same columns, so their pages stack into one result, told apart by `kind`
+        pages = []
+        for repository in (self.heart_rate_data, self):
+            model = repository.model
+            page = db_session.query(
+                literal(model.__tablename__).label("kind"), *(getattr(model, column) for column in PAGE_COLUMNS),
+            )
+            page = repository._apply_common_filters(page, query_params, user_id)
+            page = repository._apply_sorting_and_pagination(page, query_params)
+            pages.append(select(page.subquery()))
+        pages = union_all(*pages).subquery("pages")
+
+        direction = asc if query_params.sort_order == "asc" else desc
+        # Outer join, so the summary comes back even when both pages are empty
+        rows = db_session.execute(
+            select(hr_stats, hr_recovery_stats, pages)
+            .select_from(hr_stats.join(hr_recovery_stats, true()).outerjoin(pages, true()))
+            .order_by(pages.c.kind, direction(pages.c[query_params.sort_by or "date"]), direction(pages.c.id)),
+        ).all()
+
+        stats = rows[0]
+        hr_data = [row for row in rows if row.kind == HeartRateData.__tablename__]
+        recovery_data = [row for row in rows if row.kind == HeartRateRecovery.__tablename__]
+
+        return hr_data, recovery_data, self._summary(stats), stats.total_records, stats.total_recovery_records
+
+    def get_heart_rate_arrays(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateQueryParams,
+        user_id: str,
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """
+        The id, date (as Unix time), avg, min and max of every heart rate data and recovery record matching
+        the filters, oldest first, in one statement. Each column of a table comes packed into a single
+        binary string, with NULLs as NaN, and is loaded into an array at once, so long series don't go
+        through the driver value by value.
+
+        Returns:
+            Arrays by column name, by table name
+        """
+        arrays = []
+        for repository in (self.heart_rate_data, self):
+            model = repository.model
+            order = aggregate_order_by(literal(b"", LargeBinary), model.date, model.id)
+            packed = [func.string_agg(func.int8send(cast(model.id, BigInteger)), order).label("id")]
+            values = {"date": func.extract("epoch", model.date)}
+            values.update((name, getattr(model, name)) for name in TRACE_VALUES)
+            for name, value in values.items():
+                value = func.coalesce(cast(value, Float), literal("NaN", Float))
+                packed.append(func.string_agg(func.float8send(value), order).label(name))
+            query = db_session.query(literal(model.__tablename__).label("kind"), *packed)
+            arrays.append(select(repository._apply_common_filters(query, query_params, user_id).subquery()))
+
+        # Packed big-endian, as PostgreSQL sends numbers
+        return {
+            row.kind: {
+                "id": np.frombuffer(row.id or b"", dtype=">i8").astype(np.int64),
+                **{
+                    name: np.frombuffer(getattr(row, name) or b"", dtype=">f8").astype(np.float64)
+                    for name in ("date", *TRACE_VALUES)
+                },
+            }
+            for row in db_session.execute(union_all(*arrays)).all()
+        }
+
+    def get_heart_rate_records(
+        self,
+        db_session: DbSession,
+        user_id: str,
+        records: dict[str, tuple[list[int], datetime, datetime]],
+    ) -> tuple[list[Row], list[Row]]:
+        """
+        Heart rate data and recovery records by id, oldest first, in one statement. `records` holds the
+        ids by table name, with the dates the records lie between to look them up by.
+
+        Returns:
+            Tuple of (heart_rate_data, heart_rate_recovery)
+        """
+        selected = []
+        for model in (HeartRateData, HeartRateRecovery):
+            ids, start, end = records.get(str(model.__tablename__)) or ([], None, None)
+            if not ids:
+                continue
+            selected.append(
+                select(literal(model.__tablename__).label("kind"), *(getattr(model, column) for column in PAGE_COLUMNS))
+                .where(model.user_id == user_id, model.id.in_(ids), model.date >= start, model.date <= end),
+            )
+        if not selected:
+            return [], []
+
+        selected = union_all(*selected).subquery("records")
+        rows = db_session.execute(select(selected).order_by(selected.c.kind, selected.c.date, selected.c.id)).all()
+        hr_data = [row for row in rows if row.kind == HeartRateData.__tablename__]
+        recovery_data = [row for row in rows if row.kind == HeartRateRecovery.__tablename__]
+        return hr_data, recovery_data
@@ -1,14 +1,14 @@
 from datetime import datetime
 from decimal import Decimal
-from uuid import UUID
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_
 from sqlalchemy.orm import Query
 
 from app.database import DbSession
-from app.models import Workout, ActiveEnergy, HeartRateData
+from app.models import Workout
 from app.repositories import CrudRepository
-from app.schemas import AEWorkoutQueryParams, AEWorkoutCreate, AEWorkoutUpdate
+from app.repositories.pagination import get_page
+from app.schemas import AEWorkoutCreate, AEWorkoutQueryParams, AEWorkoutUpdate
 
 
 class WorkoutRepository(CrudRepository[Workout, AEWorkoutCreate, AEWorkoutUpdate]):
@@ -20,7 +20,7 @@ class WorkoutRepository(CrudRepository[Workout, AEWorkoutCreate, AEWorkoutUpdate
         db_session: DbSession, 
         query_params: AEWorkoutQueryParams,
         user_id: str
-    ) -> tuple[list[Workout], int]:
+    ) -> tuple[list[Workout], int | None]:
         query: Query = db_session.query(Workout)
 
         # Apply filters
@@ -63,45 +63,15 @@ class WorkoutRepository(CrudRepository[Workout, AEWorkoutCreate, AEWorkoutUpdate
         if filters:
             query = query.filter(and_(*filters))
 
-        # Get total count before pagination
-        total_count = query.count()
-
-        # Apply sorting
-        sort_column = getattr(Workout, query_params.sort_by, Workout.startDate)
-        if query_params.sort_order == "asc":
-            query = query.order_by(sort_column)
-        else:
-            query = query.order_by(desc(sort_column))
-
-        # Apply pagination
-        query = query.offset(query_params.offset).limit(query_params.limit)
-
-        return query.all(), total_count
-
-    def get_workout_summary(self, db_session: DbSession, workout_id: UUID) -> dict:
-        # Get heart rate summary
-        hr_stats = (
-            db_session.query(
-                func.avg(HeartRateData.avg).label("avg_hr"),
-                func.max(HeartRateData.max).label("max_hr"),
-                func.min(HeartRateData.min).label("min_hr"),
-            )
-            .filter(HeartRateData.workout_id == workout_id)
-            .first()
+        # Get the page along with its total count
+        return get_page(
+            db_session,
+            query,
+            Workout,
+            query_params.count,
+            query_params.sort_by or "startDate",
+            query_params.sort_order,
+            query_params.offset,
+            query_params.limit,
+            query_params.after,
         )
-
-        # Get total calories from active energy
-        total_calories = (
-            db_session.query(
-                func.sum(ActiveEnergy.qty).label("total_calories"),
-            )
-            .filter(ActiveEnergy.workout_id == workout_id)
-            .first()
-        )
-
-        return {
-            "avg_heart_rate": float(hr_stats.avg_hr or 0),
-            "max_heart_rate": float(hr_stats.max_hr or 0),
-            "min_heart_rate": float(hr_stats.min_hr or 0),
-            "total_calories": float(total_calories.total_calories or 0),
-        }
@@ -0,0 +1,10 @@
+from app.models import MetadataEntry
+from app.repositories.repositories import CrudRepository
+from app.schemas import HKMetadataEntryCreate, HKMetadataEntryUpdate
+
+
+class MetadataEntryRepository(CrudRepository[MetadataEntry, HKMetadataEntryCreate, HKMetadataEntryUpdate]):
+    """Repository for HealthKit record metadata database operations."""
+
+    def __init__(self, model: type[MetadataEntry]):
+        super().__init__(model)
@@ -0,0 +1,27 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from app.database import DbSession
+from app.models import Record
+from app.repositories.repositories import CrudRepository
+from app.schemas import HKRecordCreate, HKRecordUpdate
+
+
+class RecordRepository(CrudRepository[Record, HKRecordCreate, HKRecordUpdate]):
+    """Repository for HealthKit record database operations."""
+
+    def __init__(self, model: type[Record]):
+        super().__init__(model)
+
+    def bulk_create_returning_ids(self, db_session: DbSession, rows: Sequence[dict[str, Any]]) -> list[int]:
+        """
+        Insert all rows in batched multi-row INSERTs and return the new ids in the
+        order of `rows`, so children like metadata entries can be linked to them.
+        Committing is left to the caller.
+        """
+        if not rows:
+            return []
+        statement = postgresql.insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        return list(db_session.scalars(statement, rows))
@@ -1,26 +1,64 @@
+from collections.abc import Sequence
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Query
 
 from app.database import DbSession
 from app.models import Workout
 from app.repositories import CrudRepository
-from app.schemas import HKWorkoutQueryParams, HKWorkoutCreate, HKWorkoutUpdate
+from app.repositories.pagination import get_page
+from app.schemas import HKWorkoutCreate, HKWorkoutQueryParams, HKWorkoutUpdate
 
 
 class WorkoutRepository(CrudRepository[Workout, HKWorkoutCreate, HKWorkoutUpdate]):
+    # Columns of the workout unique constraint - a re-sent workout matches an existing one on all of them
+    natural_key = ("user_id", "startDate", "endDate", "type", "sourceName")
+
     def __init__(self, model: type[Workout]):
         super().__init__(model)
 
+    def get_or_create_ids(self, db_session: DbSession, creators: Sequence[HKWorkoutCreate]) -> dict[UUID, UUID]:
+        """
+        Insert the workouts that don't exist yet and map every creator's id to the id
+        of the stored workout - its own when it was inserted, the existing row's id when
+        the same workout had been imported before. Committing is left to the caller.
+        """
+        if not creators:
+            return {}
+
+        statement = postgresql.insert(Workout).on_conflict_do_nothing().returning(Workout.id)
+        inserted = set(db_session.scalars(statement, [creator.model_dump() for creator in creators]))
+
+        ids = {creator.id: creator.id for creator in creators if creator.id in inserted}
+        if len(ids) == len(creators):
+            return ids
+
+        # Everything not inserted collided with a workout stored earlier (or earlier in this batch)
+        duplicates = [creator for creator in creators if creator.id not in inserted]
+        key_columns = [getattr(Workout, column) for column in self.natural_key]
+        existing = db_session.execute(
+            select(Workout.id, *key_columns).where(
+                tuple_(*key_columns).in_(
+                    [tuple(getattr(creator, column) for column in self.natural_key) for creator in duplicates],
+                ),
+            ),
+        )
+        existing_ids = {tuple(row[1:]): row.id for row in existing}
+        for creator in duplicates:
+            ids[creator.id] = existing_ids[tuple(getattr(creator, column) for column in self.natural_key)]
+
+        return ids
+
     def get_workouts_with_filters(
         self,
         db_session: DbSession,
         query_params: HKWorkoutQueryParams,
         user_id: str
-    ) -> tuple[list[Workout], int]:
+    ) -> tuple[list[Workout], int | None]:
         query: Query = db_session.query(Workout)
 
         # Apply filters
@@ -63,65 +101,15 @@ class WorkoutRepository(CrudRepository[Workout, HKWorkoutCreate, HKWorkoutUpdate
         if filters:
             query = query.filter(and_(*filters))
 
-        # Get total count before pagination
-        total_count = query.count()
-
-        # Apply sorting
-        sort_column = getattr(Workout, query_params.sort_by, Workout.startDate)
-        if query_params.sort_order == "asc":
-            query = query.order_by(sort_column)
-        else:
-            query = query.order_by(desc(sort_column))
-
-        # Apply pagination
-        query = query.offset(query_params.offset).limit(query_params.limit)
-
-        return query.all(), total_count
-
-    def get_workout_summary(self, db_session: DbSession, workout_id: UUID) -> dict:
-        """Get workout summary statistics for HealthKit workouts."""
-        from app.models import WorkoutStatistic, HeartRateData, ActiveEnergy
-        from sqlalchemy import func
-
-        # Get workout statistics summary
-        stats_summary = (
-            db_session.query(
-                func.count(WorkoutStatistic.id).label("total_statistics"),
-                func.avg(WorkoutStatistic.value).label("avg_value"),
-                func.max(WorkoutStatistic.value).label("max_value"),
-                func.min(WorkoutStatistic.value).label("min_value"),
-            )
-            .filter(WorkoutStatistic.workout_id == workout_id)
-            .first()
-        )
-
-        # Get heart rate summary
-        hr_stats = (
-            db_session.query(
-                func.avg(HeartRateData.avg).label("avg_hr"),
-                func.max(HeartRateData.max).label("max_hr"),
-                func.min(HeartRateData.min).label("min_hr"),
-            )
-            .filter(HeartRateData.workout_id == workout_id)
-            .first()
-        )
-
-        # Get total calories from active energy
-        total_calories = (
-            db_session.query(
-                func.sum(ActiveEnergy.qty).label("total_calories"),
-            )
-            .filter(ActiveEnergy.workout_id == workout_id)
-            .first()
+        # Get the page along with its total count
+        return get_page(
+            db_session,
+            query,
+            Workout,
+            query_params.count,
+            query_params.sort_by or "startDate",
+            query_params.sort_order,
+            query_params.offset,
+            query_params.limit,
+            query_params.after,
         )
-
-        return {
-            "total_statistics": int(stats_summary.total_statistics or 0),
-            "avg_statistic_value": float(stats_summary.avg_value or 0),
-            "max_statistic_value": float(stats_summary.max_value or 0),
-            "min_statistic_value": float(stats_summary.min_value or 0),
-            "avg_heart_rate": float(hr_stats.avg_hr or 0),
-            "max_heart_rate": float(hr_stats.max_hr or 0),
-            "min_heart_rate": float(hr_stats.min_hr or 0),
-            "total_calories": float(total_calories.total_calories or 0),
-        }
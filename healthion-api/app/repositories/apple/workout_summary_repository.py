@@ -0,0 +1,89 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from app.database import DbSession
+from app.models import ActiveEnergy, HeartRateData, Workout, WorkoutStatistic, WorkoutSummary
+
+
+class WorkoutSummaryRepository:
+    """Repository for the precomputed per-workout summaries."""
+
+    def __init__(self, model: type[WorkoutSummary]):
+        self.model = model
+
+    def get_summaries(self, db_session: DbSession, workout_ids: Iterable[UUID]) -> dict[UUID, WorkoutSummary]:
+        summaries = db_session.scalars(select(self.model).where(self.model.workout_id.in_(list(workout_ids))))
+        return {summary.workout_id: summary for summary in summaries}
+
+    def refresh(self, db_session: DbSession, workout_ids: Iterable[UUID]) -> None:
+        """
+        Recompute the summaries of the given workouts from their rows and upsert them, all in one
+        statement. Ids of workouts that don't exist (anymore) are ignored. Committing is left to the caller.
+        """
+        workout_ids = list(workout_ids)
+        if not workout_ids:
+            return
+
+        # Workout statistics summary
+        stats_summary = (
+            select(
+                WorkoutStatistic.workout_id,
+                func.count(WorkoutStatistic.id).label("total_statistics"),
+                func.avg(WorkoutStatistic.value).label("avg_value"),
+                func.max(WorkoutStatistic.value).label("max_value"),
+                func.min(WorkoutStatistic.value).label("min_value"),
+            )
+            .where(WorkoutStatistic.workout_id.in_(workout_ids))
+            .group_by(WorkoutStatistic.workout_id)
+            .subquery()
+        )
+
+        # Heart rate summary
+        hr_stats = (
+            select(
+                HeartRateData.workout_id,
+                func.avg(HeartRateData.avg).label("avg_hr"),
+                func.max(HeartRateData.max).label("max_hr"),
+                func.min(HeartRateData.min).label("min_hr"),
+            )
+            .where(HeartRateData.workout_id.in_(workout_ids))
+            .group_by(HeartRateData.workout_id)
+            .subquery()
+        )
+
+        # Total calories from active energy
+        total_calories = (
+            select(ActiveEnergy.workout_id, func.sum(ActiveEnergy.qty).label("total_calories"))
+            .where(ActiveEnergy.workout_id.in_(workout_ids))
+            .group_by(ActiveEnergy.workout_id)
+            .subquery()
+        )
+
+        summaries = (
+            select(
+                Workout.id,
+                func.coalesce(stats_summary.c.total_statistics, 0),
+                stats_summary.c.avg_value,
+                stats_summary.c.max_value,
+                stats_summary.c.min_value,
+                hr_stats.c.avg_hr,
+                hr_stats.c.max_hr,
+                hr_stats.c.min_hr,
+                total_calories.c.total_calories,
+            )
+            .outerjoin(stats_summary, stats_summary.c.workout_id == Workout.id)
+            .outerjoin(hr_stats, hr_stats.c.workout_id == Workout.id)
+            .outerjoin(total_calories, total_calories.c.workout_id == Workout.id)
+            .where(Workout.id.in_(workout_ids))
+        )
+
+        columns = [column.name for column in self.model.__table__.columns]
+        statement = postgresql.insert(self.model).from_select(columns, summaries)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.workout_id],
+            set_={column: statement.excluded[column] for column in columns if column != "workout_id"},
+        )
+        db_session.execute(statement)
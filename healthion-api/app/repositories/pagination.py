@@ -0,0 +1,137 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, asc, desc, false, func, or_, tuple_
+from sqlalchemy.orm import Query, aliased
+
+from app.database import BaseDbModel, DbSession
+from app.schemas import CountMode
+from app.utils.exceptions import InvalidCursorError
+from app.utils.pagination import decode_cursor
+
+
+def _position_value(model: type[BaseDbModel], column_name: str, value: Any) -> Any:
+    """Parse a value read back from a cursor into the Python type of its column."""
+    if value is None:
+        return None
+    python_type = model.__table__.c[column_name].type.python_type
+    try:
+        return datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+    except (TypeError, ValueError, ArithmeticError):
+        raise InvalidCursorError("Cursor is malformed.")
+
+
+def apply_sorting_and_pagination(
+    query: Query,
+    model: type[BaseDbModel],
+    sort_by: str,
+    sort_order: str,
+    offset: int,
+    limit: int,
+    after: str | None = None,
+    entity: Any = None,
+) -> Query:
+    """
+    Sort by `sort_by` with the id breaking ties, and return one page.
+
+    Without a cursor the page starts `offset` rows in. With one (`after`), it starts
+    right after the position the cursor holds for this table, so the database seeks
+    straight to it instead of reading and discarding every earlier row.
+
+    `entity` is what the query selects from when that isn't `model` itself, like an alias of it.
+    """
+    entity = entity if entity is not None else model
+    sort_column = getattr(entity, sort_by)
+    id_column = getattr(entity, "id")
+    descending = sort_order != "asc"
+    direction = desc if descending else asc
+    query = query.order_by(direction(sort_column), direction(id_column))
+
+    if after is None:
+        return query.offset(offset).limit(limit)
+
+    positions = decode_cursor(after)
+    table = str(model.__tablename__)
+    if table not in positions:
+        raise InvalidCursorError("Cursor doesn't belong to this listing.")
+    position = positions[table]
+    if position is None:
+        # Read to the end already
+        return query.filter(false()).limit(limit)
+
+    cursor_sort_by, cursor_sort_order, raw_value, raw_id = position
+    if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order):
+        raise InvalidCursorError("Cursor was issued for a different sort order.")
+    value = _position_value(model, sort_by, raw_value)
+    last_id = _position_value(model, "id", raw_id)
+    nullable = model.__table__.c[sort_by].nullable
+
+    # PostgreSQL sorts NULLs last in ascending and first in descending order, row comparisons skip them.
+    # The plain bound on the sort column is what lets an index on it seek to the position.
+    if descending:
+        if value is None:
+            condition = or_(and_(sort_column.is_(None), id_column < last_id), sort_column.is_not(None))
+        else:
+            condition = and_(sort_column <= value, tuple_(sort_column, id_column) < tuple_(value, last_id))
+    else:
+        if value is None:
+            condition = and_(sort_column.is_(None), id_column > last_id)
+        else:
+            condition = and_(sort_column >= value, tuple_(sort_column, id_column) > tuple_(value, last_id))
+            if nullable:
+                condition = or_(condition, sort_column.is_(None))
+
+    return query.filter(condition).limit(limit)
+
+
+def estimate_count(db_session: DbSession, query: Query) -> int:
+    """Rows the planner expects `query` to return, from table statistics instead of reading the rows."""
+    connection = db_session.connection()
+    compiled = query.statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_page(
+    db_session: DbSession,
+    query: Query,
+    model: type[BaseDbModel],
+    count_mode: CountMode | None,
+    sort_by: str,
+    sort_order: str,
+    offset: int,
+    limit: int,
+    after: str | None = None,
+) -> tuple[list[Any], int | None]:
+    """
+    One page of the filtered `query` (see `apply_sorting_and_pagination`) and its total, counted as `count_mode` says.
+
+    In window mode the total comes back with the page rows. It's counted in a subquery before the
+    cursor condition applies, so it's the total of the whole listing on every page. Like an exact
+    count, that reads every matching row. So without a `count_mode`, only the first page counts
+    (in window mode), and pages after a cursor, which already had the total, skip it.
+    """
+    if count_mode is None:
+        count_mode = CountMode.NONE if after else CountMode.WINDOW
+    if count_mode is not CountMode.WINDOW:
+        if count_mode is CountMode.EXACT:
+            total_count = query.count()
+        elif count_mode is CountMode.ESTIMATE:
+            total_count = estimate_count(db_session, query)
+        else:
+            total_count = None
+        page = apply_sorting_and_pagination(query, model, sort_by, sort_order, offset, limit, after)
+        return page.all(), total_count
+
+    counted = query.add_columns(func.count().over().label("total_count")).subquery()
+    entity = aliased(model, counted)
+    page = apply_sorting_and_pagination(
+        db_session.query(entity, counted.c.total_count), model, sort_by, sort_order, offset, limit, after, entity,
+    ).all()
+    if page:
+        return [row[0] for row in page], page[0].total_count
+    # No row to read the total from: past the end of the listing, or nothing matches at all
+    return [], query.count() if offset or after else 0
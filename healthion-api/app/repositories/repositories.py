@@ -1,11 +1,25 @@
+from collections.abc import Sequence
+from typing import Any
 from uuid import UUID
 
+from psycopg import sql
 from pydantic import BaseModel
+from sqlalchemy import Column
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Query
 
 from app.database import BaseDbModel, DbSession
 
 
+def _copy_type_name(column: Column) -> str:
+    """PostgreSQL type name of a column as psycopg expects it in `Copy.set_types` (e.g. NUMERIC(10, 3) -> numeric)."""
+    return column.type.compile(dialect=postgresql.dialect()).split("(")[0].lower()
+
+
+def _as_row(creator: BaseModel | dict[str, Any]) -> dict[str, Any]:
+    return creator if isinstance(creator, dict) else creator.model_dump()
+
+
 class CrudRepository[
     ModelType: BaseDbModel,
     CreateSchemaType: BaseModel,
@@ -24,6 +38,83 @@ class CrudRepository[
         db_session.refresh(creation)
         return creation
 
+    def bulk_create(
+        self,
+        db_session: DbSession,
+        creators: Sequence[CreateSchemaType | dict[str, Any]],
+        skip_duplicates: bool = False,
+    ) -> int:
+        """
+        Insert all rows in one executemany round-trip and return how many were inserted.
+        Rows may be create schemas or plain column dicts that were already validated.
+        With `skip_duplicates`, rows colliding with a unique constraint are left out
+        (`ON CONFLICT DO NOTHING`). Committing is left to the caller.
+        """
+        if not creators:
+            return 0
+        statement = postgresql.insert(self.model)
+        if skip_duplicates:
+            statement = statement.on_conflict_do_nothing()
+        # rowcount isn't reliable for executemany, so count the returned ids instead
+        statement = statement.returning(self.model.id)
+        return len(db_session.scalars(statement, [_as_row(creator) for creator in creators]).all())
+
+    def copy_create(
+        self,
+        db_session: DbSession,
+        creators: Sequence[CreateSchemaType | dict[str, Any]],
+        skip_duplicates: bool = False,
+    ) -> int:
+        """
+        Stream all rows through binary `COPY ... FROM STDIN` and return how many were inserted.
+        Rows may be create schemas or plain column dicts that were already validated.
+        COPY can't skip conflicting rows, so with `skip_duplicates` the rows are copied into a
+        temporary staging table and moved over with `INSERT ... ON CONFLICT DO NOTHING`.
+        Committing is left to the caller.
+        """
+        if not creators:
+            return 0
+
+        rows = [_as_row(creator) for creator in creators]
+        columns = list(rows[0])
+        table = self.model.__table__
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        target = sql.Identifier(table.name)
+        if skip_duplicates:
+            target = sql.Identifier(f"{table.name}_staging")
+
+        # The raw psycopg connection shares the session's transaction.
+        connection = db_session.connection().connection.driver_connection
+        with connection.cursor() as cursor:
+            if skip_duplicates:
+                cursor.execute(
+                    sql.SQL(
+                        "CREATE TEMPORARY TABLE IF NOT EXISTS {staging} ON COMMIT DROP AS "
+                        "SELECT {columns} FROM {table} WITH NO DATA",
+                    ).format(staging=target, columns=column_list, table=sql.Identifier(table.name)),
+                )
+
+            statement = sql.SQL("COPY {table} ({columns}) FROM STDIN (FORMAT BINARY)").format(
+                table=target,
+                columns=column_list,
+            )
+            with cursor.copy(statement) as copy:
+                copy.set_types([_copy_type_name(table.columns[column]) for column in columns])
+                for row in rows:
+                    copy.write_row([row[column] for column in columns])
+
+            if not skip_duplicates:
+                return cursor.rowcount
+
+            cursor.execute(
+                sql.SQL(
+                    "INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING",
+                ).format(table=sql.Identifier(table.name), columns=column_list, staging=target),
+            )
+            inserted = cursor.rowcount
+            cursor.execute(sql.SQL("TRUNCATE {staging}").format(staging=target))
+            return inserted
+
     def get(self, db_session: DbSession, object_id: UUID | int) -> ModelType | None:
         return db_session.query(self.model).filter(self.model.id == object_id).one_or_none()
 
@@ -0,0 +1,201 @@
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, and_, delete, func, literal, or_, select, text, true, union_all
+from sqlalchemy.dialects import postgresql
+
+from app.database import BaseDbModel, DbSession
+from app.utils.dates import utc_day
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# Rollup column -> (its aggregate of the samples, the aggregate combining rollup rows of it)
+RollupColumns = dict[str, tuple[ColumnElement, Callable[[ColumnElement], ColumnElement]]]
+
+
+def _day_ranges(days: Iterable[tuple[UUID, datetime]]) -> list[tuple[UUID, datetime, datetime]]:
+    """Per user, runs of consecutive days merged into [start, end) ranges."""
+    ranges = []
+    for user_id, user_days in groupby(sorted(set(days)), key=lambda day: day[0]):
+        for _, day in user_days:
+            if ranges and ranges[-1][0] == user_id and ranges[-1][2] == day:
+                ranges[-1] = (user_id, ranges[-1][1], day + DAY)
+            else:
+                ranges.append((user_id, day, day + DAY))
+    return ranges
+
+
+def _in_ranges(
+    user_column: ColumnElement, moment: ColumnElement, ranges: list[tuple[UUID, datetime, datetime]],
+) -> ColumnElement[bool]:
+    return or_(*(and_(user_column == user_id, moment >= start, moment < end) for user_id, start, end in ranges))
+
+
+def _between(moment: ColumnElement, start: datetime | None, end: datetime | None) -> ColumnElement[bool]:
+    """`moment` in [start, end), either bound may be open."""
+    bounds = []
+    if start is not None:
+        bounds.append(moment >= start)
+    if end is not None:
+        bounds.append(moment < end)
+    return and_(*bounds) if bounds else true()
+
+
+def _floor(moment: datetime, width: timedelta) -> datetime:
+    """Start of the UTC hour or day `moment` falls in."""
+    if width == DAY:
+        return utc_day(moment)
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil(moment: datetime, width: timedelta) -> datetime:
+    """Start of the first whole UTC hour or day from `moment` on."""
+    start = _floor(moment, width)
+    return start if start == moment else start + width
+
+
+class RollupRepository[SampleModel: BaseDbModel]:
+    """
+    Repository for the rollups of a sample table, per user, source and UTC hour in `hourly` and
+    per user, source and UTC day in `daily`. Rollups keep counts, sums, minimums and maximums
+    rather than averages (`columns`), so buckets add up to the exact aggregates of any range
+    they cover.
+    """
+
+    hourly: type[BaseDbModel]
+    daily: type[BaseDbModel]
+    columns: RollupColumns
+
+    def __init__(self, model: type[SampleModel]):
+        self.model = model
+
+    def refresh(self, db_session: DbSession, days: Iterable[tuple[UUID, datetime]]) -> None:
+        """
+        Roll the samples of the given (user, UTC midnight) days up again, replacing what was there:
+        the hours from the samples, then the days from the hours. Committing is left to the caller.
+        """
+        ranges = _day_ranges(days)
+        if not ranges:
+            return
+
+        # Refreshes of a user's rollups take turns until commit: two at once would both delete, then
+        # both insert the same buckets. Locked in user order, so refreshes of several users can't deadlock.
+        for user_id in sorted({user_id for user_id, _, _ in ranges}):
+            db_session.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:name))"),
+                {"name": f"{self.hourly.__tablename__}:{user_id}"},
+            )
+
+        for rollup in (self.hourly, self.daily):
+            db_session.execute(delete(rollup).where(_in_ranges(rollup.user_id, rollup.bucket, ranges)))
+
+        columns = ["user_id", "bucket", "source", *self.columns]
+        hour = func.date_trunc("hour", self.model.date, literal("UTC"))
+        hours = (
+            select(
+                self.model.user_id,
+                hour,
+                self.model.source,
+                *(aggregate for aggregate, _ in self.columns.values()),
+            )
+            .where(_in_ranges(self.model.user_id, self.model.date, ranges))
+            .group_by(self.model.user_id, hour, self.model.source)
+        )
+        db_session.execute(postgresql.insert(self.hourly).from_select(columns, hours))
+
+        day = func.date_trunc("day", self.hourly.bucket, literal("UTC"))
+        days = (
+            select(
+                self.hourly.user_id,
+                day,
+                self.hourly.source,
+                *(combine(getattr(self.hourly, name)) for name, (_, combine) in self.columns.items()),
+            )
+            .where(_in_ranges(self.hourly.user_id, self.hourly.bucket, ranges))
+            .group_by(self.hourly.user_id, day, self.hourly.source)
+        )
+        db_session.execute(postgresql.insert(self.daily).from_select(columns, days))
+
+    def get_range_aggregates(
+        self,
+        user_id: str,
+        start: datetime | None,
+        end: datetime | None,
+        source: str | None = None,
+        width: timedelta | None = None,
+        origin: datetime | None = None,
+    ) -> Select | None:
+        """
+        Aggregates (`columns`) of the samples of a user from `start` to `end` (inclusive, either may be
+        open), and of a source like `source`. The whole days of the range are read from the daily
+        rollups, the whole hours around them from the hourly ones and only what's left at its ends
+        from the samples.
+
+        With a `width`, there's a row per time bucket of that width aligned to `origin` (oldest first),
+        and rollups coarser than the width aren't used. It has to be whole days or hours then, with
+        `origin` at a UTC midnight. None when no whole rollup bucket fits in the range.
+        """
+        levels = [(DAY, self.daily), (HOUR, self.hourly)]
+        if width is not None:
+            levels = [(level_width, rollup) for level_width, rollup in levels if level_width <= width]
+
+        # `model` is the sample model or a rollup, both have user_id and source columns
+        def part(model: Any, moment: ColumnElement, aggregates: list[ColumnElement]) -> Select:
+            filters = [model.user_id == user_id]
+            if source:
+                filters.append(model.source.ilike(f"%{source}%"))
+            if width is None:
+                return select(*aggregates).where(*filters)
+            # Inlined, so the bucket expression in GROUP BY is the very same as the selected one
+            bucket = func.date_bin(
+                literal(width, literal_execute=True), moment, literal(origin, literal_execute=True),
+            ).label("bucket")
+            return select(bucket, *aggregates).where(*filters).group_by(bucket)
+
+        # Each level covers the whole buckets of the range the coarser ones left out, on either side of them
+        parts = []
+        covered: tuple[datetime | None, datetime | None] | None = None
+        for level_width, rollup in levels:
+            low = _ceil(start, level_width) if start else None
+            high = _floor(end, level_width) if end else None
+            if low is not None and high is not None and low >= high:
+                continue
+
+            if covered is None:
+                pieces = [(low, high)]
+            else:
+                pieces = []
+                if low is not None and low < covered[0]:
+                    pieces.append((low, covered[0]))
+                if high is not None and covered[1] < high:
+                    pieces.append((covered[1], high))
+            covered = (low, high)
+            if not pieces:
+                continue
+
+            conditions = [_between(rollup.bucket, piece_start, piece_end) for piece_start, piece_end in pieces]
+            aggregates = [combine(getattr(rollup, name)).label(name) for name, (_, combine) in self.columns.items()]
+            parts.append(part(rollup, rollup.bucket, aggregates).where(or_(*conditions)))
+
+        if covered is None:
+            return None
+
+        covered_start, covered_end = covered
+        edges = []
+        if start and covered_start and start < covered_start:
+            edges.append(and_(self.model.date >= start, self.model.date < covered_start))
+        if end:
+            edges.append(and_(self.model.date >= covered_end, self.model.date <= end))
+        if edges:
+            aggregates = [aggregate.label(name) for name, (aggregate, _) in self.columns.items()]
+            parts.append(part(self.model, self.model.date, aggregates).where(or_(*edges)))
+
+        parts = union_all(*parts).subquery("parts")
+        combined = [combine(parts.c[name]).label(name) for name, (_, combine) in self.columns.items()]
+        if width is None:
+            return select(*combined)
+        return select(parts.c.bucket, *combined).group_by(parts.c.bucket).order_by(parts.c.bucket)
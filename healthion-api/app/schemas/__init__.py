@@ -24,7 +24,14 @@ from .apple.auto_export.heart_rate import (
     HeartRateDataUpdate as AEHeartRateDataUpdate,
     HeartRateRecoveryCreate as AEHeartRateRecoveryCreate,
     HeartRateRecoveryUpdate as AEHeartRateRecoveryUpdate,
+    HeartRateFilterParams as AEHeartRateFilterParams,
     HeartRateQueryParams as AEHeartRateQueryParams,
+    HeartRateDownsampling as AEHeartRateDownsampling,
+    HeartRateBucket as AEHeartRateBucket,
+    HeartRateSeriesQueryParams as AEHeartRateSeriesQueryParams,
+    HeartRateSeriesPoint as AEHeartRateSeriesPoint,
+    HeartRateSeriesMeta as AEHeartRateSeriesMeta,
+    HeartRateSeriesResponse as AEHeartRateSeriesResponse,
     HeartRateDataResponse as AEHeartRateDataResponse,
     HeartRateRecoveryResponse as AEHeartRateRecoveryResponse,
     HeartRateListResponse as AEHeartRateListResponse,
@@ -39,6 +46,7 @@ from .apple.auto_export.import_schemas import (
     HeartRateRecoveryIn as AEHeartRateRecoveryIn,
     ActiveEnergyIn as AEActiveEnergyIn,
     ImportBundle as AEImportBundle,
+    ImportRows as AEImportRows,
 )
 from .apple.auto_export.json_schemas import (
     QuantityJSON as AEQuantityJSON,
@@ -46,6 +54,10 @@ from .apple.auto_export.json_schemas import (
     ActiveEnergyEntryJSON as AEActiveEnergyEntryJSON,
     WorkoutJSON as AEWorkoutJSON,
     RootJSON as AERootJSON,
+    QuantityDict as AEQuantityDict,
+    HeartRateEntryDict as AEHeartRateEntryDict,
+    ActiveEnergyEntryDict as AEActiveEnergyEntryDict,
+    WorkoutDict as AEWorkoutDict,
 )
 
 # HealthKit schemas
@@ -70,6 +82,12 @@ from .apple.healthkit.workout_import import (
     RootJSON as HKRootJSON,
     NewWorkoutJSON as HKNewWorkoutJSON,
 )
+from .apple.healthkit.record import (
+    RecordCreate as HKRecordCreate,
+    RecordUpdate as HKRecordUpdate,
+    MetadataEntryCreate as HKMetadataEntryCreate,
+    MetadataEntryUpdate as HKMetadataEntryUpdate,
+)
 from .apple.workout_statistics import (
     WorkoutStatisticCreate as HKWorkoutStatisticCreate,
     WorkoutStatisticUpdate as HKWorkoutStatisticUpdate,
@@ -80,13 +98,17 @@ from .apple.workout_statistics import (
 
 # Common schemas
 
+from .apple.common import CountMode
 from .filter_params import FilterParams
 from .user import UserInfo, UserResponse, UserCreate, UserUpdate
 from .error_codes import ErrorCode
 from .response import UploadDataResponse
+from .import_job import ImportJob, ImportJobResponse, ImportJobStatus, RejectedWorkout
+from .upload import ImportSource, Upload, UploadCreate, UploadResponse
 
 __all__ = [
     # Common schemas
+    "CountMode",
     "FilterParams",
     "UserInfo",
     "UserResponse",
@@ -94,6 +116,14 @@ __all__ = [
     "UserUpdate",
     "ErrorCode",
     "UploadDataResponse",
+    "ImportJob",
+    "ImportJobResponse",
+    "ImportJobStatus",
+    "RejectedWorkout",
+    "ImportSource",
+    "Upload",
+    "UploadCreate",
+    "UploadResponse",
     
     # Auto Export schemas
     "AEWorkoutCreate",
@@ -117,7 +147,14 @@ __all__ = [
     "AEHeartRateDataUpdate",
     "AEHeartRateRecoveryCreate",
     "AEHeartRateRecoveryUpdate",
+    "AEHeartRateFilterParams",
     "AEHeartRateQueryParams",
+    "AEHeartRateDownsampling",
+    "AEHeartRateBucket",
+    "AEHeartRateSeriesQueryParams",
+    "AEHeartRateSeriesPoint",
+    "AEHeartRateSeriesMeta",
+    "AEHeartRateSeriesResponse",
     "AEHeartRateDataResponse",
     "AEHeartRateRecoveryResponse",
     "AEHeartRateListResponse",
@@ -136,8 +173,13 @@ __all__ = [
     "AEActiveEnergyEntryJSON",
     "AEWorkoutJSON",
     "AERootJSON",
+    "AEQuantityDict",
+    "AEHeartRateEntryDict",
+    "AEActiveEnergyEntryDict",
+    "AEWorkoutDict",
     
     "AEImportBundle",
+    "AEImportRows",
 
     # HealthKit schemas
     "HKWorkoutCreate",
@@ -155,6 +197,11 @@ __all__ = [
     "HKWorkoutJSON",
     "HKNewWorkoutJSON",
     
+    "HKRecordCreate",
+    "HKRecordUpdate",
+    "HKMetadataEntryCreate",
+    "HKMetadataEntryUpdate",
+
     "HKWorkoutStatisticCreate",
     "HKWorkoutStatisticUpdate",
     "HKWorkoutStatisticJSON",
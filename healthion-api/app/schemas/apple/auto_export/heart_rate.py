@@ -1,13 +1,14 @@
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 
-class HeartRateQueryParams(BaseModel):
-    """Query parameters for heart rate filtering and pagination."""
+class HeartRateFilterParams(BaseModel):
+    """Query parameters for heart rate filtering."""
 
     start_date: str | None = Field(
         None, description="ISO 8601 format (e.g., '2023-12-01T00:00:00Z')"
@@ -27,16 +28,60 @@ class HeartRateQueryParams(BaseModel):
     max_max: float | None = Field(None, description="Maximum maximum heart rate")
     min_min: float | None = Field(None, description="Minimum minimum heart rate")
     max_min: float | None = Field(None, description="Maximum minimum heart rate")
+
+
+class HeartRateDownsampling(str, Enum):
+    """How a heart rate listing is thinned out to `max_points`."""
+
+    LTTB = "lttb"  # largest-triangle-three-buckets over the averages, keeps the shape of the line
+    MIN_MAX = "min_max"  # the lowest minimum and highest maximum per bucket, keeps every peak and dip
+
+
+class HeartRateQueryParams(HeartRateFilterParams):
+    """Query parameters for heart rate filtering and pagination."""
+
     sort_by: Literal["date", "avg", "max", "min"] | None = Field(
         "date", description="Sort field"
     )
-    sort_order: Literal["asc", "desc"] | None = Field(
+    sort_order: Literal["asc", "desc"] = Field(
         "desc", description="Sort order"
     )
-    limit: int | None = Field(
+    limit: int = Field(
         20, ge=1, le=100, description="Number of results to return"
     )
-    offset: int | None = Field(0, ge=0, description="Number of results to skip")
+    offset: int = Field(0, ge=0, description="Number of results to skip")
+    after: str | None = Field(
+        None, description="Cursor from `next_cursor` of the previous page to continue after, in place of offset",
+    )
+    max_points: int | None = Field(
+        None,
+        ge=3,
+        le=10_000,
+        description=(
+            "Return the whole matching series oldest first, downsampled to at most this many points per list, "
+            "in place of a page (sorting and pagination don't apply)"
+        ),
+    )
+    downsampling: HeartRateDownsampling = Field(
+        HeartRateDownsampling.LTTB, description="Downsampling method used with `max_points`",
+    )
+
+
+class HeartRateBucket(str, Enum):
+    """Width of the time buckets of a heart rate series."""
+
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"  # starting on Mondays, UTC
+
+
+class HeartRateSeriesQueryParams(HeartRateFilterParams):
+    """Query parameters for a time-bucketed heart rate series."""
+
+    bucket: HeartRateBucket | None = Field(
+        None, description="Bucket width, picked from the length of the date range when not given",
+    )
 
 
 class HeartRateValue(BaseModel):
@@ -91,6 +136,7 @@ class HeartRateMeta(BaseModel):
     filters: dict
     result_count: int
     date_range: dict
+    next_cursor: str | None = None  # pass as `after` for the next page, None on the last one
 
 
 class HeartRateListResponse(BaseModel):
@@ -102,6 +148,33 @@ class HeartRateListResponse(BaseModel):
     meta: HeartRateMeta
 
 
+class HeartRateSeriesPoint(BaseModel):
+    """Aggregates of the heart rate samples in one time bucket."""
+
+    date: str  # ISO 8601, start of the bucket
+    count: int
+    avg: float | None = None
+    min: float | None = None
+    max: float | None = None
+
+
+class HeartRateSeriesMeta(BaseModel):
+    """Metadata for heart rate series response."""
+
+    requested_at: str  # ISO 8601
+    filters: dict
+    bucket: HeartRateBucket
+    result_count: int
+    date_range: dict
+
+
+class HeartRateSeriesResponse(BaseModel):
+    """Response model for heart rate series endpoint."""
+
+    data: list[HeartRateSeriesPoint]
+    meta: HeartRateSeriesMeta
+
+
 # CRUD Schemas
 class HeartRateDataCreate(BaseModel):
     """Schema for creating heart rate data."""
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Any, NamedTuple
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -83,3 +84,18 @@ class ImportBundle(BaseModel):
     heart_rate_data: list[HeartRateDataIn] = []
     heart_rate_recovery: list[HeartRateRecoveryIn] = []
     active_energy: list[ActiveEnergyIn] = []
+
+
+class ImportRows(NamedTuple):
+    """
+    Fast-path counterpart of ImportBundle. The workout and its statistics are
+    schemas, while the samples are plain column dicts that were validated once
+    on the way in and go to the database as they are.
+    """
+
+    index: int  # position of the workout in the upload
+    workout: HKWorkoutIn
+    workout_statistics: list[WorkoutStatisticIn]
+    heart_rate_data: list[dict[str, Any]]
+    heart_rate_recovery: list[dict[str, Any]]
+    active_energy: list[dict[str, Any]]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, NotRequired, TypedDict
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -54,3 +54,50 @@ class WorkoutJSON(BaseModel):
 
 class RootJSON(BaseModel):
     data: dict[str, Any]
+
+
+# TypedDict mirrors of the models above for the import fast path. A TypeAdapter validates a
+# whole workout with them in one pass and hands back plain dicts instead of model instances.
+# tests/schemas/test_json_schemas.py keeps their fields and types in step with the models.
+
+
+class QuantityDict(TypedDict):
+    qty: NotRequired[float | int | None]
+    units: NotRequired[str | None]
+
+
+class HeartRateEntryDict(TypedDict):
+    Avg: NotRequired[float | None]
+    Min: NotRequired[float | None]
+    Max: NotRequired[float | None]
+    units: NotRequired[str | None]
+    date: str
+    source: NotRequired[str | None]
+
+
+class ActiveEnergyEntryDict(TypedDict):
+    qty: NotRequired[float | int | None]
+    units: NotRequired[str | None]
+    date: str
+    source: NotRequired[str | None]
+
+
+class WorkoutDict(TypedDict):
+    id: NotRequired[str | None]
+    name: NotRequired[str | None]
+    location: NotRequired[str | None]
+    start: str
+    end: str
+    duration: NotRequired[float | None]
+
+    activeEnergyBurned: NotRequired[QuantityDict | None]
+    distance: NotRequired[QuantityDict | None]
+    intensity: NotRequired[QuantityDict | None]
+    humidity: NotRequired[QuantityDict | None]
+    temperature: NotRequired[QuantityDict | None]
+
+    heartRateData: NotRequired[list[HeartRateEntryDict] | None]
+    heartRateRecovery: NotRequired[list[HeartRateEntryDict] | None]
+    activeEnergy: NotRequired[list[ActiveEnergyEntryDict] | None]
+
+    metadata: NotRequired[dict[str, Any]]
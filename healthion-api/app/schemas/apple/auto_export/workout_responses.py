@@ -54,8 +54,9 @@ class WorkoutMeta(BaseModel):
 
     requested_at: str  # ISO 8601
     filters: dict
-    result_count: int
+    result_count: int | None  # None when counting was skipped (count=none)
     date_range: DateRange
+    next_cursor: str | None = None  # pass as `after` for the next page, None on the last one
 
 
 class WorkoutListResponse(BaseModel):
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import Enum
 from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 
+class CountMode(str, Enum):
+    """How a listing counts its total."""
+
+    EXACT = "exact"  # separate COUNT(*) query
+    WINDOW = "window"  # COUNT(*) OVER () in the page query itself
+    ESTIMATE = "estimate"  # the query planner's row estimate, no rows read
+    NONE = "none"  # no total
+
+
 class BaseQueryParams(BaseModel):
     """Common query parameters used across both auto_export and healthkit."""
     
@@ -16,13 +26,23 @@ class BaseQueryParams(BaseModel):
     end_date: str | None = Field(
         None, description="ISO 8601 format (e.g., '2023-12-31T23:59:59Z')"
     )
-    limit: int | None = Field(
+    limit: int = Field(
         20, ge=1, le=100, description="Number of results to return"
     )
-    offset: int | None = Field(0, ge=0, description="Number of results to skip")
-    sort_order: Literal["asc", "desc"] | None = Field(
+    offset: int = Field(0, ge=0, description="Number of results to skip")
+    after: str | None = Field(
+        None, description="Cursor from `next_cursor` of the previous page to continue after, in place of offset",
+    )
+    sort_order: Literal["asc", "desc"] = Field(
         "desc", description="Sort order"
     )
+    count: CountMode | None = Field(
+        None,
+        description=(
+            "Total count: 'exact' or 'window' (exact, in the page query), 'estimate' (cheap) or 'none'. "
+            "Defaults to 'window' on the first page and 'none' on pages continuing after a cursor"
+        ),
+    )
 
 
 class BaseResponse(BaseModel):
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RecordCreate(BaseModel):
+    """Schema for creating a HealthKit record."""
+
+    # Dumped under the camelCase column names of `Record`
+    model_config = ConfigDict(validate_by_name=True, serialize_by_alias=True)
+
+    user_id: UUID
+    type: str
+    source_name: str = Field(alias="sourceName")
+    start_date: datetime = Field(alias="startDate")
+    end_date: datetime = Field(alias="endDate")
+    unit: str
+    value: Decimal
+
+
+class RecordUpdate(BaseModel):
+    """Schema for updating a HealthKit record."""
+
+    model_config = ConfigDict(validate_by_name=True, serialize_by_alias=True)
+
+    type: str | None = None
+    source_name: str | None = Field(default=None, alias="sourceName")
+    start_date: datetime | None = Field(default=None, alias="startDate")
+    end_date: datetime | None = Field(default=None, alias="endDate")
+    unit: str | None = None
+    value: Decimal | None = None
+
+
+class MetadataEntryCreate(BaseModel):
+    """Schema for creating a metadata entry of a HealthKit record."""
+
+    id: UUID
+    user_id: UUID
+    record_id: int
+    key: str
+    value: Decimal
+
+
+class MetadataEntryUpdate(BaseModel):
+    """Schema for updating a metadata entry of a HealthKit record."""
+
+    key: str | None = None
+    value: Decimal | None = None
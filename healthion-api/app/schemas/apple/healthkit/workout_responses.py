@@ -30,8 +30,9 @@ class WorkoutResponse(BaseModel):
     durationUnit: str
     sourceName: str | None = None
     user_id: UUID
-    created_at: datetime
-    updated_at: datetime
+    # The workout table keeps no timestamps of its own
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
     summary: WorkoutSummary
 
 
@@ -48,9 +49,10 @@ class WorkoutMeta(BaseModel):
 
     requested_at: str  # ISO 8601
     filters: dict
-    result_count: int
-    total_count: int
+    result_count: int | None  # None when counting was skipped (count=none)
+    total_count: int | None
     date_range: DateRange
+    next_cursor: str | None = None  # pass as `after` for the next page, None on the last one
 
 
 class WorkoutListResponse(BaseModel):
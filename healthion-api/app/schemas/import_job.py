@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+class ImportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# Only the first rejections are kept with their reasons, the rest is just counted
+MAX_REPORTED_REJECTIONS = 100
+
+
+class RejectedWorkout(BaseModel):
+    """A workout left out of an import, while the rest of the upload went in."""
+
+    index: int  # position of the workout in the uploaded list
+    name: str | None = None
+    reason: str
+
+    @classmethod
+    def from_error(cls, index: int, workout_raw: Any, exc: ValueError) -> "RejectedWorkout":
+        """Rejection of a workout that failed validation, naming its first error."""
+        name = workout_raw.get("name") or workout_raw.get("type") if isinstance(workout_raw, dict) else None
+        if isinstance(exc, ValidationError):
+            error = exc.errors()[0]
+            reason = f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            if exc.error_count() > 1:
+                reason += f" (and {exc.error_count() - 1} more errors)"
+        else:
+            reason = str(exc)
+        return cls(index=index, name=name if isinstance(name, str) else None, reason=reason)
+
+
+class ImportJob(BaseModel):
+    """State of a background import job, updated by the worker while it runs."""
+
+    id: UUID = Field(default_factory=uuid4)
+    user_id: str
+    source: str
+    status: ImportJobStatus = ImportJobStatus.QUEUED
+    workouts_done: int = 0
+    rows_written: int = 0
+    rows_skipped: int = 0  # already imported earlier, or not storable
+    workouts_rejected: int = 0
+    rejected_workouts: list[RejectedWorkout] = Field(default_factory=list)
+    errors: list[str] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    def reject_workout(self, rejected: RejectedWorkout) -> None:
+        self.workouts_rejected += 1
+        if len(self.rejected_workouts) < MAX_REPORTED_REJECTIONS:
+            self.rejected_workouts.append(rejected)
+
+
+class ImportJobResponse(BaseModel):
+    """Import job progress as returned by the API."""
+
+    id: UUID
+    source: str
+    status: ImportJobStatus
+    workouts_done: int
+    rows_written: int
+    rows_skipped: int
+    workouts_rejected: int
+    rejected_workouts: list[RejectedWorkout]
+    errors: list[str]
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
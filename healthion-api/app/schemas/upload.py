@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from enum import Enum
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field
+
+
+class ImportSource(str, Enum):
+    AUTO_HEALTH_EXPORT = "apple/auto-health-export"
+    HEALTHION = "apple/healthion"
+    HEALTH_EXPORT = "apple/health-export"
+
+
+class UploadCreate(BaseModel):
+    """Start of a chunked upload. The chunks then carry the file bytes as they are."""
+
+    source: ImportSource
+    size: int | None = Field(default=None, ge=0, description="Total file size in bytes, when known")
+    filename: str | None = None
+    content_encoding: str | None = None
+
+
+class Upload(BaseModel):
+    """State of a chunked upload, advanced by every chunk appended to it."""
+
+    id: UUID = Field(default_factory=uuid4)
+    user_id: str
+    source: ImportSource
+    size: int | None = None
+    filename: str | None = None
+    content_encoding: str | None = None
+    offset: int = 0
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class UploadResponse(BaseModel):
+    """Chunked upload progress as returned by the API."""
+
+    id: UUID
+    source: ImportSource
+    size: int | None = None
+    offset: int
+    created_at: datetime
+    updated_at: datetime
@@ -5,9 +5,17 @@ from .apple.auto_export.import_service import import_service as ae_import_servic
 from .auth_service import auth0_service
 from .apple.auto_export.workout_service import workout_service as ae_workout_service
 from .apple.auto_export.active_energy_service import active_energy_service as ae_active_energy_service
+from .apple.auto_export.rollup_service import (
+    active_energy_rollup_service as ae_active_energy_rollup_service,
+    heart_rate_data_rollup_service as ae_heart_rate_data_rollup_service,
+)
 from .apple.healthkit.import_service import import_service as hk_import_service
+from .apple.healthkit.export_import_service import export_import_service as hk_export_import_service
 from .apple.healthkit.workout_service import workout_service as hk_workout_service
 from .apple.healthkit.workout_statistic_service import workout_statistic_service as hk_workout_statistic_service
+from .apple.workout_summary_service import workout_summary_service
+from .import_job_service import import_job_service
+from .upload_service import upload_service
 
 __all__ = [
     "AppService",
@@ -18,8 +26,15 @@ __all__ = [
     "ae_import_service",
     "ae_workout_service",
     "ae_active_energy_service",
+    "ae_heart_rate_data_rollup_service",
+    "ae_active_energy_rollup_service",
     
     "hk_import_service",
+    "hk_export_import_service",
     "hk_workout_service",
     "hk_workout_statistic_service",
+    "workout_summary_service",
+
+    "import_job_service",
+    "upload_service",
 ]
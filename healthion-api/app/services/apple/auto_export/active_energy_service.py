@@ -1,6 +1,8 @@
+from datetime import datetime
 from logging import Logger, getLogger
 from uuid import UUID
 
+from app.config import settings
 from app.database import DbSession
 from app.models import ActiveEnergy
 from app.repositories import ActiveEnergyRepository
@@ -40,6 +42,25 @@ class ActiveEnergyService(AppService[ActiveEnergyRepository, ActiveEnergy, AEAct
         
         return active_energy
 
+    @handle_exceptions
+    async def get_active_energy_summary(
+        self,
+        db_session: DbSession,
+        user_id: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        source: str | None = None,
+    ) -> dict:
+        self.logger.debug(f"Fetching active energy summary for user {user_id} from {start_date} to {end_date}")
+
+        summary = self.crud.get_active_energy_summary(
+            db_session, user_id, start_date, end_date, source, from_rollups=settings.aggregate_from_rollups,
+        )
+
+        self.logger.debug(f"Retrieved active energy summary of {summary['total_records']} records for user {user_id}")
+
+        return summary
+
     @handle_exceptions
     def create_active_energy_batch(
         self, 
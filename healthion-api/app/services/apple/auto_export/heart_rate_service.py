@@ -1,21 +1,74 @@
+import math
 from logging import Logger, getLogger
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import Row
 
 from app.database import DbSession
 from app.models import HeartRateData, HeartRateRecovery
 from app.schemas import (
+    AEHeartRateBucket,
     AEHeartRateDataResponse,
+    AEHeartRateDownsampling,
     AEHeartRateListResponse,
     AEMeta,
     AEHeartRateQueryParams,
     AEHeartRateRecoveryResponse,
+    AEHeartRateSeriesMeta,
+    AEHeartRateSeriesPoint,
+    AEHeartRateSeriesQueryParams,
+    AEHeartRateSeriesResponse,
     AESummary,
     AEHeartRateValue,
 )
 from .mixins.heart_rate_data_service import HeartRateDataService
 from .mixins.heart_rate_recovery_service import HeartRateRecoveryService
-from app.utils.exceptions import handle_exceptions
+from app.utils.downsampling import lttb_indices, min_max_indices
+from app.utils.exceptions import InvalidSeriesError, handle_exceptions
+from app.utils.pagination import encode_cursor, next_position
+
+SERIES_BUCKET_WIDTHS = {
+    AEHeartRateBucket.MINUTE: timedelta(minutes=1),
+    AEHeartRateBucket.HOUR: timedelta(hours=1),
+    AEHeartRateBucket.DAY: timedelta(days=1),
+    AEHeartRateBucket.WEEK: timedelta(weeks=1),
+}
+# Bucket picked for date ranges up to each length, a few hundred buckets at most. Longer ranges go by weeks.
+SERIES_AUTO_BUCKETS = (
+    (timedelta(hours=6), AEHeartRateBucket.MINUTE),
+    (timedelta(days=14), AEHeartRateBucket.HOUR),
+    (timedelta(days=366), AEHeartRateBucket.DAY),
+)
+# A bucket picked by the client can't split the date range into more buckets than this
+MAX_SERIES_BUCKETS = 10_000
+# Downsampled listings are read whole into memory, there can't be more heart rate data records than this to downsample
+MAX_DOWNSAMPLED_RECORDS = 1_000_000
+
+
+def _parse_date(value: str) -> datetime:
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _series_bucket(span: timedelta) -> AEHeartRateBucket:
+    for max_span, bucket in SERIES_AUTO_BUCKETS:
+        if span <= max_span:
+            return bucket
+    return AEHeartRateBucket.WEEK
+
+
+def _downsample(arrays: dict[str, np.ndarray], max_points: int, method: AEHeartRateDownsampling) -> np.ndarray:
+    """Positions of at most `max_points` records of a series (oldest first) to chart it with, picked by `method`."""
+    avg, low, high = arrays["avg"], arrays["min"], arrays["max"]
+    if method is AEHeartRateDownsampling.MIN_MAX:
+        return min_max_indices(np.where(np.isnan(low), avg, low), np.where(np.isnan(high), avg, high), max_points)
+
+    # Records without an average are charted at the middle of their range, the ones without any value not at all
+    values = np.where(np.isnan(avg), (low + high) / 2, avg)
+    charted = np.flatnonzero(~np.isnan(values))
+    return charted[lttb_indices(arrays["date"][charted], values[charted], max_points)]
 
 
 class HeartRateService:
@@ -39,24 +92,89 @@ class HeartRateService:
         db_session: DbSession, 
         query_params: AEHeartRateQueryParams,
         user_id: str
-    ) -> tuple[list[HeartRateData], list[HeartRateRecovery], dict, int, int]:
+    ) -> tuple[list[Row], list[Row], dict, int, int]:
         """
         Get complete heart rate data including both data and recovery records with summary.
+        All of it comes from one query, with exact totals taken from the summary.
         
         Returns:
             Tuple of (heart_rate_data, heart_rate_recovery, summary, hr_total_count, recovery_total_count)
         """
         self.logger.debug(f"Fetching complete heart rate data with filters: {query_params.model_dump()}")
         
-        # Use methods from composed services
-        hr_data, hr_total_count = await self.heart_rate_data_service.get_heart_rate_data_with_filters(db_session, query_params, user_id)
-        recovery_data, recovery_total_count = await self.heart_rate_recovery_service.get_heart_rate_recovery_with_filters(db_session, query_params, user_id)
-        summary = await self.heart_rate_recovery_service.get_heart_rate_summary(db_session, query_params, user_id)
+        hr_data, recovery_data, summary, hr_total_count, recovery_total_count = (
+            await self.heart_rate_recovery_service.get_heart_rate_page(db_session, query_params, user_id)
+        )
         
         self.logger.debug(f"Retrieved complete heart rate data: {hr_total_count} HR records, {recovery_total_count} recovery records")
         
         return hr_data, recovery_data, summary, hr_total_count, recovery_total_count
 
+    @handle_exceptions
+    async def _get_downsampled_heart_rate_data(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateQueryParams,
+        user_id: str,
+        max_points: int,
+    ) -> tuple[list[Row], list[Row], dict, int, int]:
+        """
+        Get the whole heart rate data and recovery series matching the filters, oldest first, each
+        downsampled to `max_points` records, with the summary of every matching record.
+
+        Returns:
+            Tuple of (heart_rate_data, heart_rate_recovery, summary, hr_total_count, recovery_total_count)
+        """
+        summary = await self.heart_rate_recovery_service.get_heart_rate_summary(db_session, query_params, user_id)
+        if summary["total_records"] > MAX_DOWNSAMPLED_RECORDS:
+            raise InvalidSeriesError(
+                f"More than {MAX_DOWNSAMPLED_RECORDS} records match to downsample. "
+                "Narrow the filters, or get the series in time buckets from /heart-rate/series.",
+            )
+
+        arrays = await self.heart_rate_recovery_service.get_heart_rate_arrays(db_session, query_params, user_id)
+        records = {}
+        for table, columns in arrays.items():
+            kept = _downsample(columns, max_points, query_params.downsampling)
+            if len(kept):
+                # Whole seconds around the dates of the records, which came as floating point Unix times
+                dates = columns["date"][kept]
+                records[table] = (
+                    columns["id"][kept].tolist(),
+                    datetime.fromtimestamp(math.floor(dates.min()), timezone.utc),
+                    datetime.fromtimestamp(math.ceil(dates.max()), timezone.utc),
+                )
+        hr_data, recovery_data = await self.heart_rate_recovery_service.get_heart_rate_records(
+            db_session, user_id, records,
+        )
+
+        hr_total_count, recovery_total_count = (
+            len(arrays[model.__tablename__]["id"]) if model.__tablename__ in arrays else 0
+            for model in (HeartRateData, HeartRateRecovery)
+        )
+        self.logger.debug(
+            f"Downsampled {hr_total_count} HR records to {len(hr_data)}, "
+            f"{recovery_total_count} recovery records to {len(recovery_data)}",
+        )
+
+        return hr_data, recovery_data, summary, hr_total_count, recovery_total_count
+
+    def _next_cursor(
+        self,
+        hr_data: list[Row],
+        recovery_data: list[Row],
+        query_params: AEHeartRateQueryParams,
+    ) -> str | None:
+        """Both lists page with the same parameters, so one cursor carries where each of them continues."""
+        sort_by = query_params.sort_by or "date"
+        positions = {
+            HeartRateData.__tablename__: next_position(hr_data, sort_by, query_params.sort_order, query_params.limit),
+            HeartRateRecovery.__tablename__: next_position(
+                recovery_data, sort_by, query_params.sort_order, query_params.limit,
+            ),
+        }
+        return encode_cursor(positions) if any(positions.values()) else None
+
     @handle_exceptions
     async def build_heart_rate_full_data_response(
         self, 
@@ -66,12 +184,20 @@ class HeartRateService:
     ) -> AEHeartRateListResponse:
         """
         Get complete heart rate data formatted as API response.
+        With `max_points`, that's the whole downsampled series instead of a page.
         
         Returns:
             HeartRateListResponse ready for API
         """
         # Get raw data
-        hr_data, recovery_data, summary_data, hr_total_count, recovery_total_count = await self._get_complete_heart_rate_data(db_session, query_params, user_id)
+        if query_params.max_points:
+            hr_data, recovery_data, summary_data, hr_total_count, recovery_total_count = (
+                await self._get_downsampled_heart_rate_data(db_session, query_params, user_id, query_params.max_points)
+            )
+        else:
+            hr_data, recovery_data, summary_data, hr_total_count, recovery_total_count = (
+                await self._get_complete_heart_rate_data(db_session, query_params, user_id)
+            )
         
         # Convert heart rate data to response format
         heart_rate_responses = []
@@ -157,6 +283,7 @@ class HeartRateService:
                 "start": query_params.start_date or "1900-01-01T00:00:00Z",
                 "end": query_params.end_date or datetime.now().isoformat() + "Z",
             },
+            next_cursor=None if query_params.max_points else self._next_cursor(hr_data, recovery_data, query_params),
         )
 
         return AEHeartRateListResponse(
@@ -166,5 +293,62 @@ class HeartRateService:
             meta=meta,
         )
 
+    @handle_exceptions
+    async def build_heart_rate_series_response(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateSeriesQueryParams,
+        user_id: str,
+    ) -> AEHeartRateSeriesResponse:
+        """
+        Get heart rate aggregates per time bucket formatted as API response.
+
+        Without a bucket size given, it's picked from the length of the date range, which
+        starts at the earliest matching sample when no start date is given.
+
+        Returns:
+            HeartRateSeriesResponse ready for API
+        """
+        end = _parse_date(query_params.end_date) if query_params.end_date else datetime.now(timezone.utc)
+        if query_params.start_date:
+            start = _parse_date(query_params.start_date)
+        else:
+            start = await self.heart_rate_data_service.get_first_date(db_session, query_params, user_id) or end
+        span = max(end - start, timedelta(0))
+
+        bucket = query_params.bucket or _series_bucket(span)
+        width = SERIES_BUCKET_WIDTHS[bucket]
+        if span / width > MAX_SERIES_BUCKETS:
+            raise InvalidSeriesError(
+                f"The date range spans more than {MAX_SERIES_BUCKETS} {bucket.value} buckets. "
+                "Pick a larger bucket or a shorter date range.",
+            )
+
+        series = await self.heart_rate_data_service.get_heart_rate_series(db_session, query_params, user_id, width)
+
+        points = [
+            AEHeartRateSeriesPoint(
+                date=row.bucket.isoformat(),
+                count=row.count,
+                avg=float(row.avg) if row.avg is not None else None,
+                min=float(row.min) if row.min is not None else None,
+                max=float(row.max) if row.max is not None else None,
+            )
+            for row in series
+        ]
+
+        meta = AEHeartRateSeriesMeta(
+            requested_at=datetime.now().isoformat() + "Z",
+            filters=query_params.model_dump(exclude_none=True),
+            bucket=bucket,
+            result_count=len(points),
+            date_range={
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+            },
+        )
+
+        return AEHeartRateSeriesResponse(data=points, meta=meta)
+
 
 heart_rate_service = HeartRateService(log=getLogger(__name__))
\ No newline at end of file
@@ -1,37 +1,58 @@
-import json
-from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
 from decimal import Decimal
+from itertools import batched
+from multiprocessing import get_context
+from threading import Lock
 from uuid import UUID, uuid4
-from typing import Iterable
+from typing import Any, BinaryIO, Iterable
 from logging import Logger, getLogger
 
+from pydantic import TypeAdapter
+
+from app.config import settings
 from app.database import DbSession
+from app.services.apple.auto_export.import_writer import IMPORT_WRITERS
 from app.services.apple.healthkit.workout_service import workout_service
 from app.services.apple.healthkit.workout_statistic_service import workout_statistic_service
 from app.services.apple.auto_export.active_energy_service import active_energy_service
 from app.services.apple.auto_export.heart_rate_service import heart_rate_service
-from app.utils.exceptions import handle_exceptions
+from app.utils.dates import add_months, parse_apple_datetime, parse_apple_datetimes
+from app.utils.json_stream import iter_json_array
 from app.schemas import (
-    AEWorkoutJSON,
-    AEHeartRateDataIn,
-    AEHeartRateRecoveryIn,
-    AEActiveEnergyIn,
-    AEImportBundle,
-    AERootJSON,
+    AEWorkoutDict,
+    AEHeartRateEntryDict,
+    AEActiveEnergyEntryDict,
+    AEImportRows,
     HKWorkoutStatisticIn,
     HKWorkoutStatisticCreate,
     HKWorkoutCreate,
     HKWorkoutIn,
-    AEHeartRateDataCreate,
-    AEHeartRateRecoveryCreate,
-    AEActiveEnergyCreate,
-    UploadDataResponse,
+    ImportJob,
+    RejectedWorkout,
 )
 
 
 APPLE_DT_FORMAT = "%Y-%m-%d %H:%M:%S %z"
 
+# Built once - validating with it runs entirely in pydantic-core
+WORKOUT_ADAPTER = TypeAdapter(AEWorkoutDict)
+
+# Workouts handed to a parse worker at a time - enough to outweigh the pickling round trip
+PARSE_BATCH_SIZE = 8
+
+
+def _build_import_rows_batch(
+    workouts_raw: list[dict], user_id: UUID | None, start: int,
+) -> list[AEImportRows | RejectedWorkout]:
+    """Parse pool entry point, run in a worker process."""
+    return list(import_service._build_import_rows(workouts_raw, user_id, start))
+
+
 class ImportService:
+    zip_member_suffix = ".json"
+
     def __init__(self, log: Logger, **kwargs):
         self.log = log
         self.workout_service = workout_service
@@ -39,255 +60,287 @@ class ImportService:
         self.active_energy_service = active_energy_service
         self.heart_rate_data_service = heart_rate_service.heart_rate_data_service
         self.heart_rate_recovery_service = heart_rate_service.heart_rate_recovery_service
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._parse_pool_lock = Lock()
 
     def _dt(self, s: str) -> datetime:
-        s = s.replace(" +", "+").replace(" ", "T", 1)
-        if len(s) >= 5 and (s[-5] in {"+", "-"} and s[-3] != ":"):
-            s = f"{s[:-2]}:{s[-2:]}"
-        return datetime.fromisoformat(s)
+        return parse_apple_datetime(s)
 
     def _dec(self, x: float | int | None) -> Decimal | None:
         return None if x is None else Decimal(str(x))
 
 
-    def _get_workout_statistics(self, workout: AEWorkoutJSON) -> list[HKWorkoutStatisticIn]:
+    def _get_workout_statistics(self, workout: AEWorkoutDict) -> list[HKWorkoutStatisticIn]:
         """
         Get workout statistics from workout JSON.
         """
         statistics: list[HKWorkoutStatisticIn] = []
         
-        if workout.activeEnergyBurned is not None:
-            ae_data = workout.activeEnergyBurned
+        if (ae_data := workout.get("activeEnergyBurned")) is not None:
             statistics.append(HKWorkoutStatisticIn(
                 type="totalEnergyBurned",
-                value=ae_data.qty or 0,
-                unit=ae_data.units or 'kcal'
+                value=ae_data.get("qty") or 0,
+                unit=ae_data.get("units") or 'kcal',
             ))
         
-        if workout.distance is not None:
-            dist_data = workout.distance
+        if (dist_data := workout.get("distance")) is not None:
             statistics.append(HKWorkoutStatisticIn(
                 type="totalDistance",
-                value=dist_data.qty or 0,
-                unit=dist_data.units or 'm'
+                value=dist_data.get("qty") or 0,
+                unit=dist_data.get("units") or 'm',
             ))
         
-        if workout.intensity is not None:
-            intensity_data = workout.intensity
+        if (intensity_data := workout.get("intensity")) is not None:
             statistics.append(HKWorkoutStatisticIn(
                 type="averageIntensity",
-                value=intensity_data.qty or 0,
-                unit=intensity_data.units or 'kcal/hr·kg'
+                value=intensity_data.get("qty") or 0,
+                unit=intensity_data.get("units") or 'kcal/hr·kg',
             ))
         
-        if workout.temperature is not None:
-            temp_data = workout.temperature
+        if (temp_data := workout.get("temperature")) is not None:
             statistics.append(HKWorkoutStatisticIn(
                 type="environmentalTemperature",
-                value=temp_data.qty or 0,
-                unit=temp_data.units or 'degC'
+                value=temp_data.get("qty") or 0,
+                unit=temp_data.get("units") or 'degC',
             ))
         
-        if workout.humidity is not None:
-            humidity_data = workout.humidity
+        if (humidity_data := workout.get("humidity")) is not None:
             statistics.append(HKWorkoutStatisticIn(
                 type="environmentalHumidity",
-                value=humidity_data.qty or 0,
-                unit=humidity_data.units or '%'
+                value=humidity_data.get("qty") or 0,
+                unit=humidity_data.get("units") or '%',
             ))
 
         return statistics
 
-    def _get_records(self, workout: AEWorkoutJSON, wid: UUID) -> tuple[list[AEHeartRateDataIn], list[AEHeartRateRecoveryIn], list[AEActiveEnergyIn]]:
-        hr_data_rows: list[AEHeartRateDataIn] = []
-        for e in workout.heartRateData or []:
-            hr_data_rows.append(
-                AEHeartRateDataIn(
-                    workout_id=wid,
-                    date=self._dt(e.date),
-                    source=e.source,
-                    units=e.units,
-                    avg=self._dec(e.avg),
-                    min=self._dec(e.min),
-                    max=self._dec(e.max),
-                )
-            )
-
-        hr_recovery_rows: list[AEHeartRateRecoveryIn] = []
-        for e in workout.heartRateRecovery or []:
-            hr_recovery_rows.append(
-                AEHeartRateRecoveryIn(
-                    workout_id=wid,
-                    date=self._dt(e.date),
-                    source=e.source,
-                    units=e.units,
-                    avg=self._dec(e.avg),
-                    min=self._dec(e.min),
-                    max=self._dec(e.max),
-                )
-            )
-
-        ae_rows: list[AEActiveEnergyIn] = []
-        for e in workout.activeEnergy or []:
-            ae_rows.append(
-                AEActiveEnergyIn(
-                    workout_id=wid,
-                    date=self._dt(e.date),
-                    source=e.source,
-                    units=e.units,
-                    qty=self._dec(e.qty),
+    def _get_heart_rate_rows(
+        self, entries: list[AEHeartRateEntryDict], wid: UUID, user_id: UUID | None,
+    ) -> list[dict[str, Any]]:
+        dec = self._dec
+        return [
+            {
+                "user_id": user_id,
+                "workout_id": wid,
+                "date": date,
+                "source": e.get("source"),
+                "units": e.get("units"),
+                "avg": dec(e.get("Avg")),
+                "min": dec(e.get("Min")),
+                "max": dec(e.get("Max")),
+            }
+            for e, date in zip(entries, parse_apple_datetimes([e["date"] for e in entries]))
+        ]
+
+    def _get_active_energy_rows(
+        self, entries: list[AEActiveEnergyEntryDict], wid: UUID, user_id: UUID | None,
+    ) -> list[dict[str, Any]]:
+        dec = self._dec
+        return [
+            {
+                "user_id": user_id,
+                "workout_id": wid,
+                "date": date,
+                "source": e.get("source"),
+                "units": e.get("units"),
+                "qty": dec(e.get("qty")),
+            }
+            for e, date in zip(entries, parse_apple_datetimes([e["date"] for e in entries]))
+        ]
+
+    def _build_import_rows(
+        self, workouts_raw: Iterable[dict], user_id: UUID | None, start: int = 0,
+    ) -> Iterable[AEImportRows | RejectedWorkout]:
+        """
+        Given the workout dicts from a HealthAutoExport file (`data.workouts`),
+        yield ImportRows ready to insert the database, or a RejectedWorkout for
+        a workout that doesn't validate. Workouts are consumed lazily, so a
+        streamed input is never held in memory as a whole. `start` is the upload
+        position of the first workout.
+        """
+        for index, w in enumerate(workouts_raw, start):
+            try:
+                rows = self._build_workout_rows(index, w, user_id)
+            except ValueError as exc:
+                rows = RejectedWorkout.from_error(index, w, exc)
+            yield rows
+
+    def _build_workout_rows(self, index: int, w: dict, user_id: UUID | None) -> AEImportRows:
+        """
+        Each workout is validated exactly once, by the compiled TypedDict adapter.
+        Samples then become plain column dicts for the writer, skipping the model
+        instances (and their validation) the schemas would cost for every row.
+        """
+        wjson = WORKOUT_ADAPTER.validate_python(w)
+
+        wid = uuid4()
+
+        start_date = self._dt(wjson["start"])
+        end_date = self._dt(wjson["end"])
+        duration = (end_date - start_date).total_seconds() / 60
+        duration_unit = "min"
+
+        workout_statistics = self._get_workout_statistics(wjson)
+
+        workout_type = wjson.get("name") or 'Unknown Workout'
+
+        workout_row = HKWorkoutIn(
+            id=wid,
+            type=workout_type,
+            startDate=start_date,
+            endDate=end_date,
+            duration=self._dec(duration),
+            durationUnit=duration_unit,
+            sourceName="Auto Export",
+            workoutStatistics=None,
+        )
+
+        return AEImportRows(
+            index=index,
+            workout=workout_row,
+            workout_statistics=workout_statistics,
+            heart_rate_data=self._get_heart_rate_rows(wjson.get("heartRateData") or [], wid, user_id),
+            heart_rate_recovery=self._get_heart_rate_rows(wjson.get("heartRateRecovery") or [], wid, user_id),
+            active_energy=self._get_active_energy_rows(wjson.get("activeEnergy") or [], wid, user_id),
+        )
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Worker processes for parsing, started on first use and shared by all import jobs."""
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # Import jobs run on threads, and forking a threaded process is unsafe
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=settings.import_parse_workers, mp_context=get_context("spawn"),
                 )
-            )
-        
-        return hr_data_rows, hr_recovery_rows, ae_rows
+            return self._parse_pool
 
-    def _build_import_bundles(self, raw: dict) -> Iterable[AEImportBundle]:
+    def _iter_import_rows(
+        self, workouts_raw: Iterable[dict], user_id: UUID | None,
+    ) -> Iterable[AEImportRows | RejectedWorkout]:
         """
-        Given the parsed JSON dict from HealthAutoExport, yield ImportBundles
-        ready to insert the database.
+        Yield ImportRows in upload order. With `import_parse_workers` set, batches of
+        workouts are parsed on the process pool while the caller writes the rows of
+        earlier batches, so parsing and database I/O overlap. Only a couple of batches
+        per worker are in flight at once, which keeps memory bounded for any upload size.
         """
-        root = AERootJSON(**raw)
-        workouts_raw = root.data.get("workouts", [])
-        
-        for w in workouts_raw:
-            wjson = AEWorkoutJSON(**w)
+        if settings.import_parse_workers <= 0:
+            yield from self._build_import_rows(workouts_raw, user_id)
+            return
 
-            wid = uuid4()
-
-            start_date = self._dt(wjson.start)
-            end_date = self._dt(wjson.end)
-            duration = (end_date - start_date).total_seconds() / 60
-            duration_unit = "min"
-
-            workout_statistics = self._get_workout_statistics(wjson)
-
-            workout_type = wjson.name or 'Unknown Workout'
-
-            workout_row = HKWorkoutIn(
-                id=wid,
-                type=workout_type,
-                startDate=start_date,
-                endDate=end_date,
-                duration=self._dec(duration),
-                durationUnit=duration_unit,
-                sourceName="Auto Export",
-                workoutStatistics=None
-            )
-
-            heart_rate_data, heart_rate_recovery, active_energy = self._get_records(wjson, wid)
-
-            yield AEImportBundle(
-                workout=workout_row,
-                workout_statistics=workout_statistics,
-                heart_rate_data=heart_rate_data,
-                heart_rate_recovery=heart_rate_recovery,
-                active_energy=active_energy
+        pool = self._get_parse_pool()
+        max_in_flight = 2 * settings.import_parse_workers
+        in_flight: deque[Future[list[AEImportRows | RejectedWorkout]]] = deque()
+        try:
+            for batch_number, batch in enumerate(batched(workouts_raw, PARSE_BATCH_SIZE)):
+                start = batch_number * PARSE_BATCH_SIZE
+                in_flight.append(pool.submit(_build_import_rows_batch, list(batch), user_id, start))
+                if len(in_flight) >= max_in_flight:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+        finally:
+            # The import failed or stopped early - nothing will read the remaining batches
+            for future in in_flight:
+                future.cancel()
+
+    def _report_rejected(self, rejected: list[RejectedWorkout], job: ImportJob | None) -> None:
+        for rejected_workout in rejected:
+            self.log.warning(
+                f"Rejected workout #{rejected_workout.index} ({rejected_workout.name}): {rejected_workout.reason}",
             )
+            if job:
+                job.reject_workout(rejected_workout)
 
-
-    def load_data(self, db_session: DbSession, raw: dict, user_id: str = None) -> bool:
-
-        for bundle in self._build_import_bundles(raw):
-
-            workout_dict = bundle.workout.model_dump()
-            
-            if user_id:
-                workout_dict['user_id'] = UUID(user_id)
-            
-            workout_create = HKWorkoutCreate(**workout_dict)
-            created_workout = self.workout_service.create(db_session, workout_create)
-
-            for stat in bundle.workout_statistics:
-                stat_dict = stat.model_dump()
-                if user_id:
-                    stat_dict['user_id'] = UUID(user_id)
-                    stat_dict['workout_id'] = created_workout.id
-                stat_create = HKWorkoutStatisticCreate(**stat_dict)
-                self.workout_statistic_service.create(db_session, stat_create)
-
-            for row in bundle.heart_rate_data:
-                hr_data = row.model_dump()
-                if user_id:
-                    hr_data['user_id'] = UUID(user_id)
-                hr_create = AEHeartRateDataCreate(**hr_data)
-                self.heart_rate_data_service.create(db_session, hr_create)
-
-            for row in bundle.heart_rate_recovery:
-                hr_recovery_data = row.model_dump()
-                if user_id:
-                    hr_recovery_data['user_id'] = UUID(user_id)
-                hr_recovery_create = AEHeartRateRecoveryCreate(**hr_recovery_data)
-                self.heart_rate_recovery_service.create(db_session, hr_recovery_create)
-
-            for row in bundle.active_energy:
-                ae_data = row.model_dump()
-                if user_id:
-                    ae_data['user_id'] = UUID(user_id)
-                ae_create = AEActiveEnergyCreate(**ae_data)
-                self.active_energy_service.create(db_session, ae_create)
+    def load_data(
+        self,
+        db_session: DbSession,
+        workouts_raw: Iterable[dict],
+        user_id: str | None = None,
+        job: ImportJob | None = None,
+    ) -> bool:
+        writer_class = IMPORT_WRITERS[settings.import_backend]
+        writer = writer_class(db_session, chunk_size=settings.import_chunk_size, log=self.log)
+        owner_id = UUID(user_id) if user_id else None
+
+        for rows in self._iter_import_rows(workouts_raw, owner_id):
+            if isinstance(rows, RejectedWorkout):
+                self._report_rejected([rows], job)
+            else:
+                workout_dict = rows.workout.model_dump()
+
+                if owner_id:
+                    workout_dict['user_id'] = owner_id
+
+                workout_create = HKWorkoutCreate(**workout_dict)
+
+                writer.add(rows.index, workout_create, {
+                    "workout_statistics": [
+                        HKWorkoutStatisticCreate(
+                            **stat.model_dump(),
+                            user_id=workout_create.user_id,
+                            workout_id=workout_create.id,
+                        ).model_dump()
+                        for stat in rows.workout_statistics
+                    ],
+                    "heart_rate_data": rows.heart_rate_data,
+                    "heart_rate_recovery": rows.heart_rate_recovery,
+                    "active_energy": rows.active_energy,
+                })
+                self._report_rejected(writer.pop_rejected(), job)
+
+            if job:
+                job.workouts_done += 1
+                job.rows_written = writer.rows_written
+                job.rows_skipped = writer.rows_skipped
+
+        writer.finish()
+        # Everything stored goes in with this one commit, a failure above leaves the upload out entirely
+        db_session.commit()
+
+        self._report_rejected(writer.pop_rejected(), job)
+        if job:
+            job.rows_written = writer.rows_written
+            job.rows_skipped = writer.rows_skipped
+
+        self.log.info(
+            f"Imported {writer.rows_written} rows in a single transaction, skipped {writer.rows_skipped} "
+            f"already imported ({settings.import_backend.value} backend)",
+        )
 
         return True
 
 
-    @handle_exceptions
-    async def import_data_from_request(
-        self, 
+    def import_data(
+        self,
         db_session: DbSession,
-        request_content: str, 
+        content: BinaryIO,
         content_type: str,
-        user_id: str
-    ) -> UploadDataResponse:
-        try:
-            # Parse content based on type
-            if "multipart/form-data" in content_type:
-                data = self._parse_multipart_content(request_content)
-            else:
-                data = self._parse_json_content(request_content)
-            
-            if not data:
-                return UploadDataResponse(status_code=400, response="No valid data found")
-            
-            # Load data using provided database session
-            self.load_data(db_session, data, user_id=user_id)
-                
-        except Exception as e:
-            return UploadDataResponse(status_code=400, response=f"Import failed: {str(e)}")
-
-        return UploadDataResponse(status_code=200, response="Import successful")
-
-
-    def _parse_multipart_content(self, content: str) -> dict | None:
-        """Parse multipart form data to extract JSON."""            
-        json_start = content.find('{\n  "data"')
-        if json_start == -1:
-            json_start = content.find('{"data"')
-        if json_start == -1:
-            return None
-            
-        brace_count = 0
-        json_end = json_start
-        for i, char in enumerate(content[json_start:], json_start):
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    json_end = i
-                    break
-        
-        if brace_count != 0:
-            return None
-            
-        json_str = content[json_start:json_end + 1]
-        return json.loads(json_str)
+        user_id: str,
+        job: ImportJob | None = None,
+    ) -> None:
+        """Import an uploaded Auto Export file, reporting progress on `job` when given."""
+        # The only import writing heart rate data, which goes into monthly partitions
+        self.heart_rate_data_service.ensure_partitions(
+            db_session, until=add_months(date.today(), settings.heart_rate_partition_months_ahead),
+        )
 
+        # Parse content based on type
+        if "multipart/form-data" in content_type:
+            workouts_raw = self._parse_multipart_content(content)
+        else:
+            workouts_raw = self._parse_json_content(content)
 
-    def _parse_json_content(self, content: str) -> dict | None:
-        """Parse JSON content directly."""
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            return None
+        # Load data using provided database session
+        self.load_data(db_session, workouts_raw, user_id=user_id, job=job)
+
+
+    def _parse_multipart_content(self, content: BinaryIO) -> Iterable[dict]:
+        """Stream `data.workouts` out of an uploaded file, ignoring anything before the JSON document."""
+        return iter_json_array(content, ("data", "workouts"), skip_preamble=True)
+
+
+    def _parse_json_content(self, content: BinaryIO) -> Iterable[dict]:
+        """Stream `data.workouts` out of the JSON body one workout at a time."""
+        return iter_json_array(content, ("data", "workouts"))
 
 
 import_service = ImportService(log=getLogger(__name__))
@@ -0,0 +1,169 @@
+from datetime import datetime
+from logging import Logger
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from app.config import ImportBackend
+from app.database import DbSession
+from app.schemas import HKWorkoutCreate, RejectedWorkout
+from app.services.apple.auto_export.active_energy_service import active_energy_service
+from app.services.apple.auto_export.heart_rate_service import heart_rate_service
+from app.services.apple.auto_export.rollup_service import (
+    active_energy_rollup_service,
+    heart_rate_data_rollup_service,
+)
+from app.services.apple.healthkit.workout_service import workout_service
+from app.services.apple.healthkit.workout_statistic_service import workout_statistic_service
+from app.services.apple.workout_summary_service import workout_summary_service
+from app.services.services import AppService
+from app.utils.exceptions import ROW_DATA_ERRORS, row_data_error_reason
+
+
+class PendingWorkout(NamedTuple):
+    index: int  # position in the upload, for reporting
+    workout: HKWorkoutCreate
+    children: dict[str, list[dict[str, Any]]]
+
+
+class ImportWriter:
+    """
+    Buffers import rows per workout and writes each entity with a single
+    multi-row INSERT once `chunk_size` rows are pending.
+
+    The writer never commits - the caller owns the transaction, so a whole
+    upload ends up in one commit instead of one per row. Every chunk goes in
+    under a savepoint. When the database refuses a chunk, it is rolled back
+    and written again workout by workout, so only the offending workouts are
+    left out, and reported in `rejected`.
+
+    Workouts are added as create schemas, everything else as plain column dicts.
+    Rows that were imported before are skipped on their unique natural keys.
+    A re-sent workout resolves to the stored one, and its rows are re-pointed
+    at it before they are written. The summaries of the workouts of a chunk
+    are refreshed under its savepoint as well. The rollups are refreshed once
+    for all the days samples were written to, by `finish` before committing.
+    """
+
+    def __init__(self, db_session: DbSession, chunk_size: int, log: Logger):
+        self.db_session = db_session
+        self.chunk_size = chunk_size
+        self.logger = log
+        self.rows_written = 0
+        self.rows_skipped = 0
+        self.rejected: list[RejectedWorkout] = []
+
+        # Parents come first, so children written in the same chunk can reference them.
+        self._services: dict[str, AppService] = {
+            "workout": workout_service,
+            "workout_statistics": workout_statistic_service,
+            "heart_rate_data": heart_rate_service.heart_rate_data_service,
+            "heart_rate_recovery": heart_rate_service.heart_rate_recovery_service,
+            "active_energy": active_energy_service,
+        }
+        # Rollups of an entity, and the days samples were written to since they were last refreshed
+        self._rollups = {
+            "heart_rate_data": heart_rate_data_rollup_service,
+            "active_energy": active_energy_rollup_service,
+        }
+        self._rollup_days: dict[str, set[tuple[UUID, datetime]]] = {entity: set() for entity in self._rollups}
+        self._workouts: list[PendingWorkout] = []
+        self._pending = 0
+
+    def add(self, index: int, workout: HKWorkoutCreate, children: dict[str, list[dict[str, Any]]]) -> None:
+        """Buffer a workout with its rows per child entity. A workout is never split between chunks."""
+        self._workouts.append(PendingWorkout(index, workout, children))
+        self._pending += 1 + sum(map(len, children.values()))
+        if self._pending >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._workouts:
+            return
+
+        try:
+            self._write_chunk(self._workouts)
+        except ROW_DATA_ERRORS:
+            self.logger.debug(f"Chunk of {len(self._workouts)} workouts refused, retrying workout by workout")
+            for pending in self._workouts:
+                try:
+                    self._write_chunk([pending])
+                except ROW_DATA_ERRORS as exc:
+                    reason = row_data_error_reason(exc)
+                    self.rejected.append(RejectedWorkout(index=pending.index, name=pending.workout.type, reason=reason))
+
+        self.logger.debug(
+            f"Flushed {self._pending} import rows ({self.rows_written} written, {self.rows_skipped} skipped so far)",
+        )
+        self._workouts = []
+        self._pending = 0
+
+    def finish(self) -> None:
+        """Write what's still buffered and refresh the rollups of the days written to. Call it before committing."""
+        self.flush()
+        for entity, days in self._rollup_days.items():
+            self._rollups[entity].refresh(self.db_session, days)
+            days.clear()
+
+    def pop_rejected(self) -> list[RejectedWorkout]:
+        """Workouts rejected since the last call."""
+        rejected, self.rejected = self.rejected, []
+        return rejected
+
+    def _write_chunk(self, workouts: list[PendingWorkout]) -> None:
+        """Write the workouts under one savepoint, which a failure rolls back as a whole."""
+        written = skipped = 0
+        with self.db_session.begin_nested():
+            workout_rows = [pending.workout for pending in workouts]
+            workout_ids = self._services["workout"].get_or_create_ids(self.db_session, workout_rows)
+            workouts_written = sum(1 for creator_id, stored_id in workout_ids.items() if creator_id == stored_id)
+            written += workouts_written
+            skipped += len(workout_rows) - workouts_written
+
+            for entity, service in self._services.items():
+                if entity == "workout":
+                    continue
+                rows = []
+                for pending in workouts:
+                    stored_id = workout_ids[pending.workout.id]
+                    entity_rows = pending.children.get(entity) or []
+                    if stored_id != pending.workout.id:
+                        # Copies, so the buffered rows still hold the parsed id should the chunk be retried
+                        entity_rows = [row | {"workout_id": stored_id} for row in entity_rows]
+                    rows.extend(entity_rows)
+                if not rows:
+                    continue
+
+                count = self._write(entity, service, rows)
+                written += count
+                skipped += len(rows) - count
+                if count and entity in self._rollups:
+                    self._rollup_days[entity].update(self._rollups[entity].get_days(rows))
+
+            workout_summary_service.refresh(self.db_session, workout_ids.values())
+
+        self.rows_written += written
+        self.rows_skipped += skipped
+
+    def _write(self, entity: str, service: AppService, rows: list[dict[str, Any]]) -> int:
+        return service.bulk_create(self.db_session, rows, skip_duplicates=True)
+
+
+class CopyImportWriter(ImportWriter):
+    """
+    Streams the high-volume sample tables through binary COPY, which skips
+    per-row statement handling in the driver altogether. Workouts and their
+    statistics are few and keep going through the ORM path.
+    """
+
+    copy_entities = frozenset({"heart_rate_data", "heart_rate_recovery", "active_energy"})
+
+    def _write(self, entity: str, service: AppService, rows: list[dict[str, Any]]) -> int:
+        if entity in self.copy_entities:
+            return service.copy_create(self.db_session, rows, skip_duplicates=True)
+        return super()._write(entity, service, rows)
+
+
+IMPORT_WRITERS: dict[ImportBackend, type[ImportWriter]] = {
+    ImportBackend.ORM: ImportWriter,
+    ImportBackend.COPY: CopyImportWriter,
+}
@@ -1,16 +1,27 @@
+from datetime import date, datetime, timedelta, timezone
 from logging import Logger
 
+from sqlalchemy import Row, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
 from app.database import DbSession
 from app.models import HeartRateData
 from app.repositories import HeartRateDataRepository
 from app.schemas import (
+    AEHeartRateFilterParams,
     AEHeartRateQueryParams,
     AEHeartRateDataCreate, 
     AEHeartRateDataUpdate
 )
 from app.services import AppService
+from app.utils.dates import add_months
 from app.utils.exceptions import handle_exceptions
 
+# Creating a partition has to lock heartratedata exclusively, and workout and user against writes.
+# Rather than queue behind running imports (and stall everything queued behind it), give up and try again later.
+PARTITION_LOCK_TIMEOUT = "5s"
+
 
 class HeartRateDataService(AppService[HeartRateDataRepository, HeartRateData, AEHeartRateDataCreate, AEHeartRateDataUpdate]):
     """Service for heart rate data business logic."""
@@ -22,6 +33,8 @@ class HeartRateDataService(AppService[HeartRateDataRepository, HeartRateData, AE
             log=log,
             **kwargs
         )
+        # Month up to which partitions are known to exist, to skip the catalog lookup
+        self._partitions_until: date | None = None
 
     @handle_exceptions
     async def get_heart_rate_data_with_filters(
@@ -29,7 +42,7 @@ class HeartRateDataService(AppService[HeartRateDataRepository, HeartRateData, AE
         db_session: DbSession, 
         query_params: AEHeartRateQueryParams,
         user_id: str
-    ) -> tuple[list[HeartRateData], int]:
+    ) -> tuple[list[HeartRateData], int | None]:
         """
         Get heart rate data with filtering, sorting, and pagination.
         """
@@ -42,3 +55,65 @@ class HeartRateDataService(AppService[HeartRateDataRepository, HeartRateData, AE
         self.logger.debug(f"Retrieved {len(data)} heart rate records out of {total_count} total")
         
         return data, total_count
+
+    @handle_exceptions
+    async def get_first_date(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateFilterParams,
+        user_id: str,
+    ) -> datetime | None:
+        return self.crud.get_first_date(db_session, query_params, user_id)
+
+    @handle_exceptions
+    async def get_heart_rate_series(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateFilterParams,
+        user_id: str,
+        width: timedelta,
+    ) -> list[Row]:
+        """
+        Get heart rate aggregates per time bucket of `width`.
+        """
+        self.logger.debug(f"Fetching heart rate series in {width} buckets with filters: {query_params.model_dump()}")
+
+        series = self.crud.get_series(
+            db_session, query_params, user_id, width, from_rollups=settings.aggregate_from_rollups,
+        )
+
+        self.logger.debug(f"Retrieved heart rate series of {len(series)} buckets")
+
+        return series
+
+    def ensure_partitions(self, db_session: DbSession, until: date) -> list[str]:
+        """
+        Create the monthly partitions after the newest existing one, through the month of `until`.
+        Runs as its own short transaction, so call it before starting an import on the session.
+        Returns the names of the new partitions, or nothing if the tables were busy.
+        """
+        until = add_months(until, 0)  # first day of its month
+        if self._partitions_until and until <= self._partitions_until:
+            return []
+
+        created = []
+        try:
+            db_session.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+            # One creator at a time across processes, each seeing what the previous one added
+            db_session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": self.name})
+            end = self.crud.get_partitions_end(db_session)
+            # First month starting at or after the end of the existing partitions
+            month = add_months((end - timedelta(microseconds=1)).astimezone(timezone.utc).date(), 1) if end else until
+            while month <= until:
+                created.append(self.crud.create_month_partition(db_session, month))
+                month = add_months(month, 1)
+            db_session.commit()
+        except OperationalError as exc:
+            db_session.rollback()
+            self.logger.warning(f"Skipped creating {self.name} partitions, tables are busy: {exc.orig}")
+            return []
+
+        self._partitions_until = until
+        if created:
+            self.logger.info(f"Created {self.name} partitions: {', '.join(created)}")
+        return created
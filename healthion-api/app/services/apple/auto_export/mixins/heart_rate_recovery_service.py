@@ -1,5 +1,10 @@
+from datetime import datetime
 from logging import Logger
 
+import numpy as np
+from sqlalchemy import Row
+
+from app.config import settings
 from app.database import DbSession
 from app.models import HeartRateRecovery
 from app.repositories import HeartRateRecoveryRepository
@@ -29,7 +34,7 @@ class HeartRateRecoveryService(AppService[HeartRateRecoveryRepository, HeartRate
         db_session: DbSession, 
         query_params: AEHeartRateQueryParams,
         user_id: str
-    ) -> tuple[list[HeartRateRecovery], int]:
+    ) -> tuple[list[HeartRateRecovery], int | None]:
         """
         Get heart rate recovery data with filtering, sorting, and pagination.
         """
@@ -55,8 +60,66 @@ class HeartRateRecoveryService(AppService[HeartRateRecoveryRepository, HeartRate
         """
         self.logger.debug(f"Generating heart rate summary with filters: {query_params.model_dump()}")
         
-        summary = self.crud.get_heart_rate_summary(db_session, query_params, user_id)
+        summary = self.crud.get_heart_rate_summary(
+            db_session, query_params, user_id, from_rollups=settings.aggregate_from_rollups,
+        )
         
         self.logger.debug(f"Generated heart rate summary with {summary['total_records']} total records")
         
         return summary
+
+    @handle_exceptions
+    async def get_heart_rate_page(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateQueryParams,
+        user_id: str,
+    ) -> tuple[list[Row], list[Row], dict, int, int]:
+        """
+        Get heart rate data and recovery pages with the summary, in a single query.
+        """
+        self.logger.debug(f"Fetching heart rate page with filters: {query_params.model_dump()}")
+
+        page = self.crud.get_heart_rate_page(
+            db_session, query_params, user_id, from_rollups=settings.aggregate_from_rollups,
+        )
+
+        self.logger.debug(f"Retrieved {len(page[0])} heart rate and {len(page[1])} heart rate recovery records")
+
+        return page
+
+    @handle_exceptions
+    async def get_heart_rate_arrays(
+        self,
+        db_session: DbSession,
+        query_params: AEHeartRateQueryParams,
+        user_id: str,
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """
+        Get the id, date, avg, min and max of every heart rate data and recovery record matching the filters,
+        oldest first, as arrays.
+        """
+        self.logger.debug(f"Fetching heart rate arrays with filters: {query_params.model_dump()}")
+
+        arrays = self.crud.get_heart_rate_arrays(db_session, query_params, user_id)
+
+        counts = ", ".join(f"{len(columns['id'])} {table}" for table, columns in arrays.items())
+        self.logger.debug(f"Retrieved arrays of {counts or 'no'} records")
+
+        return arrays
+
+    @handle_exceptions
+    async def get_heart_rate_records(
+        self,
+        db_session: DbSession,
+        user_id: str,
+        records: dict[str, tuple[list[int], datetime, datetime]],
+    ) -> tuple[list[Row], list[Row]]:
+        """
+        Get heart rate data and recovery records by id, oldest first.
+        """
+        hr_data, recovery_data = self.crud.get_heart_rate_records(db_session, user_id, records)
+
+        self.logger.debug(f"Retrieved {len(hr_data)} heart rate and {len(recovery_data)} heart rate recovery records")
+
+        return hr_data, recovery_data
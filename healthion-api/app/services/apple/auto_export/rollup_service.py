@@ -0,0 +1,75 @@
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import chain
+from logging import Logger, getLogger
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect, literal, select
+from sqlalchemy.orm import Session, UOWTransaction
+
+from app.database import BaseDbModel, DbSession, SessionLocal
+from app.models import ActiveEnergy, HeartRateData, Workout
+from app.repositories import ActiveEnergyRollupRepository, HeartRateDataRollupRepository, RollupRepository
+from app.utils.dates import utc_day
+
+
+class RollupService:
+    """
+    Keeps the hourly and daily rollups of a sample table in step with the samples.
+
+    Imports refresh the days they wrote samples to before committing. Samples created, changed or deleted one
+    by one through the session are picked up after every flush, and so are the samples the
+    database deletes along with a workout.
+    """
+
+    def __init__(self, crud_model: type[RollupRepository], model: type[BaseDbModel], log: Logger):
+        self.model = model
+        self.crud = crud_model(model)
+        self.logger = log
+        self.name = model.__tablename__
+        # Days whose samples go along with workouts deleted in a flush, looked up before the database drops them
+        self._deleted_workout_days = f"{self.name}_deleted_workout_days"
+
+    def refresh(self, db_session: DbSession, days: Iterable[tuple[UUID, datetime]]) -> None:
+        """Roll up the given (user, UTC midnight) days again."""
+        days = set(days)
+        self.crud.refresh(db_session, days)
+        self.logger.debug(f"Refreshed {len(days)} days of {self.name} rollups")
+
+    def get_days(self, rows: Iterable[dict[str, Any]]) -> set[tuple[UUID, datetime]]:
+        """(user, UTC midnight) days of the given samples, as column dicts like the imports write them."""
+        return {(row["user_id"], utc_day(row["date"])) for row in rows}
+
+    def collect_deleted_workouts(self, session: Session, _: UOWTransaction, __: Any) -> None:
+        workout_ids = [instance.id for instance in session.deleted if isinstance(instance, Workout)]
+        if not workout_ids:
+            return
+        bucket = func.date_trunc("day", self.model.date, literal("UTC"))
+        days = session.execute(
+            select(self.model.user_id, bucket).where(self.model.workout_id.in_(workout_ids)).distinct(),
+        )
+        session.info.setdefault(self._deleted_workout_days, set()).update(map(tuple, days))
+
+    def refresh_flushed(self, session: Session, _: UOWTransaction) -> None:
+        """Refresh the days of the samples a flush created, changed or deleted - before and after a change."""
+        days = session.info.pop(self._deleted_workout_days, set())
+        for instance in chain(session.new, session.dirty, session.deleted):
+            if isinstance(instance, self.model):
+                state = inspect(instance)
+                days.update(
+                    (user_id, utc_day(moment))
+                    for user_id in state.attrs.user_id.history.sum()
+                    for moment in state.attrs.date.history.sum()
+                    if user_id and moment
+                )
+        if days:
+            self.refresh(session, days)
+
+
+heart_rate_data_rollup_service = RollupService(HeartRateDataRollupRepository, HeartRateData, getLogger(__name__))
+active_energy_rollup_service = RollupService(ActiveEnergyRollupRepository, ActiveEnergy, getLogger(__name__))
+
+for rollup_service in (heart_rate_data_rollup_service, active_energy_rollup_service):
+    event.listen(SessionLocal, "before_flush", rollup_service.collect_deleted_workouts)
+    event.listen(SessionLocal, "after_flush", rollup_service.refresh_flushed)
@@ -6,20 +6,22 @@ from app.database import DbSession
 from app.models import Workout
 from app.repositories import AEWorkoutRepository
 from app.schemas import (
-    AEWorkoutQueryParams, 
-    AEWorkoutCreate, 
-    AEWorkoutUpdate,
-    AEWorkoutListResponse,
-    AEWorkoutResponse,
-    AESummary,
-    AEWorkoutMeta,
-    AEDistanceValue,
     AEActiveEnergyValue,
-    AEIntensityValue,
     AEDateRange,
+    AEDistanceValue,
+    AEIntensityValue,
+    AESummary,
+    AEWorkoutCreate,
+    AEWorkoutListResponse,
+    AEWorkoutMeta,
+    AEWorkoutQueryParams,
+    AEWorkoutResponse,
+    AEWorkoutUpdate,
 )
 from app.services import AppService
+from app.services.apple.workout_summary_service import workout_summary_service
 from app.utils.exceptions import handle_exceptions
+from app.utils.pagination import encode_cursor, next_position
 
 
 class WorkoutService(AppService[AEWorkoutRepository, Workout, AEWorkoutCreate, AEWorkoutUpdate]):
@@ -39,7 +41,7 @@ class WorkoutService(AppService[AEWorkoutRepository, Workout, AEWorkoutCreate, A
         db_session: DbSession, 
         query_params: AEWorkoutQueryParams,
         user_id: str
-    ) -> tuple[list[Workout], int]:
+    ) -> tuple[list[Workout], int | None]:
         """
         Get workouts with filtering, sorting, and pagination.
         Includes business logic and logging.
@@ -55,22 +57,27 @@ class WorkoutService(AppService[AEWorkoutRepository, Workout, AEWorkoutCreate, A
         return workouts, total_count
 
     @handle_exceptions
-    async def _get_workout_with_summary(
-        self, 
-        db_session: DbSession, 
-        workout_id: UUID
-    ) -> tuple[Workout | None, dict]:
+    async def _get_workout_summaries(
+        self,
+        db_session: DbSession,
+        workouts: list[Workout],
+    ) -> dict[UUID, dict]:
         """
-        Get a single workout with its summary statistics.
+        Get the summary statistics of a page of workouts, all in one query.
         """
-        self.logger.debug(f"Fetching workout {workout_id} with summary")
+        self.logger.debug(f"Fetching summaries of {len(workouts)} workouts")
         
-        workout = self.get(db_session, workout_id, raise_404=True)
-        summary = self.crud.get_workout_summary(db_session, workout_id)
+        summaries = workout_summary_service.get_summaries(db_session, [workout.id for workout in workouts])
         
-        self.logger.debug(f"Retrieved workout {workout_id} with summary data")
+        self.logger.debug(f"Retrieved summary data of {len(summaries)} workouts")
         
-        return workout, summary
+        return summaries
+
+    def _next_cursor(self, workouts: list[Workout], query_params: AEWorkoutQueryParams) -> str | None:
+        position = next_position(
+            workouts, query_params.sort_by or "startDate", query_params.sort_order, query_params.limit,
+        )
+        return encode_cursor({Workout.__tablename__: position}) if position else None
 
     @handle_exceptions
     async def get_workouts_response(
@@ -89,10 +96,11 @@ class WorkoutService(AppService[AEWorkoutRepository, Workout, AEWorkoutCreate, A
         workouts, total_count = await self._get_workouts_with_filters(db_session, query_params, user_id)
         
         # Convert workouts to response format
+        summaries = await self._get_workout_summaries(db_session, workouts)
         workout_responses = []
         for workout in workouts:
             # Get summary data
-            _, summary_data = await self._get_workout_with_summary(db_session, workout.id)
+            summary_data = summaries[workout.id]
             
             # Build response object
             workout_response = AEWorkoutResponse(
@@ -137,6 +145,7 @@ class WorkoutService(AppService[AEWorkoutRepository, Workout, AEWorkoutCreate, A
                 end=end_date_str,
                 duration_days=duration_days,
             ),
+            next_cursor=self._next_cursor(workouts, query_params),
         )
 
         return AEWorkoutListResponse(
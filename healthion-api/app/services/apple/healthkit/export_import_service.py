@@ -0,0 +1,188 @@
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from logging import Logger, getLogger
+from typing import Any, BinaryIO
+from uuid import UUID, uuid4
+from xml.etree.ElementTree import Element, iterparse
+
+from app.config import settings
+from app.database import DbSession
+from app.schemas import ImportJob
+from app.services.apple.healthkit.metadata_entry_service import metadata_entry_service
+from app.services.apple.healthkit.record_service import record_service
+from app.utils.dates import parse_apple_datetime
+
+# Column limits of the record and metadataentry tables
+MAX_TYPE_LENGTH = 50
+MAX_SOURCE_NAME_LENGTH = 100
+MAX_UNIT_LENGTH = 10
+MAX_METADATA_KEY_LENGTH = 50
+MAX_ABS_VALUE = Decimal("1e10")  # NUMERIC(15, 5)
+
+
+class ExportImportService:
+    """
+    Imports the `export.xml` of an Apple Health export into Record and
+    MetadataEntry rows.
+
+    Exports run into gigabytes, so the XML is read incrementally and every
+    top-level element is dropped from the tree as soon as it's been handled.
+    Records are buffered and written `import_chunk_size` at a time, so memory
+    stays flat and throughput steady for any export size.
+    """
+
+    # The export zip also holds export_cda.xml and workout routes
+    zip_member_suffix = "export.xml"
+
+    def __init__(self, log: Logger, **kwargs):
+        self.log = log
+        self.record_service = record_service
+        self.metadata_entry_service = metadata_entry_service
+
+    def _value(self, raw: str | None) -> Decimal | None:
+        """Numeric value that fits NUMERIC(15, 5), or None for category values, text and out-of-range numbers."""
+        try:
+            value = Decimal(raw)
+        except (InvalidOperation, TypeError):
+            return None
+        if not value.is_finite() or abs(value) >= MAX_ABS_VALUE:
+            return None
+        return value
+
+    def _record_row(self, element: Element, user_id: UUID) -> tuple[dict[str, Any] | None, str | None]:
+        """Build a record row, or return the reason it can't be stored."""
+        attributes = element.attrib
+        record_type = attributes.get("type", "")
+        source_name = attributes.get("sourceName", "")
+        unit = attributes.get("unit")
+
+        if (value := self._value(attributes.get("value"))) is None:
+            return None, "non-numeric value"
+        if not unit:
+            return None, "missing unit"
+        if (
+            len(record_type) > MAX_TYPE_LENGTH
+            or len(source_name) > MAX_SOURCE_NAME_LENGTH
+            or len(unit) > MAX_UNIT_LENGTH
+        ):
+            return None, "field too long"
+        if "startDate" not in attributes or "endDate" not in attributes:
+            return None, "missing date"
+        try:
+            start_date = parse_apple_datetime(attributes["startDate"])
+            end_date = parse_apple_datetime(attributes["endDate"])
+        except ValueError:
+            return None, "invalid date"
+
+        return {
+            "user_id": user_id,
+            "type": record_type,
+            "sourceName": source_name,
+            "startDate": start_date,
+            "endDate": end_date,
+            "unit": unit,
+            "value": value,
+        }, None
+
+    def _metadata_rows(self, element: Element, user_id: UUID) -> list[dict[str, Any]]:
+        """Metadata entries of a record that the numeric metadataentry table can hold."""
+        rows = []
+        for entry in element.iterfind("MetadataEntry"):
+            key = entry.get("key", "")
+            value = self._value(entry.get("value"))
+            if value is None or len(key) > MAX_METADATA_KEY_LENGTH:
+                continue
+            rows.append({"id": uuid4(), "user_id": user_id, "record_id": None, "key": key, "value": value})
+        return rows
+
+    def _write_chunk(
+        self,
+        db_session: DbSession,
+        records: list[dict[str, Any]],
+        metadata: list[list[dict[str, Any]]],
+    ) -> int:
+        """Insert buffered records, then their metadata linked to the new record ids. Returns rows written."""
+        record_ids = self.record_service.bulk_create_returning_ids(db_session, records)
+
+        metadata_rows = []
+        for record_id, entries in zip(record_ids, metadata):
+            for entry in entries:
+                entry["record_id"] = record_id
+                metadata_rows.append(entry)
+        self.metadata_entry_service.bulk_create(db_session, metadata_rows)
+
+        return len(record_ids) + len(metadata_rows)
+
+    def load_data(
+        self,
+        db_session: DbSession,
+        content: BinaryIO,
+        user_id: str,
+        job: ImportJob | None = None,
+    ) -> bool:
+        owner_id = UUID(user_id)
+        records: list[dict[str, Any]] = []
+        metadata: list[list[dict[str, Any]]] = []
+        rows_written = 0
+        skipped: Counter[str] = Counter()
+
+        root = None
+        depth = 0
+        for event, element in iterparse(content, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth != 1:
+                # Children (like a record's MetadataEntry) are handled with their top-level element
+                continue
+
+            if element.tag == "Record":
+                row, reason = self._record_row(element, owner_id)
+                if row:
+                    records.append(row)
+                    metadata.append(self._metadata_rows(element, owner_id))
+                else:
+                    skipped[reason] += 1
+
+            # Drop everything handled so far, so the tree never grows past one element
+            root.clear()
+
+            if len(records) >= settings.import_chunk_size:
+                rows_written += self._write_chunk(db_session, records, metadata)
+                records, metadata = [], []
+                if job:
+                    job.rows_written = rows_written
+                    job.rows_skipped = skipped.total()
+
+        rows_written += self._write_chunk(db_session, records, metadata)
+        db_session.commit()
+
+        if job:
+            job.rows_written = rows_written
+            job.rows_skipped = skipped.total()
+
+        self.log.info(
+            f"Imported {rows_written} record and metadata rows from Apple Health export, "
+            f"skipped {skipped.total()} records ({dict(skipped)})",
+        )
+
+        return True
+
+    def import_data(
+        self,
+        db_session: DbSession,
+        content: BinaryIO,
+        content_type: str,
+        user_id: str,
+        job: ImportJob | None = None,
+    ) -> None:
+        """Import an uploaded export.xml, reporting progress on `job` when given."""
+        # The multipart envelope is already stripped off by the route, so both content types read the same
+        self.load_data(db_session, content, user_id=user_id, job=job)
+
+
+export_import_service = ExportImportService(log=getLogger(__name__))
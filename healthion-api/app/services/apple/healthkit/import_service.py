@@ -1,38 +1,48 @@
-import json
 from decimal import Decimal
 from uuid import UUID, uuid4
-from typing import Iterable
+from typing import BinaryIO, Iterable
 from logging import Logger, getLogger
 
 from app.database import DbSession
 from app.services.apple.healthkit.workout_service import workout_service
 from app.services.apple.healthkit.workout_statistic_service import workout_statistic_service
+from app.services.apple.workout_summary_service import workout_summary_service
+from app.utils.exceptions import ROW_DATA_ERRORS, row_data_error_reason
+from app.utils.json_stream import iter_json_array
 from app.schemas import (
-    HKRootJSON,
     HKNewWorkoutJSON,
     HKWorkoutIn,
     HKWorkoutCreate,
     HKWorkoutStatisticCreate,
     HKWorkoutStatisticIn,
-    UploadDataResponse,
+    ImportJob,
+    RejectedWorkout,
 )
 
 
 class ImportService:
+    zip_member_suffix = ".json"
+
     def __init__(self, log: Logger, **kwargs):
         self.log = log
         self.workout_service = workout_service
         self.workout_statistic_service = workout_statistic_service
+        self.workout_summary_service = workout_summary_service
 
-    def _build_import_bundles(self, raw: dict) -> Iterable[tuple[HKWorkoutIn, list[HKWorkoutStatisticIn]]]:
+    def _build_import_bundles(
+        self, workouts_raw: Iterable[dict],
+    ) -> Iterable[tuple[int, HKWorkoutIn, list[HKWorkoutStatisticIn]] | RejectedWorkout]:
         """
-        Given the parsed JSON dict from HealthAutoExport, yield ImportBundle(s)
-        ready to insert into your ORM session.
+        Given the workout dicts of a Healthion export (`data.workouts`), yield
+        ImportBundle(s) ready to insert into your ORM session, each with its
+        position in the upload, or a RejectedWorkout for one that doesn't validate.
         """
-        root = HKRootJSON(**raw)
-        workouts_raw = root.data.get("workouts", [])
-        for w in workouts_raw:
-            wjson = HKNewWorkoutJSON(**w)
+        for index, w in enumerate(workouts_raw):
+            try:
+                wjson = HKNewWorkoutJSON.model_validate(w)
+            except ValueError as exc:
+                yield RejectedWorkout.from_error(index, w, exc)
+                continue
 
             # Always generate a new UUID for workouts to avoid conflicts between users
             wid = uuid4()
@@ -61,85 +71,96 @@ class ImportService:
                     )
                     workout_statistics.append(stat_in)
 
-            yield workout_row, workout_statistics
-
-    def load_data(self, db_session: DbSession, raw: dict, user_id: str = None) -> bool:
-        for workout_row, workout_statistics in self._build_import_bundles(raw):
+            yield index, workout_row, workout_statistics
+
+    def _report_rejected(self, rejected: RejectedWorkout, job: ImportJob | None) -> None:
+        self.log.warning(f"Rejected workout #{rejected.index} ({rejected.name}): {rejected.reason}")
+        if job:
+            job.reject_workout(rejected)
+
+    def load_data(
+        self,
+        db_session: DbSession,
+        workouts_raw: Iterable[dict],
+        user_id: str | None = None,
+        job: ImportJob | None = None,
+    ) -> bool:
+        for bundle in self._build_import_bundles(workouts_raw):
+            if isinstance(bundle, RejectedWorkout):
+                self._report_rejected(bundle, job)
+                if job:
+                    job.workouts_done += 1
+                continue
+
+            index, workout_row, workout_statistics = bundle
             workout_data = workout_row.model_dump()
             if user_id:
                 workout_data['user_id'] = UUID(user_id)
             workout_create = HKWorkoutCreate(**workout_data)
-            created_workout = self.workout_service.create(db_session, workout_create)
-            
-            # Create workout statistics
-            for stat_in in workout_statistics:
-                stat_create = HKWorkoutStatisticCreate(
-                    user_id=created_workout.user_id,
-                    workout_id=created_workout.id,
-                    type=stat_in.type,
-                    value=stat_in.value,
-                    unit=stat_in.unit
-                )
-                self.workout_statistic_service.create(db_session, stat_create)
+
+            # Each workout under its own savepoint, so one the database refuses leaves the others in
+            try:
+                with db_session.begin_nested():
+                    # A workout sent again resolves to the stored one, and its statistics are skipped as duplicates
+                    workout_id = self.workout_service.get_or_create_ids(db_session, [workout_create])[workout_create.id]
+
+                    # Create workout statistics
+                    stat_creates = [
+                        HKWorkoutStatisticCreate(
+                            user_id=workout_create.user_id,
+                            workout_id=workout_id,
+                            type=stat_in.type,
+                            value=stat_in.value,
+                            unit=stat_in.unit,
+                        )
+                        for stat_in in workout_statistics
+                    ]
+                    stats_written = self.workout_statistic_service.bulk_create(
+                        db_session, stat_creates, skip_duplicates=True,
+                    )
+                    self.workout_summary_service.refresh(db_session, [workout_id])
+            except ROW_DATA_ERRORS as exc:
+                rejected = RejectedWorkout(index=index, name=workout_create.type, reason=row_data_error_reason(exc))
+                self._report_rejected(rejected, job)
+            else:
+                if job:
+                    rows_written = int(workout_id == workout_create.id) + stats_written
+                    job.rows_written += rows_written
+                    job.rows_skipped += 1 + len(stat_creates) - rows_written
+
+            if job:
+                job.workouts_done += 1
+
+        # The whole upload goes in with one commit, a failure above leaves it out entirely
+        db_session.commit()
 
         return True
 
-    async def import_data_from_request(
+    def import_data(
             self,
             db_session: DbSession,
-            request_content: str,
+            content: BinaryIO,
             content_type: str,
-            user_id: str
-    ) -> UploadDataResponse:
-        try:
-            # Parse content based on type
-            if "multipart/form-data" in content_type:
-                data = self._parse_multipart_content(request_content)
-            else:
-                data = self._parse_json_content(request_content)
-
-            if not data:
-                return UploadDataResponse(status_code=400, response="No valid data found")
-
-            # Load data using provided database session
-            self.load_data(db_session, data, user_id=user_id)
-
-        except Exception as e:
-            return UploadDataResponse(status_code=400, response=f"Import failed: {str(e)}")
-
-        return UploadDataResponse(status_code=200, response="Import successful")
-
-    def _parse_multipart_content(self, content: str) -> dict | None:
-        """Parse multipart form data to extract JSON."""
-        json_start = content.find('{\n  "data"')
-        if json_start == -1:
-            json_start = content.find('{"data"')
-        if json_start == -1:
-            return None
-
-        brace_count = 0
-        json_end = json_start
-        for i, char in enumerate(content[json_start:], json_start):
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    json_end = i
-                    break
-
-        if brace_count != 0:
-            return None
-
-        json_str = content[json_start:json_end + 1]
-        return json.loads(json_str)
-
-    def _parse_json_content(self, content: str) -> dict | None:
-        """Parse JSON content directly."""
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            return None
+            user_id: str,
+            job: ImportJob | None = None,
+    ) -> None:
+        """Import an uploaded Healthion file, reporting progress on `job` when given."""
+        # Parse content based on type
+        if "multipart/form-data" in content_type:
+            workouts_raw = self._parse_multipart_content(content)
+        else:
+            workouts_raw = self._parse_json_content(content)
+
+        # Load data using provided database session
+        self.load_data(db_session, workouts_raw, user_id=user_id, job=job)
+
+    def _parse_multipart_content(self, content: BinaryIO) -> Iterable[dict]:
+        """Stream `data.workouts` out of an uploaded file, ignoring anything before the JSON document."""
+        return iter_json_array(content, ("data", "workouts"), skip_preamble=True)
+
+    def _parse_json_content(self, content: BinaryIO) -> Iterable[dict]:
+        """Stream `data.workouts` out of the JSON body one workout at a time."""
+        return iter_json_array(content, ("data", "workouts"))
 
 
 import_service = ImportService(log=getLogger(__name__))
@@ -0,0 +1,23 @@
+from logging import Logger, getLogger
+
+from app.models import MetadataEntry
+from app.repositories import MetadataEntryRepository
+from app.schemas import HKMetadataEntryCreate, HKMetadataEntryUpdate
+from app.services.services import AppService
+
+
+class MetadataEntryService(
+    AppService[MetadataEntryRepository, MetadataEntry, HKMetadataEntryCreate, HKMetadataEntryUpdate],
+):
+    """Service for HealthKit record metadata business logic."""
+
+    def __init__(self, log: Logger, **kwargs):
+        super().__init__(
+            crud_model=MetadataEntryRepository,
+            model=MetadataEntry,
+            log=log,
+            **kwargs,
+        )
+
+
+metadata_entry_service = MetadataEntryService(log=getLogger(__name__))
@@ -0,0 +1,29 @@
+from collections.abc import Sequence
+from logging import Logger, getLogger
+from typing import Any
+
+from app.database import DbSession
+from app.models import Record
+from app.repositories import RecordRepository
+from app.schemas import HKRecordCreate, HKRecordUpdate
+from app.services.services import AppService
+
+
+class RecordService(AppService[RecordRepository, Record, HKRecordCreate, HKRecordUpdate]):
+    """Service for HealthKit record business logic."""
+
+    def __init__(self, log: Logger, **kwargs):
+        super().__init__(
+            crud_model=RecordRepository,
+            model=Record,
+            log=log,
+            **kwargs,
+        )
+
+    def bulk_create_returning_ids(self, db_session: DbSession, rows: Sequence[dict[str, Any]]) -> list[int]:
+        ids = self.crud.bulk_create_returning_ids(db_session, rows)
+        self.logger.debug(f"Bulk created {len(ids)} {self.name}s.")
+        return ids
+
+
+record_service = RecordService(log=getLogger(__name__))
@@ -6,17 +6,19 @@ from app.database import DbSession
 from app.models import Workout
 from app.repositories import HKWorkoutRepository
 from app.schemas import (
-    HKWorkoutQueryParams,
+    HKDateRange,
     HKWorkoutCreate,
-    HKWorkoutUpdate,
     HKWorkoutListResponse,
+    HKWorkoutMeta,
+    HKWorkoutQueryParams,
     HKWorkoutResponse,
     HKWorkoutSummary,
-    HKWorkoutMeta,
-    HKDateRange,
+    HKWorkoutUpdate,
 )
 from app.services import AppService
+from app.services.apple.workout_summary_service import workout_summary_service
 from app.utils.exceptions import handle_exceptions
+from app.utils.pagination import encode_cursor, next_position
 
 
 class WorkoutService(AppService[HKWorkoutRepository, Workout, HKWorkoutCreate, HKWorkoutUpdate]):
@@ -30,13 +32,19 @@ class WorkoutService(AppService[HKWorkoutRepository, Workout, HKWorkoutCreate, H
             **kwargs
         )
 
+    def get_or_create_ids(self, db_session: DbSession, creators: list[HKWorkoutCreate]) -> dict[UUID, UUID]:
+        ids = self.crud.get_or_create_ids(db_session, creators)
+        created = sum(1 for creator_id, stored_id in ids.items() if creator_id == stored_id)
+        self.logger.debug(f"Created {created} of {len(creators)} {self.name}s, the rest already existed.")
+        return ids
+
     @handle_exceptions
     async def _get_workouts_with_filters(
         self, 
         db_session: DbSession, 
         query_params: HKWorkoutQueryParams,
         user_id: str
-    ) -> tuple[list[Workout], int]:
+    ) -> tuple[list[Workout], int | None]:
         """
         Get workouts with filtering, sorting, and pagination.
         Includes business logic and logging.
@@ -52,22 +60,27 @@ class WorkoutService(AppService[HKWorkoutRepository, Workout, HKWorkoutCreate, H
         return workouts, total_count
 
     @handle_exceptions
-    async def _get_workout_with_summary(
-        self, 
-        db_session: DbSession, 
-        workout_id: UUID
-    ) -> tuple[Workout | None, dict]:
+    async def _get_workout_summaries(
+        self,
+        db_session: DbSession,
+        workouts: list[Workout],
+    ) -> dict[UUID, dict]:
         """
-        Get a single workout with its summary statistics.
+        Get the summary statistics of a page of workouts, all in one query.
         """
-        self.logger.debug(f"Fetching HealthKit workout {workout_id} with summary")
+        self.logger.debug(f"Fetching summaries of {len(workouts)} HealthKit workouts")
         
-        workout = self.get(db_session, workout_id, raise_404=True)
-        summary = self.crud.get_workout_summary(db_session, workout_id)
+        summaries = workout_summary_service.get_summaries(db_session, [workout.id for workout in workouts])
         
-        self.logger.debug(f"Retrieved HealthKit workout {workout_id} with summary data")
+        self.logger.debug(f"Retrieved summary data of {len(summaries)} HealthKit workouts")
         
-        return workout, summary
+        return summaries
+
+    def _next_cursor(self, workouts: list[Workout], query_params: HKWorkoutQueryParams) -> str | None:
+        position = next_position(
+            workouts, query_params.sort_by or "startDate", query_params.sort_order, query_params.limit,
+        )
+        return encode_cursor({Workout.__tablename__: position}) if position else None
 
     @handle_exceptions
     async def get_workouts_response(
@@ -84,9 +97,11 @@ class WorkoutService(AppService[HKWorkoutRepository, Workout, HKWorkoutCreate, H
         """
         workouts, total_count = await self._get_workouts_with_filters(db_session, query_params, user_id)
         
+        summaries = await self._get_workout_summaries(db_session, workouts)
+
         workout_responses = []
         for workout in workouts:
-            _, summary_data = await self._get_workout_with_summary(db_session, workout.id)
+            summary_data = summaries[workout.id]
             
             workout_response = HKWorkoutResponse(
                 id=workout.id,
@@ -97,8 +112,6 @@ class WorkoutService(AppService[HKWorkoutRepository, Workout, HKWorkoutCreate, H
                 durationUnit=workout.durationUnit,
                 sourceName=workout.sourceName,
                 user_id=workout.user_id,
-                created_at=workout.created_at,
-                updated_at=workout.updated_at,
                 summary=HKWorkoutSummary(**summary_data),
             )
             workout_responses.append(workout_response)
@@ -120,6 +133,7 @@ class WorkoutService(AppService[HKWorkoutRepository, Workout, HKWorkoutCreate, H
                 end=end_date_str,
                 duration_days=duration_days,
             ),
+            next_cursor=self._next_cursor(workouts, query_params),
         )
 
         return HKWorkoutListResponse(
@@ -0,0 +1,71 @@
+from collections.abc import Iterable, Sequence
+from itertools import chain
+from logging import Logger, getLogger
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, UOWTransaction
+
+from app.database import DbSession, SessionLocal
+from app.models import ActiveEnergy, HeartRateData, WorkoutStatistic, WorkoutSummary
+from app.repositories import WorkoutSummaryRepository
+
+# Rows the summaries are computed from
+SUMMARIZED_MODELS = (WorkoutStatistic, HeartRateData, ActiveEnergy)
+# Summary values returned as floats, zero when there's nothing to compute them from
+SUMMARY_VALUES = (
+    "avg_statistic_value",
+    "max_statistic_value",
+    "min_statistic_value",
+    "avg_heart_rate",
+    "max_heart_rate",
+    "min_heart_rate",
+    "total_calories",
+)
+
+
+class WorkoutSummaryService:
+    """
+    Keeps the precomputed workout summaries in step with the rows they're computed from.
+
+    Imports refresh the summaries of the workouts they write to. Rows created, changed or
+    deleted one by one through the session are picked up after every flush. Deleting a
+    workout deletes its summary along with it.
+    """
+
+    def __init__(self, log: Logger):
+        self.logger = log
+        self.crud = WorkoutSummaryRepository(WorkoutSummary)
+
+    def get_summaries(self, db_session: DbSession, workout_ids: Sequence[UUID]) -> dict[UUID, dict]:
+        """Summary statistics of the given workouts by id, all in one query. Zeros for a workout without any."""
+        summaries = self.crud.get_summaries(db_session, workout_ids)
+        return {workout_id: self._summary_data(summaries.get(workout_id)) for workout_id in workout_ids}
+
+    @staticmethod
+    def _summary_data(summary: WorkoutSummary | None) -> dict:
+        return {
+            "total_statistics": summary.total_statistics if summary else 0,
+            **{name: float(getattr(summary, name, None) or 0) for name in SUMMARY_VALUES},
+        }
+
+    def refresh(self, db_session: DbSession, workout_ids: Iterable[UUID]) -> None:
+        workout_ids = set(workout_ids)
+        self.crud.refresh(db_session, workout_ids)
+        self.logger.debug(f"Refreshed summaries of {len(workout_ids)} workouts")
+
+    def refresh_flushed(self, session: Session, _: UOWTransaction) -> None:
+        """Refresh the workouts whose rows a flush created, changed or deleted - before and after a change."""
+        workout_ids = set()
+        for instance in chain(session.new, session.dirty, session.deleted):
+            if isinstance(instance, SUMMARIZED_MODELS):
+                history = inspect(instance).attrs.workout_id.history
+                workout_ids.update(history.added, history.unchanged, history.deleted)
+        workout_ids.discard(None)
+        if workout_ids:
+            self.refresh(session, workout_ids)
+
+
+workout_summary_service = WorkoutSummaryService(log=getLogger(__name__))
+
+event.listen(SessionLocal, "after_flush", workout_summary_service.refresh_flushed)
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from logging import Logger, getLogger
+from threading import Lock
+from typing import BinaryIO
+from uuid import UUID
+
+from app.config import settings
+from app.database import SessionLocal
+from app.schemas import ImportJob, ImportJobStatus
+from app.services.apple.auto_export.import_service import ImportService as AEImportService
+from app.services.apple.healthkit.export_import_service import ExportImportService
+from app.services.apple.healthkit.import_service import ImportService as HKImportService
+from app.utils.compression import Compression, open_decompressed
+from app.utils.exceptions import ResourceNotFoundError, handle_exceptions
+
+type Importer = AEImportService | HKImportService | ExportImportService
+
+
+class ImportJobService:
+    """
+    Accepts uploads into an in-process queue and imports them on a pool of
+    worker threads, so a request only has to hand the file over.
+
+    Job state lives in memory: it is lost on restart and is only visible to
+    the process that accepted the upload.
+    """
+
+    def __init__(self, log: Logger, max_workers: int, job_ttl: timedelta):
+        self.logger = log
+        self.name = "import job"
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-worker")
+        self._jobs: dict[UUID, ImportJob] = {}
+        self._lock = Lock()
+
+    def submit(
+        self,
+        importer: Importer,
+        source: str,
+        content: BinaryIO,
+        content_type: str,
+        user_id: str,
+        compression: Compression = Compression.NONE,
+    ) -> ImportJob:
+        """
+        Queue an upload for import. The job takes ownership of `content` and closes it when done.
+        Compressed uploads are kept compressed until the worker decompresses them while parsing.
+        """
+        job = ImportJob(user_id=user_id, source=source)
+        with self._lock:
+            self._prune_finished_jobs()
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, importer, content, content_type, compression)
+        self.logger.info(f"Queued import job {job.id} ({source}) for user {user_id}")
+
+        return job
+
+    @handle_exceptions
+    async def get_job(self, job_id: UUID, user_id: str) -> ImportJob:
+        job = self._jobs.get(job_id)
+        if not job or job.user_id != user_id:
+            raise ResourceNotFoundError(self.name, job_id)
+        return job
+
+    def _run(
+        self,
+        job: ImportJob,
+        importer: Importer,
+        content: BinaryIO,
+        content_type: str,
+        compression: Compression,
+    ) -> None:
+        job.status = ImportJobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        self.logger.info(f"Started import job {job.id}")
+
+        try:
+            with (
+                SessionLocal() as db_session,
+                open_decompressed(content, compression, importer.zip_member_suffix) as stream,
+            ):
+                importer.import_data(db_session, stream, content_type, job.user_id, job=job)
+        except Exception as exc:
+            self.logger.exception(f"Import job {job.id} failed")
+            job.errors.append(str(exc))
+            job.status = ImportJobStatus.FAILED
+        else:
+            job.status = ImportJobStatus.COMPLETED
+        finally:
+            content.close()
+            job.finished_at = datetime.now(timezone.utc)
+
+        self.logger.info(
+            f"Finished import job {job.id}: {job.status.value}, "
+            f"{job.workouts_done} workouts, {job.rows_written} rows",
+        )
+
+    def _prune_finished_jobs(self) -> None:
+        expired_before = datetime.now(timezone.utc) - self.job_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < expired_before:
+                del self._jobs[job_id]
+
+
+import_job_service = ImportJobService(
+    log=getLogger(__name__),
+    max_workers=settings.import_workers,
+    job_ttl=timedelta(seconds=settings.import_job_ttl_seconds),
+)
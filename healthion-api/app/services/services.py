@@ -1,4 +1,6 @@
+from collections.abc import Sequence
 from logging import Logger
+from typing import Any
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -34,6 +36,26 @@ class AppService[
         self.logger.debug(f"Created {self.name} with ID: {creation.id}.")
         return creation
 
+    def bulk_create(
+        self,
+        db_session: DbSession,
+        creators: Sequence[CreateSchemaType | dict[str, Any]],
+        skip_duplicates: bool = False,
+    ) -> int:
+        inserted = self.crud.bulk_create(db_session, creators, skip_duplicates)
+        self.logger.debug(f"Bulk created {inserted} of {len(creators)} {self.name}s.")
+        return inserted
+
+    def copy_create(
+        self,
+        db_session: DbSession,
+        creators: Sequence[CreateSchemaType | dict[str, Any]],
+        skip_duplicates: bool = False,
+    ) -> int:
+        inserted = self.crud.copy_create(db_session, creators, skip_duplicates)
+        self.logger.debug(f"Copied {inserted} of {len(creators)} {self.name}s.")
+        return inserted
+
     def get(
         self,
         db_session: DbSession,
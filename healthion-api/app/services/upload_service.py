@@ -0,0 +1,124 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from logging import Logger, getLogger
+from pathlib import Path
+from typing import BinaryIO
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.schemas import Upload, UploadCreate
+from app.utils.exceptions import ResourceNotFoundError, UploadConflictError, handle_exceptions
+
+
+class UploadService:
+    """
+    Collects large files chunk by chunk, so a dropped connection only costs the
+    chunk in flight: the client asks for the current offset and carries on from
+    there. Chunks are appended straight to a file under `upload_dir`, and the
+    import starts only once the client finalizes the complete upload.
+
+    Upload state lives in memory like import jobs: after a restart, unfinished
+    uploads are dropped and their files removed once they expire.
+    """
+
+    def __init__(self, log: Logger, upload_dir: Path, upload_ttl: timedelta):
+        self.logger = log
+        self.name = "upload"
+        self.upload_dir = upload_dir
+        self.upload_ttl = upload_ttl
+        self._uploads: dict[UUID, Upload] = {}
+        # Uploads with a chunk being written, a second concurrent chunk is refused
+        self._writing: set[UUID] = set()
+
+    def create(self, user_id: str, upload_in: UploadCreate) -> Upload:
+        self._prune_expired_uploads()
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+
+        upload = Upload.model_validate(upload_in.model_dump() | {"user_id": user_id})
+        self._path(upload.id).touch()
+        self._uploads[upload.id] = upload
+        self.logger.info(f"Started upload {upload.id} ({upload.source.value}) for user {user_id}")
+
+        return upload
+
+    @handle_exceptions
+    async def get_upload(self, upload_id: UUID, user_id: str) -> Upload:
+        return self._get(upload_id, user_id)
+
+    @handle_exceptions
+    async def append(self, upload_id: UUID, user_id: str, offset: int, chunks: AsyncIterator[bytes]) -> Upload:
+        """
+        Append a chunk at `offset`, which has to be the current end of the upload.
+        Bytes are written as they arrive and the offset advances with them, so even
+        an interrupted chunk keeps whatever made it to disk.
+        """
+        upload = self._get(upload_id, user_id)
+        if upload_id in self._writing:
+            raise UploadConflictError(f"Upload {upload_id} is already receiving a chunk.")
+        if offset != upload.offset:
+            raise UploadConflictError(f"Upload {upload_id} is at offset {upload.offset}, not {offset}.")
+
+        self._writing.add(upload_id)
+        try:
+            with self._path(upload_id).open("ab") as file:
+                async for chunk in chunks:
+                    if upload.size is not None and upload.offset + len(chunk) > upload.size:
+                        raise UploadConflictError(f"Upload {upload_id} would exceed its size of {upload.size} bytes.")
+                    await run_in_threadpool(file.write, chunk)
+                    upload.offset += len(chunk)
+        finally:
+            self._writing.discard(upload_id)
+            upload.updated_at = datetime.now(timezone.utc)
+
+        return upload
+
+    @handle_exceptions
+    async def finalize(self, upload_id: UUID, user_id: str) -> tuple[Upload, BinaryIO]:
+        """
+        Close a complete upload and hand over its file. The file is already unlinked,
+        so it's gone from disk as soon as the caller closes it.
+        """
+        upload = self._get(upload_id, user_id)
+        if upload_id in self._writing:
+            raise UploadConflictError(f"Upload {upload_id} is still receiving a chunk.")
+        if upload.size is not None and upload.offset != upload.size:
+            raise UploadConflictError(f"Upload {upload_id} has {upload.offset} of {upload.size} bytes.")
+
+        path = self._path(upload_id)
+        content = path.open("rb")
+        path.unlink()
+        del self._uploads[upload_id]
+        self.logger.info(f"Finalized upload {upload_id} with {upload.offset} bytes")
+
+        return upload, content
+
+    def _get(self, upload_id: UUID, user_id: str) -> Upload:
+        upload = self._uploads.get(upload_id)
+        if not upload or upload.user_id != user_id:
+            raise ResourceNotFoundError(self.name, upload_id)
+        return upload
+
+    def _path(self, upload_id: UUID) -> Path:
+        return self.upload_dir / f"{upload_id}.part"
+
+    def _prune_expired_uploads(self) -> None:
+        expired_before = datetime.now(timezone.utc) - self.upload_ttl
+        for upload_id, upload in list(self._uploads.items()):
+            if upload.updated_at < expired_before and upload_id not in self._writing:
+                del self._uploads[upload_id]
+                self._path(upload_id).unlink(missing_ok=True)
+
+        # Files left behind by a previous run, which no longer has an upload to go with them
+        known = {str(upload_id) for upload_id in self._uploads}
+        for path in self.upload_dir.glob("*.part"):
+            if path.stem not in known and path.stat().st_mtime < expired_before.timestamp():
+                path.unlink(missing_ok=True)
+
+
+upload_service = UploadService(
+    log=getLogger(__name__),
+    upload_dir=settings.upload_dir,
+    upload_ttl=timedelta(seconds=settings.upload_ttl_seconds),
+)
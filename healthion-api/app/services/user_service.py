@@ -1,15 +1,19 @@
+from datetime import timedelta
 from logging import Logger, getLogger
+from uuid import UUID
 
+from app.config import settings
 from app.database import DbSession
 from app.models import User
 from app.repositories import UserRepository
 from app.schemas import UserCreate, UserUpdate
 from app.services import AppService
+from app.utils.cache import TTLCache
 from app.utils.exceptions import handle_exceptions
 
 
 class UserService(AppService[UserRepository, User, UserCreate, UserUpdate]):
-    def __init__(self, log: Logger, **kwargs):
+    def __init__(self, log: Logger, cache_size: int, cache_ttl: timedelta, **kwargs):
         super().__init__(
             crud_model=UserRepository,
             model=User,
@@ -17,6 +21,8 @@ class UserService(AppService[UserRepository, User, UserCreate, UserUpdate]):
             **kwargs
         )
         self.user_repository = UserRepository(User)
+        # auth0_id -> (user id, email) of the users resolved lately, so authenticated requests skip the database
+        self._users: TTLCache[str, tuple[UUID, str]] = TTLCache(cache_size, cache_ttl)
 
     def get_or_create_user(self, db_session: DbSession, auth0_id: str, email: str) -> User:
         if not auth0_id or not email:
@@ -26,8 +32,8 @@ class UserService(AppService[UserRepository, User, UserCreate, UserUpdate]):
         
         if user:
             if str(user.email) != email:
-                user_update = UserUpdate(email=email)
-                user = self.update(db_session, user.id, user_update)
+                user = self.crud.update(db_session, user, UserUpdate(email=email))
+                self.logger.debug(f"Updated email of {self.name} with ID: {user.id}.")
             return user
         
         user_create = UserCreate(
@@ -37,8 +43,31 @@ class UserService(AppService[UserRepository, User, UserCreate, UserUpdate]):
         
         return self.create(db_session, user_create)
 
+    def resolve_user(self, db_session: DbSession, auth0_id: str, email: str) -> tuple[UUID, str]:
+        """
+        Id and email of the user behind `auth0_id`, as `get_or_create_user` leaves them.
+        Served from memory while the cache still holds the same email, with no database round trip.
+        """
+        cached = self._users.get(auth0_id)
+        if cached and cached[1] == email:
+            return cached
+
+        user = self.get_or_create_user(db_session, auth0_id, email)
+        resolved = (user.id, str(user.email))
+        self._users.set(auth0_id, resolved)
+        return resolved
+
+    def delete(self, db_session: DbSession, object_id: UUID | int, raise_404: bool = False) -> User | None:
+        if user := self.get(db_session, object_id, print_log=False):
+            self._users.pop(user.auth0_id)
+        return super().delete(db_session, object_id, raise_404)
+
     def _get_user_by_auth0_id(self, db_session: DbSession, auth0_id: str) -> User | None:
         return self.user_repository.get_user_by_auth0_id(db_session, auth0_id)
 
 
-user_service = UserService(log=getLogger(__name__))
+user_service = UserService(
+    log=getLogger(__name__),
+    cache_size=settings.user_cache_size,
+    cache_ttl=timedelta(seconds=settings.user_cache_ttl_seconds),
+)
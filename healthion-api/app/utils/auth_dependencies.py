@@ -22,16 +22,16 @@ async def get_current_user(
     # email = auth0_service.get_user_email(token)
     permissions = auth0_service.get_user_permissions(payload)
     
-    user = user_service.get_or_create_user(
+    user_id, email = user_service.resolve_user(
         db,
         auth0_id=auth0_id,
         email="email@test.com"
     )
     
     return UserInfo(
-        user_id=user.id,
+        user_id=user_id,
         auth0_id=auth0_id,
-        email=str(user.email),
+        email=email,
         permissions=permissions,
         payload=payload
     )
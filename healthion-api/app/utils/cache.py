@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from datetime import timedelta
+from threading import Lock
+from time import monotonic
+
+
+class TTLCache[K, V]:
+    """
+    In-process cache holding up to `max_size` entries, each for `ttl` after it was set.
+    Past the size, the least recently used entry is dropped first. Safe to share between threads.
+    """
+
+    def __init__(self, max_size: int, ttl: timedelta):
+        self.max_size = max_size
+        self.ttl = ttl.total_seconds()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
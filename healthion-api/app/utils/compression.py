@@ -0,0 +1,94 @@
+import gzip
+import zipfile
+from enum import Enum
+from typing import BinaryIO, cast
+
+import zstandard
+
+
+class Compression(str, Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+    ZIP = "zip"
+
+
+CONTENT_ENCODINGS: dict[str, Compression] = {
+    "identity": Compression.NONE,
+    "gzip": Compression.GZIP,
+    "x-gzip": Compression.GZIP,
+    "zstd": Compression.ZSTD,
+}
+
+FILE_SUFFIXES: dict[str, Compression] = {
+    ".gz": Compression.GZIP,
+    ".zst": Compression.ZSTD,
+    ".zip": Compression.ZIP,
+}
+
+MAGIC_NUMBERS: dict[bytes, Compression] = {
+    b"\x1f\x8b": Compression.GZIP,
+    b"\x28\xb5\x2f\xfd": Compression.ZSTD,
+    b"PK\x03\x04": Compression.ZIP,
+}
+
+
+def detect_compression(
+    content: BinaryIO,
+    content_encoding: str | None = None,
+    filename: str | None = None,
+) -> Compression:
+    """
+    Work out how an upload is compressed - from the Content-Encoding header,
+    then the file name, then the leading magic bytes. `content` must be seekable.
+    Raises ValueError for a Content-Encoding we can't decode.
+    """
+    if content_encoding:
+        encoding = content_encoding.strip().lower()
+        if encoding not in CONTENT_ENCODINGS:
+            raise ValueError(f"Unsupported content encoding: {content_encoding}")
+        if encoding != "identity":
+            return CONTENT_ENCODINGS[encoding]
+
+    if filename:
+        for suffix, compression in FILE_SUFFIXES.items():
+            if filename.lower().endswith(suffix):
+                return compression
+
+    head = content.read(4)
+    content.seek(0)
+    for magic, compression in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+
+    return Compression.NONE
+
+
+def open_decompressed(content: BinaryIO, compression: Compression, zip_member_suffix: str = ".json") -> BinaryIO:
+    """
+    Wrap `content` in a stream that decompresses on read, so the parser pulls
+    plain bytes chunk by chunk and nothing is inflated up front. From a zip
+    archive, the first member whose name ends with `zip_member_suffix` is read.
+    """
+    # The gzip and zip readers are binary file objects, just not typed as BinaryIO
+    match compression:
+        case Compression.GZIP:
+            return cast(BinaryIO, gzip.GzipFile(fileobj=content, mode="rb"))
+        case Compression.ZSTD:
+            return zstandard.ZstdDecompressor().stream_reader(content, closefd=False)
+        case Compression.ZIP:
+            archive = zipfile.ZipFile(content)
+            return cast(BinaryIO, archive.open(_pick_zip_member(archive, zip_member_suffix)))
+        case _:
+            return content
+
+
+def _pick_zip_member(archive: zipfile.ZipFile, suffix: str) -> zipfile.ZipInfo:
+    """Prefer the first member ending with `suffix`; a single-file archive is taken as is."""
+    files = [info for info in archive.infolist() if not info.is_dir()]
+    for info in files:
+        if info.filename.lower().endswith(suffix):
+            return info
+    if len(files) == 1:
+        return files[0]
+    raise ValueError(f"No {suffix} file found in zip archive")
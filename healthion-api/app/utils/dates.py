@@ -0,0 +1,66 @@
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+# Apple exports timestamps as "%Y-%m-%d %H:%M:%S %z", e.g. "2024-05-01 10:11:12 +0200":
+# a fixed-width local time, followed by the UTC offset from index 19 on.
+_LOCAL_TIME_END = 19
+
+
+@lru_cache(maxsize=64)
+def _utc_offset(suffix: str) -> timezone:
+    """Timezone for an Apple offset suffix like " +0200". Offsets are few, so each is built only once."""
+    if len(suffix) != 6 or suffix[0] != " " or suffix[1] not in "+-" or not suffix[2:].isdigit():
+        raise ValueError(f"Invalid Apple UTC offset: {suffix!r}")
+
+    minutes = int(suffix[2:4]) * 60 + int(suffix[4:6])
+    if not minutes:
+        return timezone.utc
+    return timezone(timedelta(minutes=-minutes if suffix[1] == "-" else minutes))
+
+
+def _parse_iso_like(value: str) -> datetime:
+    """Slow path for timestamps that don't follow the Apple layout exactly."""
+    value = value.replace(" +", "+").replace(" ", "T", 1)
+    if len(value) >= 5 and (value[-5] in {"+", "-"} and value[-3] != ":"):
+        value = f"{value[:-2]}:{value[-2:]}"
+    return datetime.fromisoformat(value)
+
+
+def parse_apple_datetime(value: str) -> datetime:
+    """Parse an Apple "YYYY-MM-DD HH:MM:SS +ZZZZ" timestamp, falling back to ISO-like parsing for other layouts."""
+    try:
+        return datetime.fromisoformat(value[:_LOCAL_TIME_END]).replace(tzinfo=_utc_offset(value[_LOCAL_TIME_END:]))
+    except ValueError:
+        return _parse_iso_like(value)
+
+
+def parse_apple_datetimes(values: Sequence[str]) -> list[datetime]:
+    """
+    Parse a whole series of Apple timestamps, e.g. all samples of a workout, in one pass.
+    The samples of a workout practically always share a UTC offset, so the series is
+    parsed as naive local times and tagged with that one timezone; anything else
+    goes through `parse_apple_datetime` value by value.
+    """
+    offsets = {value[_LOCAL_TIME_END:] for value in values}
+    if len(offsets) == 1:
+        try:
+            tzinfo = _utc_offset(offsets.pop())
+            local_times = list(map(datetime.fromisoformat, [value[:_LOCAL_TIME_END] for value in values]))
+        except ValueError:
+            pass
+        else:
+            return [local_time.replace(tzinfo=tzinfo) for local_time in local_times]
+
+    return [parse_apple_datetime(value) for value in values]
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month of `day`."""
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def utc_day(moment: datetime) -> datetime:
+    """Midnight starting the UTC day of `moment`."""
+    return moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def _bucket_edges(count: int, buckets: int) -> np.ndarray:
+    """Bounds of `buckets` runs of consecutive points, as even as can be, splitting `count` points."""
+    return np.linspace(0, count, buckets + 1).astype(np.intp)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the points largest-triangle-three-buckets keeps to draw the line through (x, y)
+    with at most `max_points` (3 or more) points, in order.
+
+    The first and the last point are always kept. The ones between are split into buckets, and
+    each bucket keeps the point spanning the largest triangle with the point kept from the bucket
+    before and the average point of the bucket after. The triangles of a bucket are computed at once,
+    only the walk from bucket to bucket is sequential.
+    """
+    count = len(x)
+    if count <= max_points:
+        return np.arange(count)
+
+    buckets = max_points - 2
+    # Into the points between the first and the last one
+    edges = _bucket_edges(count - 2, buckets) + 1
+    sizes = np.diff(edges)
+    # Average point of every bucket, and the last point as the one after the final bucket
+    average_x = np.append(np.add.reduceat(x[1:-1], edges[:-1] - 1) / sizes, x[-1])
+    average_y = np.append(np.add.reduceat(y[1:-1], edges[:-1] - 1) / sizes, y[-1])
+
+    kept = np.empty(max_points, dtype=np.intp)
+    kept[0], kept[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(buckets):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas, the factor doesn't change which one is the largest
+        areas = np.abs(
+            (x[previous] - average_x[bucket + 1]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y[bucket + 1] - y[previous]),
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def min_max_indices(low: np.ndarray, high: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the points to keep to draw a series with at most `max_points` (2 or more) points,
+    in order. The series is split into `max_points // 2` buckets of consecutive points, and each
+    keeps its point with the lowest `low` and the one with the highest `high`, so no peak or dip
+    of the series is lost. NaNs are never picked over a value.
+    """
+    count = len(low)
+    if count <= max_points:
+        return np.arange(count)
+
+    edges = _bucket_edges(count, max_points // 2)
+    starts = edges[:-1]
+    # A row of positions per bucket, padded to the longest one: buckets differ by a point at most
+    positions = starts[:, np.newaxis] + np.arange(np.diff(edges).max())
+    padding = positions >= edges[1:, np.newaxis]
+    positions = np.minimum(positions, count - 1)
+    lowest = np.argmin(np.where(padding | np.isnan(low[positions]), np.inf, low[positions]), axis=1)
+    highest = np.argmax(np.where(padding | np.isnan(high[positions]), -np.inf, high[positions]), axis=1)
+    return np.unique(np.concatenate((starts + lowest, starts + highest)))
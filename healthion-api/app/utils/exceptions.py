@@ -9,12 +9,22 @@ from fastapi import status
 from fastapi.exceptions import HTTPException, RequestValidationError
 from jose import JWTError
 from jose.exceptions import ExpiredSignatureError
+from psycopg.errors import DataError as PsycopgDataError
 from psycopg.errors import IntegrityError as PsycopgIntegrityError
+from sqlalchemy.exc import DataError as SQLADataError
 from sqlalchemy.exc import IntegrityError as SQLAIntegrityError
 
 if TYPE_CHECKING:
     from app.services import AppService
 
+# Database errors caused by the rows being written. Anything else (a lost connection, ...) isn't down to the data.
+ROW_DATA_ERRORS = (SQLADataError, SQLAIntegrityError, PsycopgDataError, PsycopgIntegrityError)
+
+
+def row_data_error_reason(exc: BaseException) -> str:
+    """First line of the database's message, e.g. "value too long for type character varying(100)"."""
+    return str(getattr(exc, "orig", None) or exc).splitlines()[0]
+
 
 class ResourceNotFoundError(Exception):
     def __init__(self, entity_name: str, entity_id: int | UUID | None = None):
@@ -25,6 +35,21 @@ class ResourceNotFoundError(Exception):
             self.detail = f"{entity_name.capitalize()} not found."
 
 
+class UploadConflictError(Exception):
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+class InvalidCursorError(Exception):
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+class InvalidSeriesError(Exception):
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
 @singledispatch
 def handle_exception(exc: Exception, _: str) -> HTTPException:
     raise exc
@@ -43,6 +68,21 @@ def _(exc: ResourceNotFoundError, _: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.detail)
 
 
+@handle_exception.register
+def _(exc: UploadConflictError, _: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=exc.detail)
+
+
+@handle_exception.register
+def _(exc: InvalidCursorError, _: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.detail)
+
+
+@handle_exception.register
+def _(exc: InvalidSeriesError, _: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.detail)
+
+
 @handle_exception.register
 def _(exc: AttributeError, entity: str) -> HTTPException:
     return HTTPException(
@@ -0,0 +1,173 @@
+import codecs
+import json
+import re
+from collections.abc import Iterator
+from typing import IO, Any
+
+_DECODER = json.JSONDecoder()
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+_DELIMITERS = frozenset(" \t\n\r,:]}")
+# What a literal, number or escape cut off at the end of the buffer can leave after a decode error
+_CUT_OFF_TAIL = re.compile(r"[\w.+\-\\]*")
+
+
+def _is_cut_off(exc: json.JSONDecodeError) -> bool:
+    """Whether decoding failed only because the document ends before the value does."""
+    return exc.msg.startswith("Unterminated string") or _CUT_OFF_TAIL.fullmatch(exc.doc, exc.pos) is not None
+
+
+class JSONStreamReader:
+    """
+    Incremental reader over a text or binary stream holding a JSON document.
+
+    Values are decoded one at a time with the C `raw_decode`, and the buffer
+    only ever holds the value being decoded plus one read-ahead chunk, so
+    memory stays bounded by the largest single value that is materialized.
+    """
+
+    def __init__(self, stream: IO[bytes] | IO[str], chunk_size: int = 64 * 1024):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size: int) -> bool:
+        """Append the next chunk to the buffer, dropping everything already consumed."""
+        if self._eof:
+            return False
+
+        chunk = self._stream.read(size)
+        if not chunk:
+            self._eof = True
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk, final=self._eof)
+
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return bool(chunk) or not self._eof
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            if match := _NON_WHITESPACE.search(self._buffer, self._pos):
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._read(self._chunk_size):
+                raise ValueError("Unexpected end of JSON document")
+
+    def skip_to(self, char: str) -> None:
+        """Discard everything before the next occurrence of `char`, e.g. a preamble in front of the document."""
+        while (index := self._buffer.find(char, self._pos)) == -1:
+            self._pos = len(self._buffer)
+            if not self._read(self._chunk_size):
+                raise ValueError("No JSON document found")
+        self._pos = index
+
+    def consume(self, expected: str) -> str:
+        """Consume the next non-whitespace character, which must be one of `expected`."""
+        char = self.peek()
+        if char not in expected:
+            raise ValueError(f"Expected one of {expected!r} in JSON document, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                # A value cut off at the end of the buffer continues in the next chunk. Any other
+                # error is in the document itself, and reading on would only pull in the rest of it.
+                if not _is_cut_off(exc):
+                    raise
+                # Grow the read geometrically so a large value isn't re-decoded once per chunk
+                if not self._read(max(self._chunk_size, len(self._buffer) - self._pos)):
+                    raise
+                continue
+
+            # A number cut at the buffer edge decodes "successfully" (e.g. `1.` of `1.5`),
+            # so only trust values that are followed by a delimiter or the end of input.
+            if (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS) and self._read(self._chunk_size):
+                continue
+
+            self._pos = end
+            return obj
+
+    def skip(self, depth: int = 3) -> None:
+        """
+        Consume the next value without keeping it. Containers are walked
+        element by element up to `depth` levels, so skipping a huge array
+        doesn't pull it into memory as a whole.
+        """
+        opening = self.peek()
+        if depth <= 0 or opening not in "[{":
+            self.value()
+        elif opening == "[":
+            for _ in self.iter_array():
+                self.skip(depth - 1)
+        else:
+            for _ in self.iter_object():
+                self.skip(depth - 1)
+
+    def iter_array(self) -> Iterator[int]:
+        """Walk an array, yielding item indexes. The caller must consume each item."""
+        self.consume("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.consume(",]") == "]":
+                return
+
+    def iter_object(self) -> Iterator[str]:
+        """Walk an object, yielding its keys. The caller must consume each key's value."""
+        self.consume("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.consume(":")
+            yield key
+            if self.consume(",}") == "}":
+                return
+
+
+def iter_json_array(
+    stream: IO[bytes] | IO[str],
+    path: tuple[str, ...],
+    chunk_size: int = 64 * 1024,
+    skip_preamble: bool = False,
+) -> Iterator[Any]:
+    """
+    Yield the items of the array found under `path` (e.g. `("data", "workouts")`)
+    one at a time, without loading the rest of the document. Yields nothing if
+    the path is not present. With `skip_preamble`, anything in front of the
+    first `{` is ignored.
+    """
+    reader = JSONStreamReader(stream, chunk_size)
+    if skip_preamble:
+        reader.skip_to("{")
+    yield from _iter_path(reader, path)
+
+
+def _iter_path(reader: JSONStreamReader, path: tuple[str, ...]) -> Iterator[Any]:
+    if not path:
+        for _ in reader.iter_array():
+            yield reader.value()
+        return
+
+    for key in reader.iter_object():
+        if key == path[0]:
+            yield from _iter_path(reader, path[1:])
+            # Everything we were asked for has been read - the rest of the document is irrelevant.
+            return
+        reader.skip()
@@ -0,0 +1,38 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections.abc import Sequence
+from typing import Any
+
+from app.utils.exceptions import InvalidCursorError
+
+# Where a listing continues: [sort_by, sort_order, sort value of the last row, id of the last row],
+# or None once the listing has been read to the end
+Position = list[Any] | None
+
+
+def encode_cursor(positions: dict[str, Position]) -> str:
+    """Opaque cursor holding the position of every listing of a page, keyed by table name."""
+    # Datetimes, decimals and UUIDs go in as their string forms and are parsed back by column type
+    payload = json.dumps(positions, default=str, separators=(",", ":")).encode()
+    return urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Position]:
+    try:
+        positions = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Cursor is malformed.")
+    if not isinstance(positions, dict) or not all(
+        position is None or (isinstance(position, list) and len(position) == 4) for position in positions.values()
+    ):
+        raise InvalidCursorError("Cursor is malformed.")
+    return positions
+
+
+def next_position(rows: Sequence[Any], sort_by: str, sort_order: str, limit: int) -> Position:
+    """Position after the last row of a page, or None when the page wasn't full and nothing follows."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return [sort_by, sort_order, getattr(last, sort_by), last.id]
@@ -1,7 +1,9 @@
+import re
 from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.schema import SchemaItem
 
 from app.config import settings
 from app.database import BaseDbModel
@@ -14,6 +16,15 @@ if config.config_file_name is not None:
 
 target_metadata = BaseDbModel.metadata
 
+# Monthly heartratedata partitions are created by the app, not by migrations
+PARTITION_NAME = re.compile(r"^heartratedata_\d{4}_\d{2}(_|$)")
+
+
+def include_object(
+    object: SchemaItem, name: str | None, type_: str, reflected: bool, compare_to: SchemaItem | None,
+) -> bool:
+    return not (reflected and name and PARTITION_NAME.match(name))
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -31,6 +42,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -53,7 +65,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
         with context.begin_transaction():
             context.run_migrations()
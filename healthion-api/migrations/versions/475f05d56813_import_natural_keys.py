@@ -0,0 +1,72 @@
+"""import natural keys
+
+Revision ID: 475f05d56813
+Revises: 1d860e21ae43
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '475f05d56813'
+down_revision: Union[str, None] = '1d860e21ae43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SAMPLE_TABLES = ('heartratedata', 'heartraterecovery', 'activeenergy')
+WORKOUT_CHILD_TABLES = ('workoutstatistic', *SAMPLE_TABLES)
+
+
+def _delete_duplicates(table: str, partition_by: str) -> None:
+    # PARTITION BY groups NULLs together, matching NULLS NOT DISTINCT on the new constraints
+    op.execute(f"""
+        DELETE FROM {table} WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY {partition_by} ORDER BY id) AS n FROM {table}
+            ) ranked
+            WHERE n > 1
+        )
+    """)
+
+
+def upgrade() -> None:
+    # Re-imports used to store every workout again under a new id. Move the children of each
+    # duplicate onto the first copy before dropping it, so samples only the later copy had survive.
+    op.execute("""
+        CREATE TEMPORARY TABLE workout_duplicate ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY user_id, "startDate", "endDate", type, "sourceName" ORDER BY id
+            ) AS keep_id
+            FROM workout
+        ) ranked
+        WHERE id <> keep_id
+    """)
+    for table in WORKOUT_CHILD_TABLES:
+        op.execute(f"""
+            UPDATE {table} SET workout_id = workout_duplicate.keep_id
+            FROM workout_duplicate WHERE {table}.workout_id = workout_duplicate.id
+        """)
+    op.execute("DELETE FROM workout USING workout_duplicate WHERE workout.id = workout_duplicate.id")
+
+    _delete_duplicates('workoutstatistic', 'workout_id, type')
+    for table in SAMPLE_TABLES:
+        _delete_duplicates(table, 'workout_id, date, source')
+
+    op.create_unique_constraint(
+        'uq_workout_natural_key', 'workout', ['user_id', 'startDate', 'endDate', 'type', 'sourceName'],
+    )
+    op.create_unique_constraint('uq_workoutstatistic_natural_key', 'workoutstatistic', ['workout_id', 'type'])
+    for table in SAMPLE_TABLES:
+        op.create_unique_constraint(
+            f'uq_{table}_natural_key', table, ['workout_id', 'date', 'source'], postgresql_nulls_not_distinct=True,
+        )
+
+
+def downgrade() -> None:
+    for table in SAMPLE_TABLES:
+        op.drop_constraint(f'uq_{table}_natural_key', table, type_='unique')
+    op.drop_constraint('uq_workoutstatistic_natural_key', 'workoutstatistic', type_='unique')
+    op.drop_constraint('uq_workout_natural_key', 'workout', type_='unique')
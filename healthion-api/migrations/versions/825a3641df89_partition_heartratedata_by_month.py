@@ -0,0 +1,116 @@
+"""partition heartratedata by month
+
+Revision ID: 825a3641df89
+Revises: 1acec7ddc15b
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.schema import SchemaItem
+
+# revision identifiers, used by Alembic.
+revision: str = '825a3641df89'
+down_revision: Union[str, None] = '1acec7ddc15b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# HealthKit came with iOS 8 in 2014, so history starts there. Later months are created ahead by the app.
+FIRST_MONTH = date(2014, 1, 1)
+MONTHS_AHEAD = 3
+
+COLUMNS = 'id, user_id, workout_id, date, source, units, avg, min, max'
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _columns() -> list[SchemaItem]:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('heartratedata_id_seq')"), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('workout_id', sa.UUID(), nullable=False),
+        sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('source', sa.Text(), nullable=True),
+        sa.Column('units', sa.String(length=50), nullable=True),
+        sa.Column('avg', sa.Numeric(precision=10, scale=3), nullable=True),
+        sa.Column('min', sa.Numeric(precision=10, scale=3), nullable=True),
+        sa.Column('max', sa.Numeric(precision=10, scale=3), nullable=True),
+        # Named explicitly, the names PostgreSQL would pick are still taken by the partitions of the old table
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='heartratedata_user_id_fkey', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(
+            ['workout_id'], ['workout.id'], name='heartratedata_workout_id_fkey', ondelete='CASCADE',
+        ),
+    ]
+
+
+def _set_aside(table: str, suffix: str) -> None:
+    # Index names are unique per schema, so the old table gives up the names of its indexes first
+    op.execute(f'ALTER TABLE {table} RENAME TO heartratedata_{suffix}')
+    for constraint in ('heartratedata_pkey', 'uq_heartratedata_natural_key'):
+        op.execute(
+            f'ALTER TABLE heartratedata_{suffix} RENAME CONSTRAINT {constraint} '
+            f'TO {constraint.replace("heartratedata", f"heartratedata_{suffix}")}',
+        )
+    op.execute(f'ALTER INDEX ix_heartratedata_user_id_date RENAME TO ix_heartratedata_{suffix}_user_id_date')
+    op.execute('ALTER SEQUENCE heartratedata_id_seq OWNED BY NONE')
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_heartratedata_user_id_date', 'heartratedata', ['user_id', 'date'], unique=False)
+    op.execute('ALTER SEQUENCE heartratedata_id_seq OWNED BY heartratedata.id')
+
+
+def upgrade() -> None:
+    _set_aside('heartratedata', 'unpartitioned')
+
+    op.create_table('heartratedata',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'date'),
+    sa.UniqueConstraint(
+        'workout_id', 'date', 'source', name='uq_heartratedata_natural_key', postgresql_nulls_not_distinct=True,
+    ),
+    postgresql_partition_by='RANGE (date)',
+    )
+    _create_indexes()
+
+    # One partition per month (UTC), covering all stored samples as well as the months ahead
+    oldest, newest = op.get_bind().execute(sa.text(
+        "SELECT min(date) AT TIME ZONE 'UTC', max(date) AT TIME ZONE 'UTC' FROM heartratedata_unpartitioned",
+    )).one()
+    month = min(FIRST_MONTH, _add_months(oldest, 0)) if oldest else FIRST_MONTH
+    last_month = _add_months(date.today(), MONTHS_AHEAD)
+    if newest:
+        last_month = max(last_month, _add_months(newest, 0))
+    while month <= last_month:
+        op.execute(
+            f"CREATE TABLE heartratedata_{month:%Y_%m} PARTITION OF heartratedata "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{_add_months(month, 1).isoformat()} 00:00+00')",
+        )
+        month = _add_months(month, 1)
+
+    op.execute(f'INSERT INTO heartratedata ({COLUMNS}) SELECT {COLUMNS} FROM heartratedata_unpartitioned')
+    op.drop_table('heartratedata_unpartitioned')
+    op.execute('ANALYZE heartratedata')
+
+
+def downgrade() -> None:
+    _set_aside('heartratedata', 'partitioned')
+
+    op.create_table('heartratedata',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint(
+        'workout_id', 'date', 'source', name='uq_heartratedata_natural_key', postgresql_nulls_not_distinct=True,
+    ),
+    )
+    _create_indexes()
+
+    op.execute(f'INSERT INTO heartratedata ({COLUMNS}) SELECT {COLUMNS} FROM heartratedata_partitioned')
+    # Drops the monthly partitions along with it
+    op.drop_table('heartratedata_partitioned')
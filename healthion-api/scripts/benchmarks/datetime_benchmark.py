@@ -0,0 +1,46 @@
+"""
+Apple timestamp parsing micro-benchmark.
+
+Parses a workout's worth of "YYYY-MM-DD HH:MM:SS +ZZZZ" sample timestamps with
+the previous generic parser (string replaces + `datetime.fromisoformat`, kept
+as the fallback in `app.utils.dates`), with `parse_apple_datetime` one value at
+a time and with the series parser `parse_apple_datetimes`, and prints the cost
+per timestamp.
+
+Usage:
+    uv run python scripts/benchmarks/datetime_benchmark.py --samples 3600
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from timeit import repeat
+
+from app.utils.dates import _parse_iso_like, parse_apple_datetime, parse_apple_datetimes
+
+APPLE_DT_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=3600, help="timestamps per workout")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = datetime(2024, 5, 1, 10, tzinfo=timezone(timedelta(hours=2)))
+    values = [(start + timedelta(seconds=second)).strftime(APPLE_DT_FORMAT) for second in range(args.samples)]
+
+    runs = {
+        "generic": lambda: [_parse_iso_like(value) for value in values],
+        "per value": lambda: [parse_apple_datetime(value) for value in values],
+        "series": lambda: parse_apple_datetimes(values),
+    }
+    expected = runs["generic"]()
+
+    for name, run in runs.items():
+        assert run() == expected, f"{name} parses differently"
+        elapsed = min(repeat(run, number=10, repeat=args.repeat)) / 10
+        print(f"{name:>10}: {elapsed / len(values) * 1e9:,.0f} ns per timestamp")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Auto Export import throughput benchmark.
+
+Imports the same synthetic payload into the configured database through the
+old row-by-row path (create + commit + refresh per row) and through
+`ae_import_service.load_data` with each import backend, and prints rows/sec
+for every run. Batched runs import the payload a second time as well, which
+measures a re-sync where every row is already stored and gets skipped.
+
+Usage:
+    uv run python scripts/benchmarks/import_benchmark.py --workouts 5 --samples 3600
+"""
+
+import argparse
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from time import perf_counter
+from uuid import UUID
+
+from app.config import ImportBackend, settings
+from app.database import DbSession, SessionLocal
+from app.schemas import (
+    AEActiveEnergyCreate,
+    AEHeartRateDataCreate,
+    AEHeartRateRecoveryCreate,
+    HKWorkoutCreate,
+    HKWorkoutStatisticCreate,
+    RejectedWorkout,
+    UserCreate,
+)
+from app.services import ae_import_service, user_service
+
+APPLE_DT_FORMAT = "%Y-%m-%d %H:%M:%S +0000"
+
+
+def build_payload(workouts: int, samples: int) -> dict:
+    def entry(moment: datetime, **values: float) -> dict:
+        return {**values, "units": "count/min", "date": moment.strftime(APPLE_DT_FORMAT), "source": "Apple Watch"}
+
+    data = []
+    for i in range(workouts):
+        start = datetime(2024, 1, 1, 7) + timedelta(days=i)
+        end = start + timedelta(seconds=samples)
+        data.append({
+            "name": "Outdoor Run",
+            "start": start.strftime(APPLE_DT_FORMAT),
+            "end": end.strftime(APPLE_DT_FORMAT),
+            "activeEnergyBurned": {"qty": 512.3, "units": "kcal"},
+            "distance": {"qty": 10.1, "units": "km"},
+            "heartRateData": [
+                entry(start + timedelta(seconds=s), Avg=130.5, Min=120, Max=141) for s in range(samples)
+            ],
+            "heartRateRecovery": [
+                entry(end + timedelta(seconds=s), Avg=110.2, Min=95, Max=121) for s in range(0, 120, 10)
+            ],
+            "activeEnergy": [
+                {"qty": 0.4, "units": "kcal", "date": (start + timedelta(seconds=s)).strftime(APPLE_DT_FORMAT)}
+                for s in range(0, samples, 5)
+            ],
+        })
+    return {"data": {"workouts": data}}
+
+
+def load_row_by_row(db_session: DbSession, workouts_raw: list[dict], user_id: str) -> None:
+    """The import path before batching: every row is its own INSERT and commit."""
+    service = ae_import_service
+    owner_id = UUID(user_id)
+    for rows in service._build_import_rows(workouts_raw, owner_id):
+        if isinstance(rows, RejectedWorkout):
+            continue
+        workout = service.workout_service.create(
+            db_session, HKWorkoutCreate.model_validate(rows.workout.model_dump() | {"user_id": owner_id}),
+        )
+        for stat in rows.workout_statistics:
+            statistic = stat.model_dump() | {"user_id": workout.user_id, "workout_id": workout.id}
+            service.workout_statistic_service.create(db_session, HKWorkoutStatisticCreate.model_validate(statistic))
+        # Sample rows are plain column dicts
+        for row in rows.heart_rate_data:
+            service.heart_rate_data_service.create(db_session, AEHeartRateDataCreate.model_validate(row))
+        for row in rows.heart_rate_recovery:
+            service.heart_rate_recovery_service.create(db_session, AEHeartRateRecoveryCreate.model_validate(row))
+        for row in rows.active_energy:
+            service.active_energy_service.create(db_session, AEActiveEnergyCreate.model_validate(row))
+
+
+def load_with_backend(backend: ImportBackend) -> Callable[[DbSession, list[dict], str], None]:
+    def load(db_session: DbSession, workouts_raw: list[dict], user_id: str) -> None:
+        settings.import_backend = backend
+        ae_import_service.load_data(db_session, workouts_raw, user_id=user_id)
+
+    return load
+
+
+def count_rows(raw: dict) -> int:
+    rows = 0
+    for workout in raw["data"]["workouts"]:
+        rows += 1 + 2  # the workout and its two statistics
+        rows += len(workout["heartRateData"]) + len(workout["heartRateRecovery"]) + len(workout["activeEnergy"])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workouts", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=3600, help="heart rate samples per workout")
+    args = parser.parse_args()
+
+    raw = build_payload(args.workouts, args.samples)
+    rows = count_rows(raw)
+
+    runs = [("row-by-row", load_row_by_row)]
+    runs += [(f"batched/{backend.value}", load_with_backend(backend)) for backend in ImportBackend]
+    with SessionLocal() as db_session:
+        for name, load in runs:
+            # A fresh user per run, so both runs write into the same (empty) state.
+            stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            user = user_service.create(
+                db_session, UserCreate(auth0_id=f"benchmark|{stamp}", email=f"benchmark-{stamp}@example.com"),
+            )
+            try:
+                started = perf_counter()
+                load(db_session, raw["data"]["workouts"], str(user.id))
+                elapsed = perf_counter() - started
+                print(f"{name:>14}: {rows} rows in {elapsed:.2f}s -> {rows / elapsed:,.0f} rows/sec")
+
+                if load is not load_row_by_row:
+                    started = perf_counter()
+                    load(db_session, raw["data"]["workouts"], str(user.id))
+                    elapsed = perf_counter() - started
+                    print(f"{'re-import':>14}: {rows} rows in {elapsed:.2f}s -> {rows / elapsed:,.0f} rows/sec")
+            finally:
+                db_session.rollback()
+                user_service.delete(db_session, user.id)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import gzip
+import tempfile
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import api
+from app.schemas import ImportJob
+from app.services import import_job_service
+from app.utils.auth_dependencies import get_current_user_id
+from app.utils.compression import Compression
+
+URL = "/api/v1/import/apple/auto-health-export"
+BODY = b'{"data": {"workouts": []}}'
+COMPRESSED = gzip.compress(BODY, mtime=0)
+
+
+@pytest.fixture
+def submitted(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[tuple[bytes, Compression]]]:
+    """Uploads handed to the import queue, as (content, compression), instead of importing them."""
+    calls = []
+
+    def submit(
+        importer: Any, source: str, content: BinaryIO, content_type: str, user_id: str, compression: Compression,
+    ) -> ImportJob:
+        calls.append((content.read(), compression))
+        content.close()
+        return ImportJob(user_id=user_id, source=source)
+
+    monkeypatch.setattr(import_job_service, "submit", submit)
+    api.dependency_overrides[get_current_user_id] = lambda: "user"
+    yield calls
+    api.dependency_overrides.pop(get_current_user_id)
+
+
+def test_multipart_upload_rejects_content_encoding(submitted: list[tuple[bytes, Compression]]) -> None:
+    response = TestClient(api).post(
+        URL, files={"file": ("export.json", BODY)}, headers={"Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 415
+    assert submitted == []
+
+
+def test_multipart_upload_rejects_a_file_field_that_is_not_a_file(
+    submitted: list[tuple[bytes, Compression]],
+) -> None:
+    response = TestClient(api).post(URL, data={"file": "export.json"}, files={"other": ("export.json", BODY)})
+
+    assert response.status_code == 400
+    assert submitted == []
+
+
+def test_multipart_upload_is_written_to_disk_once(
+    submitted: list[tuple[bytes, Compression]], monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "upload_spool_max_memory", 1024)
+    disk_files = []
+    temporary_file = tempfile.TemporaryFile
+
+    def counting_temporary_file(*args: Any, **kwargs: Any) -> Any:
+        disk_files.append(temporary_file(*args, **kwargs))
+        return disk_files[-1]
+
+    # Where a spool file rolls over to
+    monkeypatch.setattr(tempfile, "TemporaryFile", counting_temporary_file)
+    # Past the spool size the form parser would otherwise use
+    content = BODY * 50_000
+
+    response = TestClient(api).post(URL, files={"file": ("export.json", content)})
+
+    assert response.status_code == 202
+    assert submitted == [(content, Compression.NONE)]
+    assert len(disk_files) == 1
+
+
+@pytest.mark.parametrize("filename", ["export.json.gz", "export.json"])
+def test_multipart_upload_takes_compression_from_the_file(
+    submitted: list[tuple[bytes, Compression]], filename: str,
+) -> None:
+    response = TestClient(api).post(URL, files={"file": (filename, COMPRESSED)})
+
+    assert response.status_code == 202
+    assert submitted == [(COMPRESSED, Compression.GZIP)]
+
+
+def test_raw_upload_takes_compression_from_content_encoding(submitted: list[tuple[bytes, Compression]]) -> None:
+    response = TestClient(api).post(URL, content=COMPRESSED, headers={"Content-Encoding": "gzip"})
+
+    assert response.status_code == 202
+    assert submitted == [(COMPRESSED, Compression.GZIP)]
@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import delete, insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import User, Workout
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    """Tests using the database are skipped when it can't be reached with the configured settings."""
+    try:
+        with SessionLocal() as db_session:
+            db_session.execute(text("SELECT 1"))
+    except OperationalError as exc:
+        pytest.skip(f"Database unavailable: {exc.orig}")
+
+
+@pytest.fixture
+def db_session(database: None) -> Iterator[Session]:
+    with SessionLocal() as db_session:
+        yield db_session
+
+
+@pytest.fixture
+def user_id(db_session: Session) -> Iterator[UUID]:
+    """A user of its own, deleted with everything of theirs afterwards."""
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    db_session.execute(
+        insert(User).values(
+            id=user_id, auth0_id=f"test|{user_id}", email=f"{user_id}@example.com", created_at=now, updated_at=now,
+        ),
+    )
+    db_session.commit()
+    yield user_id
+    db_session.rollback()
+    db_session.execute(delete(User).where(User.id == user_id))
+    db_session.commit()
+
+
+@pytest.fixture
+def workout_id(db_session: Session, user_id: UUID) -> UUID:
+    workout_id = uuid4()
+    db_session.execute(
+        insert(Workout).values(
+            id=workout_id,
+            user_id=user_id,
+            type="Running",
+            duration=30,
+            durationUnit="min",
+            sourceName="Test",
+            startDate=datetime(2024, 3, 1, 10, tzinfo=timezone.utc),
+            endDate=datetime(2024, 3, 1, 10, 30, tzinfo=timezone.utc),
+        ),
+    )
+    db_session.commit()
+    return workout_id
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import HeartRateData
+from app.repositories import HeartRateDataRepository
+
+
+def test_partitions_end_reads_bounds_of_partitions_not_named_by_month(db_session: Session) -> None:
+    repository = HeartRateDataRepository(HeartRateData)
+    end = repository.get_partitions_end(db_session)
+    assert end is not None
+
+    # DDL is transactional, the partitions go away with the rollback
+    manual_end = end + timedelta(days=45)
+    db_session.execute(text("CREATE TABLE heartratedata_test_default PARTITION OF heartratedata DEFAULT"))
+    db_session.execute(
+        text(
+            "CREATE TABLE heartratedata_test_manual PARTITION OF heartratedata "
+            f"FOR VALUES FROM ('{end.isoformat()}') TO ('{manual_end.isoformat()}')",
+        ),
+    )
+    try:
+        assert repository.get_partitions_end(db_session) == manual_end
+    finally:
+        db_session.rollback()
@@ -0,0 +1,228 @@
+"""
+The hot read paths and rollup refreshes answered from their indexes: every statement a repository
+query sends is EXPLAINed with sequential scans disabled, so the plan doesn't depend on how much data
+the database holds. Date range reads on the monthly heartratedata partitions mustn't touch the months
+outside the range either.
+"""
+
+from collections.abc import Callable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import DBAPICursor
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import (
+    ActiveEnergy,
+    HeartRateData,
+    HeartRateRecovery,
+    MetadataEntry,
+    Workout,
+    WorkoutSummary,
+)
+from app.repositories import (
+    ActiveEnergyRepository,
+    HeartRateDataRepository,
+    HeartRateRecoveryRepository,
+    HKWorkoutRepository,
+    WorkoutSummaryRepository,
+)
+from app.schemas import AEHeartRateQueryParams, AEHeartRateSeriesQueryParams, HKWorkoutQueryParams
+from app.utils.pagination import encode_cursor
+
+USER_ID = str(uuid4())
+WORKOUT_ID = uuid4()
+START_DATE = "2024-01-01T00:00:00Z"
+END_DATE = "2024-02-01T00:00:00Z"
+REFRESHED_DAY = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+# The end date is inclusive, so the range reaches into the February partition
+PARTITION_MONTHS = [date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+HEART_RATE_PARTITION_INDEXES = {"heartratedata_2024_01_user_id_date_idx", "heartratedata_2024_02_user_id_date_idx"}
+PRUNED_PARTITIONS = {"heartratedata_2023_12", "heartratedata_2024_03"}
+
+heart_rate_params = AEHeartRateQueryParams(start_date=START_DATE, end_date=END_DATE)
+# Mid-January page of the default newest-first order, which has nothing left to read in February
+heart_rate_page_params = heart_rate_params.model_copy(
+    update={
+        "after": encode_cursor({HeartRateData.__tablename__: ["date", "desc", "2024-01-15T00:00:00+00:00", 1]}),
+    },
+)
+heart_rate_series_params = AEHeartRateSeriesQueryParams(start_date=START_DATE, end_date=END_DATE)
+# Starts mid-morning, so the range takes samples, hourly and daily rollups
+active_energy_start = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+active_energy_end = datetime(2024, 2, 1, tzinfo=timezone.utc)
+workout_params = HKWorkoutQueryParams(start_date=START_DATE, end_date=END_DATE)
+
+heart_rate_data = HeartRateDataRepository(HeartRateData)
+heart_rate_recovery = HeartRateRecoveryRepository(HeartRateRecovery)
+workouts = HKWorkoutRepository(Workout)
+workout_summaries = WorkoutSummaryRepository(WorkoutSummary)
+active_energy = ActiveEnergyRepository(ActiveEnergy)
+
+# name -> (query runner, indexes its statements must use, tables they must not read)
+CHECKS: dict[str, tuple[Callable[[Session], object], set[str], set[str]]] = {
+    "heart rate data": (
+        lambda db_session: heart_rate_data.get_heart_rate_data_with_filters(db_session, heart_rate_params, USER_ID),
+        HEART_RATE_PARTITION_INDEXES,
+        PRUNED_PARTITIONS,
+    ),
+    "heart rate data page": (
+        # Just the page, the total count still covers the whole range
+        lambda db_session: heart_rate_data._apply_sorting_and_pagination(
+            heart_rate_data._apply_common_filters(db_session.query(HeartRateData), heart_rate_page_params, USER_ID),
+            heart_rate_page_params,
+        ).all(),
+        {"heartratedata_2024_01_user_id_date_idx"},
+        PRUNED_PARTITIONS | {"heartratedata_2024_02"},
+    ),
+    "heart rate recovery": (
+        lambda db_session: heart_rate_recovery.get_heart_rate_recovery_with_filters(
+            db_session, heart_rate_params, USER_ID,
+        ),
+        {"ix_heartraterecovery_user_id_date"},
+        set(),
+    ),
+    "heart rate summary": (
+        lambda db_session: heart_rate_recovery.get_heart_rate_summary(db_session, heart_rate_params, USER_ID),
+        HEART_RATE_PARTITION_INDEXES | {"ix_heartraterecovery_user_id_date"},
+        PRUNED_PARTITIONS,
+    ),
+    "heart rate summary from rollups": (
+        lambda db_session: heart_rate_recovery.get_heart_rate_summary(
+            db_session, heart_rate_params, USER_ID, from_rollups=True,
+        ),
+        # January is whole days, only the samples at the end instant are read from February
+        {
+            "uq_heartratedatadaily_natural_key",
+            "heartratedata_2024_02_user_id_date_idx",
+            "ix_heartraterecovery_user_id_date",
+        },
+        PRUNED_PARTITIONS | {"heartratedata_2024_01"},
+    ),
+    "heart rate rollup refresh": (
+        lambda db_session: heart_rate_data.rollups.refresh(db_session, [(USER_ID, REFRESHED_DAY)]),
+        {
+            "uq_heartratedatahourly_natural_key",
+            "uq_heartratedatadaily_natural_key",
+            "heartratedata_2024_01_user_id_date_idx",
+        },
+        PRUNED_PARTITIONS | {"heartratedata_2024_02"},
+    ),
+    "heart rate series": (
+        lambda db_session: heart_rate_data.get_series(
+            db_session, heart_rate_series_params, USER_ID, timedelta(days=1),
+        ),
+        HEART_RATE_PARTITION_INDEXES,
+        PRUNED_PARTITIONS,
+    ),
+    "heart rate series from rollups": (
+        lambda db_session: heart_rate_data.get_series(
+            db_session, heart_rate_series_params, USER_ID, timedelta(days=1), from_rollups=True,
+        ),
+        {"uq_heartratedatadaily_natural_key", "heartratedata_2024_02_user_id_date_idx"},
+        PRUNED_PARTITIONS | {"heartratedata_2024_01"},
+    ),
+    "heart rate page": (
+        lambda db_session: heart_rate_recovery.get_heart_rate_page(db_session, heart_rate_params, USER_ID),
+        HEART_RATE_PARTITION_INDEXES | {"ix_heartraterecovery_user_id_date"},
+        PRUNED_PARTITIONS,
+    ),
+    "active energy of a user": (
+        lambda db_session: active_energy.get_active_energy_by_user_id(db_session, USER_ID),
+        {"ix_activeenergy_user_id_date"},
+        set(),
+    ),
+    "active energy summary from rollups": (
+        lambda db_session: active_energy.get_active_energy_summary(
+            db_session, USER_ID, active_energy_start, active_energy_end, from_rollups=True,
+        ),
+        {"uq_activeenergydaily_natural_key", "uq_activeenergyhourly_natural_key", "ix_activeenergy_user_id_date"},
+        set(),
+    ),
+    "active energy rollup refresh": (
+        lambda db_session: active_energy.rollups.refresh(db_session, [(USER_ID, REFRESHED_DAY)]),
+        {"uq_activeenergyhourly_natural_key", "uq_activeenergydaily_natural_key", "ix_activeenergy_user_id_date"},
+        set(),
+    ),
+    "workouts": (
+        lambda db_session: workouts.get_workouts_with_filters(db_session, workout_params, USER_ID),
+        # (user_id, startDate) leads the natural key, which doubles as the date range index
+        {"uq_workout_natural_key"},
+        set(),
+    ),
+    "workout summary": (
+        lambda db_session: workout_summaries.get_summaries(db_session, [WORKOUT_ID]),
+        {"workoutsummary_pkey"},
+        set(),
+    ),
+    "workout summary refresh": (
+        lambda db_session: workout_summaries.refresh(db_session, [WORKOUT_ID]),
+        # Without a date to prune on, heart rate samples are looked up in every partition's natural key
+        {"uq_workoutstatistic_natural_key", "workout_id_date_source_key", "uq_activeenergy_natural_key"},
+        set(),
+    ),
+    "metadata of a record": (
+        lambda db_session: db_session.scalars(select(MetadataEntry).where(MetadataEntry.record_id == 1)).all(),
+        {"ix_metadataentry_record_id"},
+        set(),
+    ),
+}
+
+
+@pytest.fixture
+def plan_session(db_session: Session) -> Iterator[Session]:
+    """Session with the heartratedata partitions of the checked months. Nothing it does is committed."""
+    for month in PARTITION_MONTHS:
+        heart_rate_data.create_month_partition(db_session, month)
+    yield db_session
+    db_session.rollback()
+
+
+def capture_statements(run: Callable[[], object]) -> list[tuple[str, object]]:
+    statements = []
+
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def explain(db_session: Session, run: Callable[[Session], object]) -> str:
+    """The plans of every statement `run` sends, with sequential scans off."""
+    plans = []
+    for statement, parameters in capture_statements(lambda: run(db_session)):
+        cursor = db_session.connection().connection.cursor()
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        plans.append("\n".join(row[0] for row in cursor.fetchall()))
+    return "\n".join(plans)
+
+
+@pytest.mark.parametrize(("run", "expected_indexes", "pruned_tables"), CHECKS.values(), ids=CHECKS.keys())
+def test_query_is_answered_from_its_indexes(
+    plan_session: Session,
+    run: Callable[[Session], object],
+    expected_indexes: set[str],
+    pruned_tables: set[str],
+) -> None:
+    plan = explain(plan_session, run)
+
+    assert {index for index in expected_indexes if index not in plan} == set(), plan
+    assert {table for table in pruned_tables if f" on {table} " in plan} == set(), plan
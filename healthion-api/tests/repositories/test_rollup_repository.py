@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from threading import Thread
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import ActiveEnergy, ActiveEnergyDaily, ActiveEnergyHourly
+from app.repositories import ActiveEnergyRollupRepository
+
+DAY = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _add_samples(db_session: Session, user_id: UUID, workout_id: UUID, start: datetime, count: int) -> None:
+    db_session.execute(
+        insert(ActiveEnergy),
+        [
+            {
+                "user_id": user_id,
+                "workout_id": workout_id,
+                "date": start + timedelta(minutes=minute),
+                "source": "Watch",
+                "units": "kcal",
+                "qty": Decimal("1.5"),
+            }
+            for minute in range(count)
+        ],
+    )
+
+
+def test_refreshes_of_the_same_day_in_overlapping_sessions_take_turns(
+    db_session: Session, user_id: UUID, workout_id: UUID,
+) -> None:
+    repository = ActiveEnergyRollupRepository(ActiveEnergy)
+    _add_samples(db_session, user_id, workout_id, DAY.replace(hour=10), 30)
+    db_session.commit()
+
+    errors = []
+
+    def refresh_second() -> None:
+        with SessionLocal() as second:
+            try:
+                _add_samples(second, user_id, workout_id, DAY.replace(hour=12), 20)
+                repository.refresh(second, [(user_id, DAY)])
+                second.commit()
+            except Exception as exc:
+                errors.append(exc)
+
+    with SessionLocal() as first:
+        repository.refresh(first, [(user_id, DAY)])
+        thread = Thread(target=refresh_second)
+        thread.start()
+        # The second refresh waits for the first one's transaction instead of colliding with its rows
+        thread.join(timeout=1)
+        assert thread.is_alive()
+        first.commit()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert errors == []
+    hours = db_session.execute(
+        select(ActiveEnergyHourly.bucket, ActiveEnergyHourly.records)
+        .where(ActiveEnergyHourly.user_id == user_id)
+        .order_by(ActiveEnergyHourly.bucket),
+    ).all()
+    assert hours == [(DAY.replace(hour=10), 30), (DAY.replace(hour=12), 20)]
+    days = db_session.execute(
+        select(ActiveEnergyDaily.bucket, ActiveEnergyDaily.records, ActiveEnergyDaily.qty_sum).where(
+            ActiveEnergyDaily.user_id == user_id,
+        ),
+    ).all()
+    assert days == [(DAY, 50, Decimal("75"))]
@@ -0,0 +1,52 @@
+from types import UnionType
+from typing import Any, NotRequired, Union, get_args, get_origin, get_type_hints
+
+import pytest
+from pydantic import BaseModel
+
+from app.schemas.apple.auto_export.json_schemas import (
+    ActiveEnergyEntryDict,
+    ActiveEnergyEntryJSON,
+    HeartRateEntryDict,
+    HeartRateEntryJSON,
+    QuantityDict,
+    QuantityJSON,
+    WorkoutDict,
+    WorkoutJSON,
+)
+
+# Each model and its TypedDict mirror of the import fast path
+MIRRORS: dict[type[BaseModel], type] = {
+    QuantityJSON: QuantityDict,
+    HeartRateEntryJSON: HeartRateEntryDict,
+    ActiveEnergyEntryJSON: ActiveEnergyEntryDict,
+    WorkoutJSON: WorkoutDict,
+}
+
+
+def _mirrored(annotation: Any) -> Any:
+    """`annotation` with the models in it swapped for their mirrors."""
+    if annotation in MIRRORS:
+        return MIRRORS[annotation]
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    mirrored = tuple(_mirrored(arg) for arg in args)
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        return Union[mirrored]
+    return origin[mirrored]
+
+
+@pytest.mark.parametrize(("model", "mirror"), MIRRORS.items(), ids=lambda schema: schema.__name__)
+def test_typed_dict_mirrors_model(model: type[BaseModel], mirror: type) -> None:
+    fields = {field.alias or name: field for name, field in model.model_fields.items()}
+    # Read off the hints: `__required_keys__` misses NotRequired in postponed annotations
+    hints = get_type_hints(mirror, include_extras=True)
+    optional = {key for key, hint in hints.items() if get_origin(hint) is NotRequired}
+
+    assert hints.keys() == fields.keys()
+    assert hints.keys() - optional == {key for key, field in fields.items() if field.is_required()}
+    for key, field in fields.items():
+        hint = get_args(hints[key])[0] if key in optional else hints[key]
+        assert hint == _mirrored(field.annotation), key
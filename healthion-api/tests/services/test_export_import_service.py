@@ -0,0 +1,44 @@
+from uuid import uuid4
+from xml.etree.ElementTree import Element
+
+import pytest
+
+from app.services import hk_export_import_service
+
+RECORD = {
+    "type": "HKQuantityTypeIdentifierHeartRate",
+    "sourceName": "Watch",
+    "unit": "count/min",
+    "value": "72",
+    "startDate": "2024-03-01 10:00:00 +0200",
+    "endDate": "2024-03-01 10:00:05 +0200",
+}
+
+
+def test_record_row_is_built_from_a_record() -> None:
+    row, reason = hk_export_import_service._record_row(Element("Record", RECORD), uuid4())
+
+    assert reason is None
+    assert row is not None
+    assert row["startDate"].isoformat() == "2024-03-01T10:00:00+02:00"
+    assert row["endDate"].isoformat() == "2024-03-01T10:00:05+02:00"
+
+
+@pytest.mark.parametrize(
+    ("attributes", "expected_reason"),
+    [
+        ({"value": "HKCategoryValueSleepAnalysisAsleep"}, "non-numeric value"),
+        ({"sourceName": "x" * 101}, "field too long"),
+        ({"startDate": None}, "missing date"),
+        ({"endDate": None}, "missing date"),
+        ({"startDate": "yesterday"}, "invalid date"),
+        ({"endDate": "2024-13-01 10:00:00 +0200"}, "invalid date"),
+    ],
+)
+def test_record_row_rejects_a_record(attributes: dict[str, str | None], expected_reason: str) -> None:
+    record = {key: value for key, value in (RECORD | attributes).items() if value is not None}
+
+    row, reason = hk_export_import_service._record_row(Element("Record", record), uuid4())
+
+    assert row is None
+    assert reason == expected_reason
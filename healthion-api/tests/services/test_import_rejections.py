@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import ImportBackend, settings
+from app.models import HeartRateData, Workout, WorkoutStatistic
+from app.schemas import ImportJob
+from app.services import ae_import_service, hk_import_service
+
+START = datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+# Longer than the column it's stored in, which only the database checks
+TOO_LONG_UNITS = "x" * 51
+TOO_LONG_UNIT = "x" * 11
+
+
+def ae_workout(index: int, units: str) -> dict[str, Any]:
+    start = START + timedelta(days=index)
+    return {
+        "name": f"Run {index}",
+        "start": start.strftime("%Y-%m-%d %H:%M:%S %z"),
+        "end": (start + timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M:%S %z"),
+        "heartRateData": [
+            {"Avg": 120, "Min": 100, "Max": 140, "units": units, "date": start.strftime("%Y-%m-%d %H:%M:%S %z")},
+        ],
+    }
+
+
+def hk_workout(index: int, unit: str) -> dict[str, Any]:
+    start = START + timedelta(days=index)
+    return {
+        "user_id": "ignored",
+        "type": f"Run {index}",
+        "startDate": start.isoformat(),
+        "endDate": (start + timedelta(minutes=30)).isoformat(),
+        "sourceName": "Watch",
+        "workoutStatistics": [{"type": "HKQuantityTypeIdentifierActiveEnergyBurned", "value": 200, "unit": unit}],
+    }
+
+
+def stored_workouts(db_session: Session, user_id: UUID) -> list[str]:
+    return list(db_session.scalars(select(Workout.type).where(Workout.user_id == user_id).order_by(Workout.startDate)))
+
+
+@pytest.mark.parametrize("backend", list(ImportBackend))
+def test_writer_leaves_out_only_the_workout_the_database_refuses(
+    db_session: Session, user_id: UUID, monkeypatch: pytest.MonkeyPatch, backend: ImportBackend,
+) -> None:
+    monkeypatch.setattr(settings, "import_backend", backend)
+    monkeypatch.setattr(settings, "import_parse_workers", 0)
+    job = ImportJob(user_id=str(user_id), source="apple/auto-health-export")
+    workouts = [ae_workout(0, "count/min"), ae_workout(1, TOO_LONG_UNITS), ae_workout(2, "count/min")]
+
+    ae_import_service.load_data(db_session, workouts, str(user_id), job)
+
+    assert stored_workouts(db_session, user_id) == ["Run 0", "Run 2"]
+    samples = db_session.scalars(select(HeartRateData.units).where(HeartRateData.user_id == user_id)).all()
+    assert samples == ["count/min", "count/min"]
+    assert job.workouts_rejected == 1
+    assert [(rejected.index, rejected.name) for rejected in job.rejected_workouts] == [(1, "Run 1")]
+    assert job.rejected_workouts[0].reason == "value too long for type character varying(50)"
+
+
+def test_healthkit_import_leaves_out_only_the_workout_the_database_refuses(
+    db_session: Session, user_id: UUID,
+) -> None:
+    job = ImportJob(user_id=str(user_id), source="apple/healthion")
+    workouts = [hk_workout(0, "kcal"), hk_workout(1, TOO_LONG_UNIT), hk_workout(2, "kcal")]
+
+    hk_import_service.load_data(db_session, workouts, str(user_id), job)
+
+    assert stored_workouts(db_session, user_id) == ["Run 0", "Run 2"]
+    statistics = db_session.scalars(select(WorkoutStatistic.unit).where(WorkoutStatistic.user_id == user_id)).all()
+    assert statistics == ["kcal", "kcal"]
+    assert job.workouts_rejected == 1
+    assert [(rejected.index, rejected.name) for rejected in job.rejected_workouts] == [(1, "Run 1")]
+    assert job.rejected_workouts[0].reason == "value too long for type character varying(10)"
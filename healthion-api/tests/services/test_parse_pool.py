@@ -0,0 +1,70 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.config import settings
+from app.schemas import AEImportRows, RejectedWorkout
+from app.services import ae_import_service
+from app.services.apple.auto_export.import_service import PARSE_BATCH_SIZE
+
+START = datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+
+
+def ae_workout(index: int) -> dict[str, Any]:
+    start = START + timedelta(days=index)
+    samples = [(start + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S %z") for minute in range(3)]
+    return {
+        "name": f"Run {index}",
+        "start": samples[0],
+        "end": (start + timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M:%S %z"),
+        "activeEnergyBurned": {"qty": 100.5 + index, "units": "kcal"},
+        "heartRateData": [
+            {"Avg": 120.5, "Min": 100, "Max": 140, "units": "count/min", "date": date, "source": "Watch"}
+            for date in samples
+        ],
+        "heartRateRecovery": [{"Avg": 110, "Min": 90, "Max": 120, "units": "count/min", "date": samples[-1]}],
+        "activeEnergy": [{"qty": 0.25, "units": "kcal", "date": date} for date in samples],
+    }
+
+
+# A few batches, with a workout that doesn't validate in one of them
+WORKOUTS = [ae_workout(index) for index in range(3 * PARSE_BATCH_SIZE + 1)]
+WORKOUTS[PARSE_BATCH_SIZE + 2] = {"name": "No dates"}
+
+
+@pytest.fixture
+def parse_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """A parse pool of the test's own, shut down afterwards."""
+    monkeypatch.setattr(settings, "import_parse_workers", 2)
+    monkeypatch.setattr(ae_import_service, "_parse_pool", None)
+    yield
+    if ae_import_service._parse_pool is not None:
+        ae_import_service._parse_pool.shutdown(cancel_futures=True)
+
+
+def comparable(rows: AEImportRows | RejectedWorkout) -> object:
+    """The rows without the workout ids, which are generated anew on every parse."""
+    if isinstance(rows, RejectedWorkout):
+        return rows
+    return rows._replace(
+        workout=rows.workout.model_copy(update={"id": None}),
+        heart_rate_data=[row | {"workout_id": None} for row in rows.heart_rate_data],
+        heart_rate_recovery=[row | {"workout_id": None} for row in rows.heart_rate_recovery],
+        active_energy=[row | {"workout_id": None} for row in rows.active_energy],
+    )
+
+
+def test_pooled_parsing_yields_the_rows_of_inline_parsing(
+    monkeypatch: pytest.MonkeyPatch, parse_pool: None,
+) -> None:
+    user_id = uuid4()
+    pooled = list(ae_import_service._iter_import_rows(iter(WORKOUTS), user_id))
+    monkeypatch.setattr(settings, "import_parse_workers", 0)
+    inline = list(ae_import_service._iter_import_rows(iter(WORKOUTS), user_id))
+
+    assert ae_import_service._parse_pool is not None
+    assert [comparable(rows) for rows in pooled] == [comparable(rows) for rows in inline]
+    assert [rows.index for rows in pooled if isinstance(rows, RejectedWorkout)] == [PARSE_BATCH_SIZE + 2]
@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_json_array
+
+WORKOUTS = [
+    {"name": "Outdoor Run", "distance": {"qty": 10.125, "units": "km"}, "heartRateData": [{"Avg": 130}] * 3},
+    {"name": 'Braces {[ in "strings" ]} and \\ escapes', "notes": "}]}]", "duration": -1.5e3},
+    {"name": "Zürich – Läufe 🏃‍♀️", "source": "Apple Watch", "flags": [True, False, None]},
+]
+DOCUMENT = json.dumps({"meta": {"skipped": [[1, 2], {"a": "]"}]}, "data": {"workouts": WORKOUTS}}, ensure_ascii=False)
+
+
+class CountingStream(io.BytesIO):
+    """Bytes stream keeping count of how much was read from it."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 16, 64, 1024])
+def test_items_are_the_same_at_any_chunk_size(chunk_size: int) -> None:
+    stream = io.BytesIO(DOCUMENT.encode())
+
+    assert list(iter_json_array(stream, ("data", "workouts"), chunk_size=chunk_size)) == WORKOUTS
+
+
+def test_multi_byte_characters_split_across_chunks() -> None:
+    # One byte per read splits every multi-byte character
+    stream = io.BytesIO(("﻿" + DOCUMENT).encode())
+
+    assert list(iter_json_array(stream, ("data", "workouts"), chunk_size=1)) == WORKOUTS
+
+
+def test_text_stream_and_preamble() -> None:
+    stream = io.StringIO("garbage before the document " + DOCUMENT)
+
+    assert list(iter_json_array(stream, ("data", "workouts"), chunk_size=4, skip_preamble=True)) == WORKOUTS
+
+
+def test_missing_path_yields_nothing() -> None:
+    assert list(iter_json_array(io.BytesIO(DOCUMENT.encode()), ("data", "records"))) == []
+
+
+@pytest.mark.parametrize(
+    "broken",
+    [
+        '{"name": x}',
+        '{"name": "a" "b": 1}',
+        '{"name": nul, "b": 1}',
+        '{"name": "\\q"}',
+        '{"name": [1,]}',
+    ],
+)
+def test_syntax_error_fails_without_reading_the_rest(broken: str) -> None:
+    rest = ", ".join(json.dumps(workout) for workout in WORKOUTS * 2000)
+    stream = CountingStream(f'{{"data": {{"workouts": [{broken}, {rest}]}}}}'.encode())
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(stream, ("data", "workouts"), chunk_size=64))
+    assert stream.bytes_read <= 128
+
+
+@pytest.mark.parametrize("after", [0, 15, 40, 120, 200])
+def test_document_cut_off_inside_the_array_fails(after: int) -> None:
+    cut = DOCUMENT.index('"workouts"') + after
+    stream = io.StringIO(DOCUMENT[:cut])
+
+    with pytest.raises(ValueError, match="Unexpected end|Unterminated|Expecting"):
+        list(iter_json_array(stream, ("data", "workouts"), chunk_size=8))